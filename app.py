@@ -10,7 +10,13 @@ import time
 from pathlib import Path
 from modules.config import COLORS, ICONS, CONFIG, ASSETS_DIR
 from modules.styles import apply_premium_css
-from modules.data_loader import load_info_gerais, load_chamados_all, load_base_cs_dashboard
+from modules.recarga import dados_atuais
+from modules.cubo import total_por_categoria
+from modules.data_loader import (
+    load_info_gerais, load_chamados_all, load_base_cs_dashboard, impressao_digital_base, data_referencia,
+    load_dicionario_clientes, load_cubo_chamados, load_chamados_mensal, load_chamados_por_cliente,
+    load_indicadores_receita, load_avisos_tickets, chamados_em_lotes, chamados_na_base, fonte_compartilhada
+)
 
 # Imports das views
 from views.visao_executiva import render_visao_executiva
@@ -52,23 +58,66 @@ apply_premium_css()
 if 'pagina_atual' not in st.session_state:
     st.session_state.pagina_atual = 'visao_executiva'
 
-# ==================== CARREGAR DADOS (COM CACHE) ====================
-@st.cache_data
+# ==================== CARREGAR DADOS (RECARGA EM SEGUNDO PLANO) ====================
 def carregar_dados():
-    """Carrega todos os dados necessários"""
-    info = load_info_gerais()
-    chamados = load_chamados_all()
-    dashboard = load_base_cs_dashboard()
-    return info, chamados, dashboard
+    """
+    Carrega todos os dados necessários
+    
+    Roda na primeira sessão do processo e, depois, na thread de
+    modules.recarga sempre que o hash de conteúdo da fonte muda.
+    O .xlsx é aberto uma vez para todas as abas (ver fonte_compartilhada).
+    Tudo o que as páginas leem sai daqui, da mesma versão e data de
+    referência, e é trocado de uma vez: as páginas não chamam loaders
+    (COD_CLIENTE dos frames, dicionário e cubo sempre concordam).
+    
+    No modo lotes os chamados ficam só nas partes em disco: 'chamados' e
+    'dashboard' são None e cubo e agregados são somados parte a parte. Com a
+    base SQLite também: cubo e agregados saem de consultas à base.
+    
+    Returns:
+        dict com 'referencia', 'info', 'chamados', 'dashboard',
+        'dicionario', 'cubo', 'mensal', 'por_cliente', 'receita' e 'avisos'
+    """
+    referencia = data_referencia()
+    with fonte_compartilhada():
+        so_em_disco = chamados_em_lotes() or chamados_na_base()
+        info = load_info_gerais(referencia)
+        chamados = None if so_em_disco else load_chamados_all(referencia)
+        return {
+            "referencia": referencia,
+            "info": info,
+            "chamados": chamados,
+            "dashboard": None if so_em_disco else load_base_cs_dashboard(referencia),
+            "dicionario": load_dicionario_clientes(),
+            "cubo": load_cubo_chamados(referencia),
+            "mensal": load_chamados_mensal(chamados, referencia),
+            "por_cliente": load_chamados_por_cliente(chamados, referencia),
+            "receita": load_indicadores_receita(referencia),
+            "avisos": load_avisos_tickets(),
+        }
+
+def versao_dados():
+    """
+    Identidade da versão: hash de conteúdo da fonte e data de referência
+    (na virada do dia os campos relativos a datas são refeitos, sem novo ETL)
+    """
+    arquivo = impressao_digital_base()["arquivo"]
+    return (arquivo, data_referencia()) if arquivo else None
 
-# Carregar dados
+# Carregar dados (só a primeira sessão espera; as demais leem a versão atual)
 try:
     with st.spinner('🔄 Carregando dados...'):
-        df_info, df_chamados, df_dashboard = carregar_dados()
+        _, dados = dados_atuais(
+            carregar_dados, versao_dados, aceitar=lambda dados: not dados["info"].empty
+        )
+    df_info = dados["info"]
 except Exception as e:
     st.error(f"❌ Erro ao carregar dados: {e}")
     st.stop()
 
+for aviso in dados["avisos"]:
+    st.warning(aviso)
+
 # ==================== SIDEBAR ====================
 with st.sidebar:
     # Logo da Base Telco
@@ -197,10 +246,10 @@ with st.sidebar:
             </div>
         """, unsafe_allow_html=True)
     
-    if not df_chamados.empty:
+    if dados["cubo"]["presente"].any():
         st.markdown("<br>", unsafe_allow_html=True)
         
-        total_chamados = df_chamados[df_chamados['CATEGORIA'] == 'CHAMADOS']['VALOR'].sum()
+        total_chamados = total_por_categoria(dados["cubo"])['CHAMADOS']
         st.markdown(f"""
             <div class='stat-card'>
                 <div class='stat-card-label'>Total Chamados</div>
@@ -210,10 +259,9 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Botão de refresh
+    # Botão de refresh (a recarga roda em segundo plano: o rerun só pega a versão atual)
     if st.button("🔄 Atualizar Dados", key="refresh_sidebar", use_container_width=True):
         with st.spinner('🔄 Atualizando dados...'):
-            st.cache_data.clear()
             time.sleep(0.5)
             st.rerun()
     
@@ -230,19 +278,19 @@ with st.sidebar:
 # ==================== ROTEAMENTO DE PÁGINAS ====================
 
 if st.session_state.pagina_atual == 'visao_executiva':
-    render_visao_executiva(df_info, df_chamados)
+    render_visao_executiva(dados)
 
 elif st.session_state.pagina_atual == 'relacionamento':
-    render_relacionamento(df_info, df_chamados)
+    render_relacionamento(dados)
 
 elif st.session_state.pagina_atual == 'suporte':
-    render_suporte_qualidade(df_info, df_chamados)
+    render_suporte_qualidade(dados)
 
 elif st.session_state.pagina_atual == 'risco':
-    render_risco_financeiro(df_info, df_chamados)
+    render_risco_financeiro(dados)
 
 elif st.session_state.pagina_atual == 'cliente_360':
-    render_cliente_360(df_info, df_chamados)
+    render_cliente_360(dados)
 
 else:
     st.session_state.pagina_atual = 'visao_executiva'
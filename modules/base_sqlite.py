@@ -0,0 +1,150 @@
+"""
+Base analítica local em SQLite
+Materializa chamados verticalizados e clientes normalizados em um arquivo
+indexado, compartilhado entre processos, para consultas por cliente e por mês
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+from contextlib import closing
+import pandas as pd
+from modules.snapshot import preparar_frame
+
+TABELA_CHAMADOS = "chamados"
+TABELA_CLIENTES = "clientes"
+TABELA_METADADOS = "metadados"
+
+# (nome, tabela, colunas): por cliente e mês (células do cubo), agregados por mês e por cliente/categoria
+INDICES = [
+    ("idx_chamados_cliente", TABELA_CHAMADOS, ("CLIENTE", "MES_REF", "CATEGORIA")),
+    ("idx_chamados_mes", TABELA_CHAMADOS, ("MES_REF", "CATEGORIA", "VALOR")),
+    ("idx_chamados_categoria", TABELA_CHAMADOS, ("CATEGORIA", "CLIENTE", "VALOR")),
+    ("idx_clientes_cliente", TABELA_CLIENTES, ("CLIENTE",)),
+]
+
+def _conectar(caminho):
+    """Conexão somente leitura (várias sessões/processos leem ao mesmo tempo)"""
+    return sqlite3.connect(f"{Path(caminho).resolve().as_uri()}?mode=ro", uri=True)
+
+def base_atualizada(caminho, fonte, versao):
+    """True se a base existe e foi gerada da mesma fonte e versão do ETL"""
+    if not os.path.exists(caminho):
+        return False
+    try:
+        with closing(_conectar(caminho)) as con:
+            linha = con.execute(f"SELECT valor FROM {TABELA_METADADOS} WHERE chave = 'origem'").fetchone()
+    except sqlite3.Error:
+        return False
+    return bool(linha) and json.loads(linha[0]) == {"fonte": fonte, "versao": versao}
+
+def _gravar_tabela(con, nome, df, anexar=False):
+    """Grava o DataFrame como tabela (categorias como texto, tipos misturados como str)"""
+    df = preparar_frame(df)
+    for col in df.columns[df.dtypes.eq("category")]:
+        df[col] = df[col].astype(object)
+    df.to_sql(nome, con, index=False, if_exists="append" if anexar else "fail")
+
+def _gravar_partes(con, nome, partes):
+    """Grava as partes em sequência na mesma tabela (ValueError se não houver linhas)"""
+    gravadas = 0
+    for df in partes:
+        if df is None or df.empty:
+            continue
+        _gravar_tabela(con, nome, df, anexar=gravadas > 0)
+        gravadas += 1
+    if not gravadas:
+        raise ValueError(f"sem linhas para a tabela {nome}")
+
+def materializar(caminho, df_info, df_chamados, fonte, versao):
+    """
+    Grava a base de forma atômica (arquivo temporário + rename): quem estiver
+    lendo continua com a versão anterior até a troca
+    
+    Args:
+        df_chamados: DataFrame ou iterável de partes, gravadas uma a uma
+            (ex.: as partes do modo lotes, sem montar o DataFrame inteiro)
+        fonte: identidade da origem (ex.: hash de conteúdo da fonte)
+        versao: versão do ETL que gerou os dados
+    
+    Returns:
+        True se a base foi gravada
+    """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        with closing(sqlite3.connect(temporario)) as con:
+            partes = [df_chamados] if isinstance(df_chamados, pd.DataFrame) else df_chamados
+            _gravar_partes(con, TABELA_CHAMADOS, partes)
+            _gravar_tabela(con, TABELA_CLIENTES, df_info)
+            for nome, tabela, colunas in INDICES:
+                lista = ", ".join(f'"{c}"' for c in colunas)
+                con.execute(f'CREATE INDEX {nome} ON {tabela} ({lista})')
+            con.execute(f"CREATE TABLE {TABELA_METADADOS} (chave TEXT PRIMARY KEY, valor TEXT)")
+            con.execute(
+                f"INSERT INTO {TABELA_METADADOS} VALUES ('origem', ?)",
+                (json.dumps({"fonte": fonte, "versao": versao}),)
+            )
+            con.execute("ANALYZE")
+            con.commit()
+        os.replace(temporario, caminho)
+    except (OSError, sqlite3.Error, ValueError):
+        # Base SQLite é só otimização: sem ela as consultas filtram o DataFrame
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        return False
+    return True
+
+def _consultar(caminho, sql, parametros=()):
+    """Executa a consulta e devolve DataFrame com MES_REF/ANO/MES tipados; None em erro"""
+    try:
+        with closing(_conectar(caminho)) as con:
+            df = pd.read_sql_query(sql, con, params=parametros)
+    except (sqlite3.Error, pd.errors.DatabaseError):
+        return None
+    
+    if "MES_REF" in df.columns:
+        df["MES_REF"] = pd.to_datetime(df["MES_REF"])
+    for col in ("ANO", "MES"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    if "VALOR" in df.columns:
+        df["VALOR"] = df["VALOR"].astype(float)
+    return df
+
+def _texto_data(data):
+    """Data no formato gravado por to_sql ('AAAA-MM-DD HH:MM:SS'), comparável como texto"""
+    return pd.Timestamp(data).strftime("%Y-%m-%d %H:%M:%S")
+
+def chamados_cliente_mes(caminho, ate):
+    """
+    Soma de VALOR por CLIENTE, MES_REF e CATEGORIA, dos meses até `ate`: as
+    células do cubo de chamados (usa idx_chamados_cliente)
+    """
+    return _consultar(
+        caminho,
+        f"SELECT CLIENTE, MES_REF, CATEGORIA, SUM(VALOR) AS VALOR FROM {TABELA_CHAMADOS} WHERE MES_REF <= ? "
+        "GROUP BY CLIENTE, MES_REF, CATEGORIA",
+        (_texto_data(ate),)
+    )
+
+def chamados_mensal(caminho, ate):
+    """Soma de VALOR por MES_REF e CATEGORIA, dos meses até `ate`, em ordem de mês"""
+    return _consultar(
+        caminho,
+        f"SELECT MES_REF, CATEGORIA, SUM(VALOR) AS VALOR FROM {TABELA_CHAMADOS} WHERE MES_REF <= ? "
+        "GROUP BY MES_REF, CATEGORIA ORDER BY MES_REF, CATEGORIA",
+        (_texto_data(ate),)
+    )
+
+def chamados_por_cliente(caminho, ate):
+    """Soma de VALOR por CLIENTE e CATEGORIA, dos meses até `ate`"""
+    return _consultar(
+        caminho,
+        f"SELECT CLIENTE, CATEGORIA, SUM(VALOR) AS VALOR FROM {TABELA_CHAMADOS} WHERE MES_REF <= ? "
+        "GROUP BY CLIENTE, CATEGORIA ORDER BY CLIENTE, CATEGORIA",
+        (_texto_data(ate),)
+    )
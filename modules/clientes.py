@@ -0,0 +1,306 @@
+"""
+Resolução de entidades de cliente
+Normaliza os nomes vindos das várias abas/fontes e dá a cada cliente um nome
+e um id canônicos. Só nomes com a mesma chave normalizada (ou ligados por uma
+tabela de aliases explícita) são unidos; quase-duplicatas encontradas por
+blocagem (só compara nomes que dividem um prefixo de palavra, nunca todos
+contra todos) viram candidatos para revisão, nunca uniões automáticas
+"""
+
+import re
+from difflib import SequenceMatcher
+import numpy as np
+import pandas as pd
+
+# Origem dos nomes canônicos da tabela de aliases (mais prioritária que as fontes)
+ORIGEM_ALIASES = "aliases"
+
+# Sufixos societários ignorados na busca de candidatos ("S/A" vira "S A")
+RE_SUFIXOS = re.compile(r"(\s+(LTDA|LIMITADA|S A|SA|ME|EPP|EIRELI|MEI))+$")
+
+# Blocagem: nomes candidatos dividem os PREFIXO_BLOCO primeiros caracteres de
+# alguma palavra; blocos maiores que TAMANHO_MAXIMO_BLOCO (prefixos comuns
+# demais, ex.: "GRUP") não geram candidatos
+PREFIXO_BLOCO = 4
+TAMANHO_MAXIMO_BLOCO = 100
+
+# Similaridade mínima (difflib, 0-1) para dois nomes virarem candidatos;
+# nomes mais curtos que TAMANHO_MINIMO só são candidatos se forem iguais
+LIMIAR_SIMILARIDADE = 0.9
+TAMANHO_MINIMO = 5
+
+# Pares comparados por vez no filtro de caracteres em comum (limita a memória)
+PARES_POR_LOTE = 200_000
+
+def normalizar_nomes(nomes):
+    """
+    Chave de comparação de cada nome: sem acentos, maiúsculas e só letras e
+    dígitos separados por um espaço (só muda caixa, acentos, espaços e pontuação)
+    
+    Args:
+        nomes: Series de nomes
+    
+    Returns:
+        Series de chaves, no mesmo índice
+    """
+    s = nomes.astype(str).str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    return s.str.upper().str.replace(r"[^A-Z0-9]+", " ", regex=True).str.strip()
+
+def _sem_sufixo(chaves):
+    """Chaves sem o sufixo societário do fim (usadas só na busca de candidatos)"""
+    sem_sufixo = chaves.str.replace(RE_SUFIXOS, "", regex=True).str.strip()
+    return sem_sufixo.where(sem_sufixo.ne(""), chaves)
+
+def _pares_candidatos(chaves):
+    """
+    Pares de chaves (posições i < j) que dividem um bloco de prefixo de
+    palavra e podem ser o mesmo cliente: as duas com pelo menos
+    TAMANHO_MINIMO caracteres, os mesmos dígitos e caracteres em comum
+    suficientes para LIMIAR_SIMILARIDADE (o quick_ratio do difflib, um
+    limite superior da similaridade, calculado em bloco antes do difflib)
+    
+    Returns:
+        (i, j), arrays de posições em `chaves`
+    """
+    chaves = pd.Series(chaves, dtype=object).reset_index(drop=True)
+    palavras = chaves.str.split().explode().dropna()
+    blocos = pd.DataFrame({"CHAVE": palavras.index.to_numpy(), "BLOCO": palavras.str[:PREFIXO_BLOCO].to_numpy()}).drop_duplicates()
+    tamanhos = blocos.groupby("BLOCO")["CHAVE"].transform("size")
+    blocos = blocos[(tamanhos > 1) & (tamanhos <= TAMANHO_MAXIMO_BLOCO)]
+    pares = blocos.merge(blocos, on="BLOCO", suffixes=("_I", "_J"))
+    pares = pares.loc[pares["CHAVE_I"] < pares["CHAVE_J"], ["CHAVE_I", "CHAVE_J"]].drop_duplicates()
+    i, j = pares["CHAVE_I"].to_numpy(), pares["CHAVE_J"].to_numpy()
+    
+    comprimentos = chaves.str.len().to_numpy()
+    digitos = chaves.str.replace(r"\D", "", regex=True).to_numpy(dtype=object)
+    possiveis = (np.minimum(comprimentos[i], comprimentos[j]) >= TAMANHO_MINIMO) & (digitos[i] == digitos[j])
+    i, j = i[possiveis], j[possiveis]
+    
+    contagens = _contagens_caracteres(chaves)
+    possiveis = np.zeros(len(i), dtype=bool)
+    for inicio in range(0, len(i), PARES_POR_LOTE):
+        lote = slice(inicio, inicio + PARES_POR_LOTE)
+        comuns = np.minimum(contagens[i[lote]], contagens[j[lote]]).sum(axis=1)
+        possiveis[lote] = 2.0 * comuns / (comprimentos[i[lote]] + comprimentos[j[lote]]) >= LIMIAR_SIMILARIDADE
+    return i[possiveis], j[possiveis]
+
+def _contagens_caracteres(chaves):
+    """Matriz chaves x caracteres com quantas vezes cada caractere aparece em cada chave"""
+    codigos = [np.frombuffer(chave.encode("ascii", "ignore"), dtype=np.uint8) for chave in chaves]
+    linhas = np.repeat(np.arange(len(codigos)), [len(c) for c in codigos])
+    caracteres = np.concatenate(codigos) if codigos else np.array([], dtype=np.uint8)
+    contagens = np.zeros((len(codigos), 128), dtype=np.int16)
+    np.add.at(contagens, (linhas, caracteres), 1)
+    return contagens[:, contagens.any(axis=0)]
+
+def _raiz(pais, i):
+    """Representante do grupo de i (union-find com compressão de caminho)"""
+    while pais[i] != i:
+        pais[i] = pais[pais[i]]
+        i = pais[i]
+    return i
+
+def ler_aliases(df):
+    """
+    Tabela de aliases revisada: colunas ALIAS (grafia a unir) e CLIENTE
+    (nome canônico); linhas incompletas são ignoradas
+    
+    Returns:
+        dict alias -> nome canônico
+    
+    Raises:
+        ValueError se faltar alguma das colunas
+    """
+    faltando = [c for c in ("ALIAS", "CLIENTE") if c not in df.columns]
+    if faltando:
+        raise ValueError(f"colunas ausentes na tabela de aliases: {', '.join(faltando)}")
+    df = df[df["ALIAS"].notna() & df["CLIENTE"].notna()]
+    aliases = df["ALIAS"].astype(str).str.strip()
+    canonicos = df["CLIENTE"].astype(str).str.strip()
+    validas = aliases.ne("") & canonicos.ne("")
+    return dict(zip(aliases[validas], canonicos[validas]))
+
+def resolver_clientes(nomes_por_origem, aliases=None):
+    """
+    Agrupa os nomes de cliente que são a mesma entidade
+    
+    Nomes com a mesma chave normalizada são o mesmo cliente, assim como os
+    ligados pela tabela de aliases. Nada é unido por similaridade: entre
+    chaves diferentes, só os pares da blocagem são comparados, e os com
+    similaridade >= LIMIAR_SIMILARIDADE (ou que só diferem no sufixo
+    societário) vão para 'candidatos', para revisão.
+    
+    Args:
+        nomes_por_origem: dict origem -> nomes (Series/lista), em ordem de
+            prioridade; o nome canônico de cada grupo é o primeiro nome da
+            origem mais prioritária
+        aliases: dict alias -> nome canônico (ver ler_aliases); o nome
+            canônico da tabela tem prioridade sobre os das origens
+    
+    Returns:
+        dict com 'nomes' (nome original -> nome canônico), 'chaves' (chave
+        normalizada -> nome canônico, para nomes vistos depois), 'ids' (nome
+        canônico -> CLIENTE_ID, a menor chave do grupo, estável enquanto o
+        grupo existir) e 'relatorio' (ver relatorio_uniao); os candidatos
+        para revisão são calculados à parte (ver relatorio_candidatos)
+    """
+    aliases = aliases or {}
+    if aliases:
+        nomes_por_origem = {ORIGEM_ALIASES: list(aliases.values()), **nomes_por_origem}
+    
+    partes = []
+    for prioridade, (origem, nomes) in enumerate(nomes_por_origem.items()):
+        s = pd.Series(nomes, dtype=object).dropna().astype(str).str.strip()
+        s = s[s.ne("") & s.ne("nan") & s.ne("None")].drop_duplicates()
+        partes.append(pd.DataFrame({"NOME": s.to_numpy(), "ORIGEM": origem, "PRIORIDADE": prioridade}))
+    nomes = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=["NOME", "ORIGEM", "PRIORIDADE"])
+    nomes = nomes.drop_duplicates("NOME").reset_index(drop=True)
+    nomes["CHAVE"] = normalizar_nomes(nomes["NOME"])
+    
+    codigos, chaves = pd.factorize(nomes["CHAVE"])
+    chaves = chaves.to_numpy(dtype=object)
+    posicao = {chave: i for i, chave in enumerate(chaves)}
+    pais = list(range(len(chaves)))
+    chaves_aliases = normalizar_nomes(pd.Series(list(aliases), dtype=object))
+    canonicos_aliases = normalizar_nomes(pd.Series(list(aliases.values()), dtype=object))
+    for alias, canonico in zip(chaves_aliases, canonicos_aliases):
+        if alias in posicao and canonico in posicao:
+            pais[_raiz(pais, posicao[alias])] = _raiz(pais, posicao[canonico])
+    
+    grupos = np.array([_raiz(pais, i) for i in range(len(chaves))], dtype=np.int64)
+    nomes["GRUPO"] = grupos[codigos] if len(codigos) else np.array([], dtype=np.int64)
+    
+    # Nome canônico: o primeiro da origem mais prioritária; id: a menor chave do grupo
+    canonicos = nomes.sort_values(["PRIORIDADE"], kind="stable").drop_duplicates("GRUPO").set_index("GRUPO")["NOME"]
+    ids = nomes.groupby("GRUPO")["CHAVE"].min()
+    nomes["CLIENTE"] = nomes["GRUPO"].map(canonicos)
+    nomes["CLIENTE_ID"] = nomes["GRUPO"].map(ids)
+    
+    # Os canônicos da tabela de aliases só entram se algum nome das fontes for para eles
+    vistos = nomes["ORIGEM"].ne(ORIGEM_ALIASES)
+    usados = nomes.loc[vistos, "GRUPO"].unique()
+    nomes = nomes[vistos | nomes["GRUPO"].isin(usados)]
+    
+    return {
+        "nomes": dict(zip(nomes["NOME"], nomes["CLIENTE"])),
+        "chaves": dict(zip(nomes["CHAVE"], nomes["CLIENTE"])),
+        "ids": dict(zip(nomes["CLIENTE"], nomes["CLIENTE_ID"])),
+        "relatorio": relatorio_uniao(nomes, aliases),
+    }
+
+def relatorio_uniao(nomes, aliases=None):
+    """
+    Relatório dos grupos com mais de um nome original
+    
+    Args:
+        nomes: tabela de nomes de resolver_clientes (NOME, ORIGEM, CHAVE,
+            GRUPO, CLIENTE e CLIENTE_ID)
+        aliases: tabela de aliases usada na resolução
+    
+    Returns:
+        DataFrame com CLIENTE_ID, CLIENTE (canônico), NOME_ORIGINAL, ORIGEM,
+        REGRA ('canônico', 'normalização' ou 'alias') e SIMILARIDADE com o
+        nome canônico (1.0 para a mesma chave)
+    """
+    colunas = ["CLIENTE_ID", "CLIENTE", "NOME_ORIGINAL", "ORIGEM", "REGRA", "SIMILARIDADE"]
+    unidos = nomes[nomes.groupby("GRUPO")["NOME"].transform("size") > 1]
+    if unidos.empty:
+        return pd.DataFrame(columns=colunas)
+    
+    chave_canonica = unidos.set_index("NOME")["CHAVE"].reindex(unidos["CLIENTE"]).to_numpy()
+    mesma_chave = unidos["CHAVE"].to_numpy() == chave_canonica
+    notas = [
+        1.0 if igual else SequenceMatcher(None, chave, canonica, autojunk=False).ratio()
+        for chave, canonica, igual in zip(unidos["CHAVE"], chave_canonica, mesma_chave)
+    ]
+    relatorio = pd.DataFrame({
+        "CLIENTE_ID": unidos["CLIENTE_ID"].to_numpy(),
+        "CLIENTE": unidos["CLIENTE"].to_numpy(),
+        "NOME_ORIGINAL": unidos["NOME"].to_numpy(),
+        "ORIGEM": unidos["ORIGEM"].to_numpy(),
+        "REGRA": np.select(
+            [unidos["NOME"].eq(unidos["CLIENTE"]).to_numpy(), mesma_chave],
+            ["canônico", "normalização"], default="alias"
+        ),
+        "SIMILARIDADE": notas,
+    })
+    return relatorio.sort_values(["CLIENTE_ID", "SIMILARIDADE"], ascending=[True, False], kind="stable").reset_index(drop=True)
+
+def relatorio_candidatos(resolucao):
+    """
+    Pares de clientes diferentes que podem ser o mesmo e precisam de
+    revisão (não são unidos; para uni-los, use a tabela de aliases)
+    
+    A comparação é feita sobre as chaves sem sufixo societário distintas:
+    clientes com a mesma chave assim são candidatos com REGRA 'sufixo'; entre
+    chaves diferentes, só os pares da blocagem são comparados, e os com
+    similaridade >= LIMIAR_SIMILARIDADE viram candidatos com 'similaridade'.
+    
+    Args:
+        resolucao: resultado de resolver_clientes
+    
+    Returns:
+        DataFrame com CLIENTE, CANDIDATO (nomes canônicos dos dois grupos),
+        REGRA e SIMILARIDADE, do par mais parecido para o menos
+    """
+    colunas = ["CLIENTE", "CANDIDATO", "REGRA", "SIMILARIDADE"]
+    chaves = pd.Series(list(resolucao["chaves"]), dtype=object)
+    codigos, reduzidas = pd.factorize(_sem_sufixo(chaves))
+    reduzidas = reduzidas.to_numpy(dtype=object)
+    membros = pd.DataFrame({"CODIGO": codigos, "CLIENTE": list(resolucao["chaves"].values())}).drop_duplicates()
+    
+    i, j = _pares_candidatos(reduzidas)
+    notas = np.array([
+        SequenceMatcher(None, a, b, autojunk=False).ratio() for a, b in zip(reduzidas[i].tolist(), reduzidas[j].tolist())
+    ], dtype=float)
+    parecidas = notas >= LIMIAR_SIMILARIDADE
+    iguais = np.arange(len(reduzidas))
+    pares = pd.DataFrame({
+        "CODIGO_I": np.concatenate([iguais, i[parecidas]]),
+        "CODIGO_J": np.concatenate([iguais, j[parecidas]]),
+        "REGRA": ["sufixo"] * len(iguais) + ["similaridade"] * int(parecidas.sum()),
+        "SIMILARIDADE": np.concatenate([np.ones(len(iguais)), notas[parecidas]]),
+    })
+    pares = (
+        pares.merge(membros.rename(columns={"CODIGO": "CODIGO_I", "CLIENTE": "A"}), on="CODIGO_I")
+        .merge(membros.rename(columns={"CODIGO": "CODIGO_J", "CLIENTE": "B"}), on="CODIGO_J")
+    )
+    pares = pares[pares["A"].ne(pares["B"])]
+    if pares.empty:
+        return pd.DataFrame(columns=colunas)
+    
+    a, b = pares["A"].to_numpy(dtype=object), pares["B"].to_numpy(dtype=object)
+    primeiro = a < b
+    candidatos = pd.DataFrame({
+        "CLIENTE": np.where(primeiro, a, b),
+        "CANDIDATO": np.where(primeiro, b, a),
+        "REGRA": pares["REGRA"].to_numpy(),
+        "SIMILARIDADE": pares["SIMILARIDADE"].to_numpy(),
+    })
+    candidatos = candidatos.sort_values("SIMILARIDADE", ascending=False, kind="stable").drop_duplicates(["CLIENTE", "CANDIDATO"])
+    return candidatos.sort_values(["SIMILARIDADE", "CLIENTE"], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+def aplicar_resolucao(serie, resolucao):
+    """
+    Troca cada nome pelo canônico; nomes não vistos na resolução são
+    procurados pela chave normalizada e, se não houver, ficam como estão
+    
+    Colunas categóricas continuam categóricas (só as categorias são
+    resolvidas; os códigos são remapeados em bloco).
+    """
+    def canonico(valores):
+        valores = pd.Series(valores, dtype=object)
+        por_nome = valores.map(resolucao["nomes"])
+        por_chave = normalizar_nomes(valores).map(resolucao["chaves"])
+        return por_nome.fillna(por_chave).fillna(valores)
+    
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        destino = canonico(serie.cat.categories.to_numpy(dtype=object))
+        novos_codigos, categorias = pd.factorize(destino, sort=True)
+        codigos = serie.cat.codes.to_numpy()
+        codigos = np.where(codigos >= 0, novos_codigos[np.maximum(codigos, 0)], -1)
+        return pd.Series(pd.Categorical.from_codes(codigos, categories=categorias), index=serie.index, name=serie.name)
+    
+    unicos = serie.dropna().unique()
+    mapa = dict(zip(unicos, canonico(unicos)))
+    return serie.map(mapa).where(serie.notna(), serie)
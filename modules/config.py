@@ -94,3 +94,29 @@ FAIXAS_CONTATO = {
     '30-90': {'label': '30-90 dias', 'color': COLORS['warning'], 'pontos': 15},
     '90+': {'label': '90+ dias', 'color': COLORS['danger'], 'pontos': 5}
 }
+
+# ==================== SLA (CALCULADO A PARTIR DOS TICKETS) ====================
+# Expediente e feriados usados para contar horas úteis entre abertura e fechamento
+# Os feriados nacionais são gerados para cada ano de 'anos' (datas fora deles
+# são recusadas pelo cálculo de SLA, ver modules.sla)
+SLA_CALENDARIO = {
+    'inicio': '08:00',
+    'fim': '18:00',
+    'dias_uteis': 'Mon Tue Wed Thu Fri',
+    # 'MM-DD', ou ('MM-DD', primeiro ano) para feriados criados depois
+    'feriados_fixos': [
+        '01-01', '04-21', '05-01', '09-07', '10-12', '11-02', '11-15', ('11-20', 2024), '12-25',
+    ],
+    # Dias a partir do domingo de Páscoa (-2 = Sexta-feira Santa)
+    'feriados_pascoa': [-2],
+    # Datas avulsas ('AAAA-MM-DD'): feriados locais, pontes
+    'feriados': [],
+    'anos': (1970, 2100),
+}
+
+# Meta de atendimento em horas úteis por categoria de ticket
+SLA_METAS_HORAS = {
+    'INCIDENTES': 8,
+    'SOLICITACOES': 24,
+    'PADRAO': 16
+}
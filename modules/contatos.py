@@ -0,0 +1,78 @@
+"""
+Eventos de contato com clientes
+Lê a tabela de contatos (CSV ou SQLite) e calcula, para todos os clientes
+de uma vez, último contato, volume recente e cadência
+"""
+
+from pathlib import Path
+import pandas as pd
+from modules.fontes import ler_tabela, EXTENSOES_SQLITE
+
+# Tabela de eventos no SQLite (no CSV, o próprio arquivo)
+TABELA_CONTATOS = "contatos"
+
+# Colunas esperadas: cliente, data/hora do contato, canal e CSM que fez o contato
+COLUNAS_CONTATOS = ["CLIENTE", "DATA", "CANAL", "CSM"]
+
+def ler_contatos(caminho):
+    """
+    Lê os eventos de contato de um .csv ou de um banco SQLite (tabela 'contatos')
+    
+    Returns:
+        DataFrame com COLUNAS_CONTATOS (CANAL/CSM vazios se ausentes),
+        DATA como datetime e CLIENTE sem espaços nas pontas
+    
+    Raises:
+        FileNotFoundError se o arquivo não existir; ValueError sem CLIENTE/DATA
+    """
+    caminho = Path(caminho)
+    if caminho.suffix.lower() in EXTENSOES_SQLITE:
+        df = ler_tabela(caminho, "sqlite", TABELA_CONTATOS)
+    else:
+        df = pd.read_csv(caminho, dtype=str)
+    
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    faltando = [c for c in ("CLIENTE", "DATA") if c not in df.columns]
+    if faltando:
+        raise ValueError(f"colunas ausentes nos contatos: {', '.join(faltando)}")
+    for col in COLUNAS_CONTATOS:
+        if col not in df.columns:
+            df[col] = pd.NA
+    
+    df = df.loc[df["CLIENTE"].notna(), COLUNAS_CONTATOS].copy()
+    df["CLIENTE"] = df["CLIENTE"].astype(str).str.strip()
+    df["DATA"] = pd.to_datetime(df["DATA"], errors="coerce", format="mixed")
+    return df[df["CLIENTE"].ne("") & df["CLIENTE"].ne("nan") & df["DATA"].notna()]
+
+def metricas_contato(eventos, hoje):
+    """
+    Métricas de contato por cliente, com groupby sobre todos os eventos
+    
+    Args:
+        eventos: saída de ler_contatos
+        hoje: data de referência (eventos futuros são ignorados)
+    
+    Returns:
+        DataFrame indexado por CLIENTE com ULTIMO_CONTATO_EVENTO,
+        CANAL_ULTIMO_CONTATO, CSM_ULTIMO_CONTATO, CONTATOS_30D, CONTATOS_90D
+        e MEDIANA_DIAS_ENTRE_CONTATOS
+    """
+    ev = eventos[eventos["DATA"] <= hoje].sort_values(["CLIENTE", "DATA"], kind="stable")
+    por_cliente = ev.groupby("CLIENTE", sort=False)
+    
+    idade = (hoje - ev["DATA"]).dt.days
+    intervalo = por_cliente["DATA"].diff().dt.total_seconds() / 86400
+    
+    # Eventos ordenados por data: o último de cada cliente é o contato mais recente
+    ultimos = ev.drop_duplicates("CLIENTE", keep="last").set_index("CLIENTE")
+    
+    metricas = pd.DataFrame({
+        "ULTIMO_CONTATO_EVENTO": ultimos["DATA"],
+        "CANAL_ULTIMO_CONTATO": ultimos["CANAL"],
+        "CSM_ULTIMO_CONTATO": ultimos["CSM"],
+        "CONTATOS_30D": idade.le(30).groupby(ev["CLIENTE"]).sum(),
+        "CONTATOS_90D": idade.le(90).groupby(ev["CLIENTE"]).sum(),
+        "MEDIANA_DIAS_ENTRE_CONTATOS": intervalo.groupby(ev["CLIENTE"]).median(),
+    })
+    metricas.index.name = "CLIENTE"
+    return metricas
@@ -0,0 +1,135 @@
+"""
+Conector de dados cadastrais do CRM
+Puxa só os clientes alterados desde a última sincronização (coluna de
+atualização) e aplica essas alterações sobre Informações Gerais
+"""
+
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+import pandas as pd
+
+# Tabela de clientes no banco do CRM e coluna com a data/hora da última alteração
+TABELA_CRM = "clientes"
+COLUNA_ATUALIZACAO = "updated_at"
+
+# Coluna no CRM -> coluna padronizada de Informações Gerais
+COLUNAS_CRM = {
+    "cliente": "CLIENTE",
+    "csm": "Customer Success Manager",
+    "gerente": "GERENTE RESPONSÁVEL",
+    "unidade": "UNIDADE",
+    "contato": "CONTATO",
+    "telefone": "TELEFONE",
+    "email": "E-MAIL",
+}
+
+# Conexões abertas mantidas por banco
+TAMANHO_POOL = 4
+
+_POOLS = {}
+# Última sincronização por banco: {'marca': maior updated_at lido, 'clientes': DataFrame}
+_SINCRONIZADO = {}
+_TRAVA = threading.Lock()
+
+def _nova_conexao(caminho):
+    """Conexão somente leitura, compartilhável entre threads (uma por vez, via pool)"""
+    return sqlite3.connect(
+        f"{Path(caminho).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+    )
+
+@contextmanager
+def conexao(caminho):
+    """
+    Conexão do pool do banco: reaproveita uma livre ou abre outra; ao final
+    ela volta ao pool (se a consulta falhar, a conexão é fechada)
+    """
+    with _TRAVA:
+        pool = _POOLS.setdefault(str(caminho), queue.LifoQueue(maxsize=TAMANHO_POOL))
+    try:
+        con = pool.get_nowait()
+    except queue.Empty:
+        con = _nova_conexao(caminho)
+    
+    try:
+        yield con
+    except Exception:
+        con.close()
+        raise
+    try:
+        pool.put_nowait(con)
+    except queue.Full:
+        con.close()
+
+def puxar_alteracoes(caminho, marca=None):
+    """
+    Clientes alterados no CRM a partir de `marca`
+    
+    A comparação usa >= para não perder alterações gravadas no mesmo instante
+    da marca; as linhas repetidas são descartadas em sincronizar.
+    
+    Args:
+        caminho: banco do CRM
+        marca: maior valor de COLUNA_ATUALIZACAO já lido (None = tudo)
+    
+    Returns:
+        (DataFrame com as colunas padronizadas presentes no CRM, nova marca)
+    """
+    sql = f'SELECT * FROM "{TABELA_CRM}"'
+    parametros = ()
+    if marca is not None:
+        sql += f' WHERE "{COLUNA_ATUALIZACAO}" >= ?'
+        parametros = (marca,)
+    sql += f' ORDER BY "{COLUNA_ATUALIZACAO}"'
+    
+    with conexao(caminho) as con:
+        df = pd.read_sql_query(sql, con, params=parametros)
+    
+    if not df.empty:
+        marca = df[COLUNA_ATUALIZACAO].max()
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    df = df[[c for c in COLUNAS_CRM if c in df.columns]].rename(columns=COLUNAS_CRM)
+    if "CLIENTE" not in df.columns:
+        raise ValueError(f"coluna 'cliente' ausente na tabela '{TABELA_CRM}' do CRM")
+    df["CLIENTE"] = df["CLIENTE"].astype(str).str.strip()
+    return df, marca
+
+def sincronizar(caminho):
+    """
+    Estado atual do CRM: as alterações desde a última marca são aplicadas
+    sobre o resultado da sincronização anterior (a 1ª lê a tabela inteira)
+    
+    Returns:
+        (DataFrame com uma linha por CLIENTE, marca)
+    """
+    with _TRAVA:
+        anterior = _SINCRONIZADO.get(str(caminho))
+    
+    novos, marca = puxar_alteracoes(caminho, anterior["marca"] if anterior else None)
+    clientes = novos if anterior is None else pd.concat([anterior["clientes"], novos], ignore_index=True)
+    clientes = clientes.drop_duplicates("CLIENTE", keep="last").reset_index(drop=True)
+    
+    with _TRAVA:
+        _SINCRONIZADO[str(caminho)] = {"marca": marca, "clientes": clientes}
+    return clientes, marca
+
+def aplicar_crm(df_info, clientes):
+    """
+    Sobrescreve os campos cadastrais de Informações Gerais com os do CRM
+    
+    Só clientes já presentes em df_info são atualizados (contrato, flags e
+    datas continuam vindo da base); valores vazios no CRM não apagam os da base.
+    """
+    campos = [c for c in clientes.columns if c != "CLIENTE" and c in df_info.columns]
+    if not campos or df_info.empty:
+        return df_info
+    
+    df = df_info.copy()
+    crm = clientes.set_index("CLIENTE")[campos].reindex(df["CLIENTE"])
+    for col in campos:
+        valores = pd.Series(crm[col].to_numpy(dtype=object), index=df.index)
+        preenchidos = valores.notna() & valores.astype(str).str.strip().ne("")
+        df[col] = valores.where(preenchidos, df[col])
+    return df
@@ -0,0 +1,147 @@
+"""
+Cubo denso de chamados: cliente x mês x categoria
+Guarda os chamados verticalizados como um array numpy 3-D com tabelas de
+rótulos; a série de um cliente é uma fatia e os totais da carteira são
+somas sobre um eixo, sem filtrar nem pivotar o DataFrame vertical
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas do DataFrame vertical usadas no cubo
+COLUNAS = ["CLIENTE", "MES_REF", "CATEGORIA", "VALOR"]
+
+# Memória máxima do cubo (ver tamanho_cubo): o cubo é denso e cresce com
+# clientes x meses mesmo no modo lotes; acima disso ele não é montado
+LIMITE_BYTES_CUBO = 1024 ** 3
+
+def montar_cubo(df_chamados, categorias, clientes=None):
+    """
+    Monta o cubo a partir do DataFrame vertical de chamados
+    
+    Linhas repetidas do mesmo cliente, mês e categoria são somadas.
+    
+    Args:
+        df_chamados: DataFrame com CLIENTE, MES_REF, CATEGORIA e VALOR
+        categorias: rótulos do eixo de categorias, em ordem
+        clientes: rótulos do eixo de clientes (ex.: o dicionário global de
+            clientes, para a posição ser o código do cliente); linhas de
+            clientes fora dele são ignoradas. None = os de df_chamados, ordenados
+    
+    Returns:
+        dict com 'valores' (float, clientes x meses x categorias),
+        'presente' (bool, clientes x meses: o cliente tem linhas no mês,
+        mesmo zeradas), e os rótulos 'clientes', 'meses' e 'categorias'
+        (pd.Index, ordenados; get_loc dá a posição de um rótulo)
+    """
+    df = _linhas_validas(df_chamados, categorias)
+    if clientes is None:
+        clientes = np.sort(df["CLIENTE"].astype(str).unique())
+    else:
+        df = df[pd.Index(clientes).get_indexer(df["CLIENTE"]) >= 0]
+    cubo = _cubo_vazio(clientes, np.sort(df["MES_REF"].unique()), categorias)
+    _somar(cubo, df)
+    return cubo
+
+def montar_cubo_partes(partes, categorias, clientes, meses):
+    """
+    Como montar_cubo, somando partes do DataFrame vertical uma a uma (ex.:
+    as partes do modo lotes): em memória ficam só o cubo e a parte atual
+    
+    Args:
+        partes: iterável de DataFrames com CLIENTE, MES_REF, CATEGORIA e VALOR
+        categorias: rótulos do eixo de categorias, em ordem
+        clientes: rótulos do eixo de clientes
+        meses: rótulos do eixo de meses (ex.: os do agregado mensal)
+    
+    Linhas de clientes ou meses fora dos eixos são ignoradas. As partes
+    não ficam em memória, mas o cubo é denso: ver tamanho_cubo.
+    """
+    cubo = _cubo_vazio(clientes, np.sort(pd.to_datetime(pd.Series(meses)).unique()), categorias)
+    for df in partes:
+        _somar(cubo, _linhas_validas(df, categorias))
+    return cubo
+
+def _linhas_validas(df_chamados, categorias):
+    """Linhas com mês e categoria do cubo (DataFrame vazio com as COLUNAS se faltar alguma)"""
+    if not set(COLUNAS).issubset(df_chamados.columns):
+        df_chamados = pd.DataFrame(columns=COLUNAS)
+    return df_chamados[df_chamados["MES_REF"].notna() & df_chamados["CATEGORIA"].isin(categorias)]
+
+def tamanho_cubo(num_clientes, num_meses, num_categorias):
+    """Bytes do cubo com esses eixos: 'valores' (float64) mais a máscara 'presente'"""
+    return num_clientes * num_meses * (8 * num_categorias + 1)
+
+def _cubo_vazio(clientes, meses, categorias):
+    """
+    Cubo zerado com os eixos dados
+    
+    Raises:
+        ValueError se o cubo passar de LIMITE_BYTES_CUBO
+    """
+    clientes = pd.Index(clientes, name="CLIENTE")
+    meses = pd.DatetimeIndex(meses, name="MES_REF")
+    categorias = pd.Index(categorias, name="CATEGORIA")
+    tamanho = tamanho_cubo(len(clientes), len(meses), len(categorias))
+    if tamanho > LIMITE_BYTES_CUBO:
+        raise ValueError(
+            f"cubo de chamados com {len(clientes)} clientes x {len(meses)} meses ocuparia "
+            f"{tamanho / 1024 ** 2:.0f} MB (limite: {LIMITE_BYTES_CUBO / 1024 ** 2:.0f} MB)"
+        )
+    return {
+        "valores": np.zeros((len(clientes), len(meses), len(categorias))),
+        "presente": np.zeros((len(clientes), len(meses)), dtype=bool),
+        "clientes": clientes,
+        "meses": meses,
+        "categorias": categorias,
+    }
+
+def _somar(cubo, df):
+    """Soma as linhas de df (já válidas) no cubo, ignorando rótulos fora dos eixos"""
+    codigos_cliente = cubo["clientes"].get_indexer(df["CLIENTE"])
+    codigos_mes = cubo["meses"].get_indexer(df["MES_REF"])
+    codigos_categoria = cubo["categorias"].get_indexer(df["CATEGORIA"].astype(str))
+    ok = (codigos_cliente >= 0) & (codigos_mes >= 0)
+    indices = (codigos_cliente[ok], codigos_mes[ok], codigos_categoria[ok])
+    np.add.at(cubo["valores"], indices, df["VALOR"].to_numpy(dtype=float)[ok])
+    cubo["presente"][indices[:2]] = True
+
+def serie_cliente(cubo, cliente):
+    """
+    Chamados de um cliente por mês (uma coluna por categoria)
+    
+    Returns:
+        DataFrame indexado por MES_REF, em ordem de mês, só com os meses em
+        que o cliente tem linhas; vazio (com as colunas) se ele não existir
+    """
+    return serie_posicao(cubo, cubo["clientes"].get_indexer([cliente])[0])
+
+def serie_posicao(cubo, posicao):
+    """
+    Como serie_cliente, pela posição do cliente no eixo (com o cubo montado
+    sobre o dicionário de clientes, a posição é o código do cliente)
+    """
+    if not 0 <= posicao < len(cubo["clientes"]):
+        return pd.DataFrame(columns=cubo["categorias"], index=cubo["meses"][:0], dtype=float)
+    meses = cubo["presente"][posicao]
+    return pd.DataFrame(
+        cubo["valores"][posicao, meses], index=cubo["meses"][meses], columns=cubo["categorias"]
+    )
+
+def soma_por_mes(cubo):
+    """Total da carteira por mês: DataFrame MES_REF x categorias"""
+    return pd.DataFrame(cubo["valores"].sum(axis=0), index=cubo["meses"], columns=cubo["categorias"])
+
+def soma_por_cliente(cubo):
+    """
+    Total de todos os meses por cliente: DataFrame CLIENTE x categorias
+    (só os clientes com linhas de chamados)
+    """
+    com_linhas = cubo["presente"].any(axis=1)
+    return pd.DataFrame(
+        cubo["valores"][com_linhas].sum(axis=1), index=cubo["clientes"][com_linhas], columns=cubo["categorias"]
+    )
+
+def total_por_categoria(cubo):
+    """Total geral de cada categoria (Series indexada pelas categorias)"""
+    return pd.Series(cubo["valores"].sum(axis=(0, 1)), index=cubo["categorias"])
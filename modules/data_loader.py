@@ -3,15 +3,130 @@ Sistema de carregamento e processamento de dados CS
 ETL executado ao rodar o app
 """
 
+import os
 import re
+import time
+import hashlib
+import threading
+import multiprocessing
+import openpyxl
 import streamlit as st
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, date
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl.cell.cell import ERROR_CODES
+from modules.fingerprint import impressao_digital
+from modules.fontes import (
+    tipo_fonte, impressao_digital_tabelas, ler_tabela, hash_arquivo, workbooks_regionais,
+    TABELA_INFO, TABELA_CHAMADOS, TABELA_MRR
+)
+from modules.tickets import agregar_tickets
+from modules.tickets_api import agregar_tickets_api
+from modules.contatos import ler_contatos, metricas_contato
+from modules.crm import sincronizar, aplicar_crm
+from modules.utils import relatorio_memoria
+from modules.cubo import montar_cubo, montar_cubo_partes, soma_por_mes, soma_por_cliente
+from modules.clientes import resolver_clientes, relatorio_candidatos, aplicar_resolucao, ler_aliases
+from modules.receita import matriz_mrr, indicadores_receita, movimentos_clientes
+from modules.snapshot import ler_snapshot, ler_snapshot_anterior, gravar_snapshot, preparar_frame
+from modules.base_sqlite import base_atualizada, materializar, chamados_cliente_mes, chamados_mensal, chamados_por_cliente
+from modules.lotes import (
+    pasta_versao, versao_completa, iniciar_versao, gravar_parte, gravar_tabela,
+    finalizar_versao, ler_partes, iterar_partes, ler_tabela as ler_tabela_lotes
+)
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
-ARQ_CS = DATA_DIR / "BASE-CS.xlsx"
+SNAPSHOT_DIR = DATA_DIR / "snapshot"
+
+# Origem dos dados: o BASE-CS.xlsx ou, via CS_FONTE_DADOS, outro .xlsx, um
+# diretório de CSV/Parquet ou um banco SQLite com as tabelas lógicas (modules.fontes),
+# ou vários workbooks regionais no layout do BASE-CS (diretório ou lista com os.pathsep)
+FONTE_DADOS = Path(os.environ.get("CS_FONTE_DADOS") or DATA_DIR / "BASE-CS.xlsx")
+TIPO_FONTE = tipo_fonte(FONTE_DADOS)
+ARQ_CS = FONTE_DADOS if TIPO_FONTE == "xlsx" else DATA_DIR / "BASE-CS.xlsx"
+
+# Fonte regional: todos os workbooks entram numa única "aba" lógica
+ORIGEM_REGIONAIS = "regionais"
+
+# Base SQLite opcional (CS_BASE_SQLITE=caminho do .db): chamados e clientes
+# materializados e indexados, consultados por SQL (ver modules.base_sqlite)
+BASE_SQLITE = os.environ.get("CS_BASE_SQLITE")
+
+# Exportação bruta de tickets (CS_TICKETS_CSV=caminho do .csv): quando definida,
+# os chamados vêm dela, agregados por cliente e mês, e não das abas mensais
+ARQ_TICKETS = os.environ.get("CS_TICKETS_CSV")
+ORIGEM_TICKETS = "tickets"
+
+# API de tickets (CS_TICKETS_API=URL do endpoint): os meses recentes dos chamados
+# (os últimos MESES_TICKETS_API meses completos + o atual) vêm dela, coletados
+# de novo a cada INTERVALO_TICKETS_API segundos (ver modules.tickets_api)
+URL_TICKETS_API = os.environ.get("CS_TICKETS_API")
+ORIGEM_TICKETS_API = "tickets_api"
+MESES_TICKETS_API = 1
+INTERVALO_TICKETS_API = 15 * 60
+ESTADO_TICKETS_API = DATA_DIR / "tickets_api.json"
+
+# Eventos de contato (CS_CONTATOS=caminho do .csv ou banco SQLite): quando
+# definidos, último contato e cadência vêm deles (ver modules.contatos)
+ARQ_CONTATOS = os.environ.get("CS_CONTATOS")
+ORIGEM_CONTATOS = "contatos"
+
+# Banco do CRM (CS_CRM_DB=caminho do SQLite): dados cadastrais (CSM, gerente,
+# contato...) sobrepostos a Informações Gerais, puxados de forma incremental
+# no máximo a cada INTERVALO_CRM segundos (ver modules.crm)
+ARQ_CRM = os.environ.get("CS_CRM_DB")
+ORIGEM_CRM = "crm"
+INTERVALO_CRM = 60
+
+# Resolução de clientes (ver modules.clientes): variações de grafia do mesmo
+# cliente entre abas e fontes (caixa, acentos, espaços, pontuação) viram um
+# único nome canônico e um CLIENTE_ID; CS_RESOLVER_CLIENTES=0 desliga (nomes
+# usados como vêm das fontes)
+RESOLVER_CLIENTES = os.environ.get("CS_RESOLVER_CLIENTES", "1") != "0"
+
+# Tabela de aliases revisada (CS_ALIASES_CLIENTES=caminho do .csv com ALIAS e
+# CLIENTE): única forma de unir grafias que não têm a mesma chave normalizada
+ARQ_ALIASES = os.environ.get("CS_ALIASES_CLIENTES")
+ORIGEM_ALIASES = "aliases_clientes"
+
+# Data de referência ("hoje") dos campos relativos a datas: dias sem contato,
+# vencimento e corte dos meses futuros. CS_DATA_REFERENCIA=AAAA-MM-DD fixa a
+# data (visão histórica, execuções reprodutíveis); sem ela, vale a data do dia
+DATA_REFERENCIA = os.environ.get("CS_DATA_REFERENCIA")
+
+# Versão do ETL gravada nos snapshots: incrementar sempre que a saída
+# de load_info_gerais/load_chamados_all mudar, para invalidá-los
+VERSAO_ETL = 7
+
+ABA_INFO = "Informações Gerais"
+
+# Histórico mensal de MRR (opcional): CLIENTE, MES_REF e MRR, uma linha por cliente e mês
+ABA_MRR = "MRR Mensal"
+
+# Abas de chamados são descobertas pelo nome: "Chamados Mensais AAAA"
+RE_ABA_CHAMADOS = re.compile(r"^\s*CHAMADOS\s+MENSAIS\s+(\d{4})\s*$", re.IGNORECASE)
+
+# Abaixo deste tamanho o parse em processos separados custa mais do que economiza
+PARSE_PARALELO_MIN_BYTES = 5 * 1024 * 1024
+
+# Linhas lidas por vez das abas de chamados (a aba nunca é carregada inteira)
+LINHAS_POR_LOTE = 1000
+
+# Workbook .xlsx compartilhado pelas leituras de aba de uma carga (ver
+# fonte_compartilhada); por thread, então a recarga não usa o de outra sessão
+_CARGA = threading.local()
+
+# Modo lotes (CS_MODO_LOTES=1, só para xlsx): as duas abas são normalizadas e
+# verticalizadas lote a lote e cada lote vai para Parquet em LOTES_DIR
+MODO_LOTES = os.environ.get("CS_MODO_LOTES") == "1"
+LOTES_DIR = DATA_DIR / "lotes"
 
 MESES_MAP = {
     1: "JANEIRO", 2: "FEVEREIRO", 3: "MARÇO", 4: "ABRIL",
@@ -19,371 +134,1717 @@ MESES_MAP = {
     9: "SETEMBRO", 10: "OUTUBRO", 11: "NOVEMBRO", 12: "DEZEMBRO"
 }
 
-def _to_sim_nao(x):
-    """Normaliza flag para SIM/NÃO"""
-    s = str(x).strip().upper()
-    if s in {"SIM", "S", "YES", "Y", "TRUE", "1"}:
-        return "SIM"
-    if s in {"NÃO", "NAO", "N", "NO", "FALSE", "0", "-", "", "NAN"}:
-        return "NÃO"
-    return "NÃO"
+# Ordem das 5 colunas de cada bloco mensal em "Chamados Mensais"
+CATEGORIAS_CHAMADOS = ["CHAMADOS", "INCIDENTES", "SOLICITACOES", "DENTRO_SLA", "FORA_SLA"]
+
+# Textos que significam "sem chamados" nas células de valores
+VALORES_SEM_CHAMADO = {"NÃO TEM", "NAO TEM", "", "IMPLANTAÇÃO", "IMPLANTACAO"}
+
+# Valores aceitos como "SIM" nas colunas de flag (viram True; o resto, False)
+VALORES_SIM = {"SIM", "S", "YES", "Y", "TRUE", "1"}
+
+# Alertas de vencimento do contrato, do mais urgente ao "OK"
+ALERTAS_VENCIMENTO = ["VENCIDO", "30_DIAS", "60_DIAS", "90_DIAS", "OK"]
+
+# Padrões simples de contato relativo: "A 1 SEMANA", "A 4 MESES"
+RE_CONTATO_RELATIVO = re.compile(r"A\s*(\d+)\s*(SEMANA|SEMANAS|MES|MESES)")
+
+# Coluna da saída do ETL com os dias atrás dos contatos em texto relativo;
+# vira data (e sai do DataFrame) na carga, pela data de referência
+COL_CONTATO_RELATIVO = "CONTATO_DIAS_ATRAS"
 
-def _parse_ultimo_contato(v):
+# Mapeamento declarativo da aba "Informações Gerais":
+# coluna padronizada -> (alternativas de palavras-chave, tipo, valor padrão)
+# As alternativas são tentadas em ordem; a primeira que achar coluna vence.
+MAPA_COLUNAS_INFO = {
+    "CLIENTE": ([["CLIENTE"]], "cliente", None),
+    "AT_RISK": ([["AT", "RISK", "CUSTOMER"], ["AT-RISK"]], "flag", False),
+    "CHURN_RISK": ([["CHURN", "RISK"], ["CANCELAMENTO"]], "flag", False),
+    "DATA_ATIVACAO": ([["ATIVAÇÃO"], ["ATIVACAO"]], "data", pd.NaT),
+    "VIGENCIA_INICIAL": ([["VIGÊNCIA", "INICIAL"], ["VIGENCIA", "INICIAL"]], "data", pd.NaT),
+    "VIGENCIA_FINAL": ([["VIGÊNCIA", "FINAL"], ["VIGENCIA", "FINAL"]], "data", pd.NaT),
+    "VALOR_CONTRATO": ([["VALOR"]], "numero", 0.0),
+    "ULTIMO_CONTATO_DT": ([["ÚLTIMO", "CONTATO"], ["ULTIMO", "CONTATO"]], "contato", pd.NaT),
+    "Customer Success Manager": ([["CUSTOMER", "SUCCESS"], ["CSM"]], "texto", "N/A"),
+    "GERENTE RESPONSÁVEL": ([["GERENTE"]], "texto", "N/A"),
+    "ATIVIDADE PRINCIPAL ": ([["ATIVIDADE"]], "texto", "N/A"),
+    "RESTRIÇÃO/SOLUÇÃO": ([["RESTRIÇÃO"], ["RESTRICAO"], ["SOLUÇÃO"]], "texto", "N/A"),
+    "UNIDADE": ([["UNIDADE"]], "texto", "N/A"),
+    "CONTATO": ([["CONTATO"]], "texto", "N/A"),
+    "TELEFONE": ([["TELEFONE"]], "texto", "N/A"),
+    "E-MAIL": ([["E-MAIL"], ["EMAIL"]], "texto", "N/A"),
+    "OBSERVAÇÃO": ([["OBSERVAÇÃO"], ["OBSERVACAO"]], "texto", ""),
+}
+
+def _to_flag(serie):
+    """Normaliza coluna de flag para booleano (SIM/S/YES... = True)"""
+    return serie.astype(str).str.strip().str.upper().isin(VALORES_SIM)
+
+def _parse_ultimo_contato(serie):
     """
-    Normaliza 'ÚLTIMO CONTATO' que pode ser:
+    Normaliza a coluna 'ÚLTIMO CONTATO', cujas células podem ser:
     - Data real (datetime)
     - Texto tipo 'A 1 SEMANA ATRÁS', 'A 4 MESES ATRAS'
+    
+    Datas são convertidas em bloco; o que não for data passa pelo regex
+    de contato relativo, aplicado à coluna inteira. O texto relativo vira
+    dias atrás, e a data só é calculada na carga (_aplicar_referencia).
+    
+    Returns:
+        (datas absolutas, dias atrás dos textos relativos), no índice da série
     """
-    if pd.isna(v):
-        return pd.NaT
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return pd.to_datetime(serie), pd.Series(np.nan, index=serie.index)
     
-    # caso já seja data
-    try:
-        ts = pd.to_datetime(v, errors="raise")
-        if not pd.isna(ts):
-            return ts
-    except Exception:
-        pass
-    
-    s = str(v).strip().upper()
-    # padrões simples: "A 1 SEMANA", "A 4 MESES"
-    m = re.search(r"A\s*(\d+)\s*(SEMANA|SEMANAS|MES|MESES)", s)
-    if m:
-        n = int(m.group(1))
-        unidade = m.group(2)
-        hoje = pd.Timestamp(date.today())
-        if "SEMANA" in unidade:
-            return hoje - pd.Timedelta(days=7 * n)
-        if "MES" in unidade:
-            return hoje - pd.Timedelta(days=30 * n)
-    
-    return pd.NaT
+    datas = pd.to_datetime(serie, errors="coerce", format="mixed")
+    
+    partes = serie.astype(str).str.strip().str.upper().str.extract(RE_CONTATO_RELATIVO)
+    n = pd.to_numeric(partes[0], errors="coerce")
+    dias = np.where(partes[1].str.contains("SEMANA", na=False), 7 * n, 30 * n)
+    
+    return datas.where(serie.notna()), pd.Series(dias, index=serie.index).where(datas.isna() & serie.notna())
+
+def _is_cancelado(df, colunas):
+    """Marca linhas com texto "cancelado" em alguma das colunas informadas"""
+    cancelado = pd.Series(False, index=df.index)
+    for c in colunas:
+        if c and c in df.columns:
+            cancelado |= df[c].astype(str).str.upper().str.contains("CANCEL", regex=False)
+    return cancelado
 
 def _normalizar_nome_coluna(col):
     """Normaliza nome de coluna para busca"""
     return str(col).strip().upper().replace('\n', ' ')
 
-def _encontrar_coluna(df, palavras_chave):
+def _encontrar_coluna(colunas_norm, palavras_chave):
     """
     Encontra coluna que contenha todas as palavras-chave
     
+    Entre várias candidatas vence a de nome idêntico às palavras-chave,
+    depois a de nome mais curto e, no empate, a primeira em ordem
+    alfabética; o resultado não depende da ordem das colunas na planilha.
+    
     Args:
-        df: DataFrame
+        colunas_norm: dict {nome original: nome normalizado}
         palavras_chave: lista de strings que devem estar no nome da coluna
     
     Returns:
         nome original da coluna ou None
     """
-    for col in df.columns:
-        col_norm = _normalizar_nome_coluna(col)
-        if all(palavra.upper() in col_norm for palavra in palavras_chave):
-            return col
-    return None
+    palavras = [p.upper() for p in palavras_chave]
+    alvo = " ".join(palavras)
+    candidatas = [
+        (col_norm != alvo, len(col_norm), col_norm, col)
+        for col, col_norm in colunas_norm.items()
+        if all(p in col_norm for p in palavras)
+    ]
+    return min(candidatas)[3] if candidatas else None
 
-def _verticalizar_chamados(df_raw):
-    """
-    Verticaliza planilha de chamados
+def _assinatura_cabecalho(colunas):
+    """Hash estável da lista de cabeçalhos (mesmos nomes -> mesma assinatura)"""
+    return hashlib.sha1("\x1f".join(map(str, colunas)).encode("utf-8")).hexdigest()
+
+_MAPAS_COMPILADOS = {}
+
+def _compilar_mapa_colunas(colunas):
     """
-    if df_raw.empty or df_raw.shape[1] < 6:
-        return pd.DataFrame(columns=["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"])
+    Resolve MAPA_COLUNAS_INFO contra um cabeçalho, uma única vez por assinatura
     
-    linha_datas, linha_cats, linha_dados = 0, 1, 2
+    Args:
+        colunas: nomes das colunas da planilha (já com strip)
     
-    # Pegar clientes (primeira coluna, a partir da linha 2)
-    clientes = df_raw.iloc[linha_dados:, 0].dropna().astype(str).str.strip()
-    clientes = clientes[clientes.ne("") & clientes.ne("nan")]
+    Returns:
+        dict com 'assinatura', 'mapeamento' {nome padronizado: coluna de origem ou None},
+        'ausentes' e 'nao_mapeadas'
+    """
+    assinatura = _assinatura_cabecalho(colunas)
+    if assinatura in _MAPAS_COMPILADOS:
+        return _MAPAS_COMPILADOS[assinatura]
     
-    # CORREÇÃO: Se não há clientes, retornar vazio
-    if clientes.empty:
-        return pd.DataFrame(columns=["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"])
-    
-    num_cols = df_raw.shape[1]
-    num_meses = (num_cols - 1) // 5
-    
-    categorias_map = {
-        0: "CHAMADOS",
-        1: "INCIDENTES",
-        2: "SOLICITACOES",
-        3: "DENTRO_SLA",
-        4: "FORA_SLA",
+    colunas_norm = {col: _normalizar_nome_coluna(col) for col in colunas}
+    mapeamento = {}
+    for nome, (alternativas, _tipo, _padrao) in MAPA_COLUNAS_INFO.items():
+        mapeamento[nome] = next(
+            (c for c in (_encontrar_coluna(colunas_norm, alt) for alt in alternativas) if c),
+            None
+        )
+    
+    usadas = set(mapeamento.values())
+    compilado = {
+        "assinatura": assinatura,
+        "mapeamento": mapeamento,
+        "ausentes": [nome for nome, col in mapeamento.items() if col is None],
+        "nao_mapeadas": [col for col in colunas if col not in usadas],
     }
+    _MAPAS_COMPILADOS[assinatura] = compilado
+    return compilado
+
+def _linhas_aba(fonte, aba):
+    """
+    Gerador das linhas de uma aba (tuplas de valores), lidas com o iterador
+    read-only do openpyxl: a aba nunca fica inteira em memória
     
-    out = []
+    Args:
+        fonte: caminho do .xlsx ou workbook já aberto em modo read-only
+        aba: nome da aba
+    """
+    wb = fonte
+    if not isinstance(fonte, openpyxl.Workbook):
+        wb = openpyxl.load_workbook(fonte, read_only=True, data_only=True, keep_links=False)
+    try:
+        yield from wb[aba].iter_rows(values_only=True)
+    finally:
+        if wb is not fonte:
+            wb.close()
+
+def _abrir_excel():
+    """.xlsx da fonte aberto com o iterador read-only do openpyxl, como pd.ExcelFile"""
+    wb = openpyxl.load_workbook(ARQ_CS, read_only=True, data_only=True, keep_links=False)
+    return pd.ExcelFile(wb, engine="openpyxl")
+
+@contextmanager
+def fonte_compartilhada():
+    """
+    Dentro do bloco, as leituras de aba do .xlsx (Informações Gerais,
+    chamados, MRR) usam um único workbook, aberto na primeira leitura e
+    fechado na saída: o arquivo é aberto uma vez por carga e não fica preso
+    entre cargas. Fora do bloco, cada leitura abre e fecha o seu
+    """
+    if getattr(_CARGA, "ativa", False):
+        yield
+        return
+    _CARGA.ativa, _CARGA.excel = True, None
+    try:
+        yield
+    finally:
+        if _CARGA.excel is not None:
+            _CARGA.excel.close()
+        _CARGA.ativa, _CARGA.excel = False, None
+
+@contextmanager
+def _excel_fonte():
+    """pd.ExcelFile do .xlsx da fonte: o da carga em andamento (ver fonte_compartilhada) ou um só para o bloco"""
+    if getattr(_CARGA, "ativa", False):
+        if _CARGA.excel is None:
+            _CARGA.excel = _abrir_excel()
+        yield _CARGA.excel
+        return
+    excel = _abrir_excel()
+    try:
+        yield excel
+    finally:
+        excel.close()
+
+def _lotes(linhas, tamanho):
+    """Agrupa um iterador de linhas em listas de até `tamanho` linhas"""
+    while True:
+        lote = list(islice(linhas, tamanho))
+        if not lote:
+            return
+        yield lote
+
+def _nome_cliente(valor):
+    """Nome do cliente na primeira coluna; None para célula vazia ou com erro de fórmula"""
+    if valor is None or valor in ERROR_CODES:
+        return None
+    nome = str(valor).strip()
+    return nome if nome not in ("", "nan") else None
+
+def _blocos_mensais(cabecalho, num_meses):
+    """
+    Blocos mensais válidos da planilha de chamados
     
-    for mes_idx in range(num_meses):
-        col_inicio = 1 + mes_idx * 5
-        col_fim = col_inicio + 5
-        
-        # Ler data do mês
-        data_mes = df_raw.iloc[linha_datas, col_inicio]
-        
-        if pd.isna(data_mes):
-            continue
+    Args:
+        cabecalho: primeira linha da aba (uma data a cada 5 colunas)
+        num_meses: quantidade de blocos de 5 colunas na aba
+    
+    Returns:
+        lista de (índice do bloco, data do mês); meses sem data ficam de fora
+        (os futuros são cortados na carga, pela data de referência)
+    """
+    datas = [
+        pd.to_datetime(cabecalho[1 + i * 5] if 1 + i * 5 < len(cabecalho) else None, errors="coerce")
+        for i in range(num_meses)
+    ]
+    
+    # CORREÇÃO: Ignorar meses sem data
+    return [(i, d) for i, d in enumerate(datas) if pd.notna(d)]
+
+def _normalizar_valores(matriz):
+    """
+    Valores de chamados como float: textos de ausência viram 0, resto numérico (NaN -> 0)
+    
+    Args:
+        matriz: array object com as células de um lote
+    """
+    valores = pd.Series(matriz.ravel())
+    vazios = valores.astype(str).str.strip().str.upper().isin(VALORES_SEM_CHAMADO)
+    valores = pd.to_numeric(valores.mask(vazios, 0), errors="coerce").fillna(0).astype(float)
+    return valores.to_numpy().reshape(matriz.shape)
+
+def _lotes_aba_chamados(fonte, aba):
+    """
+    Lê uma aba de chamados em streaming e gera, a cada LINHAS_POR_LOTE linhas,
+    os clientes do lote e sua matriz de valores já normalizada para float;
+    a aba crua nunca fica inteira em memória
+    
+    O pareamento é posicional, como na planilha: o k-ésimo cliente válido fica
+    com a k-ésima linha de dados (a partir da 3ª linha).
+    
+    Yields:
+        (blocos [(índice, data)], clientes do lote, valores (clientes x blocos x 5))
+    """
+    num_cats = len(CATEGORIAS_CHAMADOS)
+    linhas = _linhas_aba(fonte, aba)
+    try:
+        cabecalho = [next(linhas, ()) for _ in range(2)]
+        largura = max(
+            (j + 1 for linha in cabecalho for j, v in enumerate(linha) if v is not None),
+            default=0
+        )
+        blocos = _blocos_mensais(cabecalho[0], max((largura - 1) // 5, 0))
+        if not blocos:
+            return
         
-        data_mes = pd.to_datetime(data_mes, errors="coerce")
+        colunas = np.array([1 + i * 5 + k for i, _ in blocos for k in range(num_cats)])
+        pendentes = deque()
+        for lote in _lotes(linhas, LINHAS_POR_LOTE):
+            nomes, dados = [], []
+            for linha in lote:
+                pendentes.append(linha)
+                nome = _nome_cliente(linha[0] if linha else None)
+                if nome is not None:
+                    nomes.append(nome)
+                    dados.append(pendentes.popleft())
+            if not nomes:
+                continue
+            
+            matriz = np.full((len(dados), largura), None, dtype=object)
+            for j, linha in enumerate(dados):
+                n = min(len(linha), largura)
+                matriz[j, :n] = linha[:n]
+            valores = _normalizar_valores(matriz[:, colunas]).reshape(len(nomes), len(blocos), num_cats)
+            yield blocos, nomes, valores
+    finally:
+        linhas.close()
+
+def _ler_aba_chamados(fonte, aba):
+    """
+    Lê uma aba de chamados (ver _lotes_aba_chamados) e a reduz à matriz numérica
+    
+    Cada lote entra no hash de cada bloco mensal; só a matriz compacta
+    (8 bytes por célula) fica em memória.
+    
+    Returns:
+        (blocos [(índice, data)], clientes, valores (clientes x blocos x 5), {'AAAA-MM': hash})
+    """
+    num_cats = len(CATEGORIAS_CHAMADOS)
+    blocos, clientes, partes, hashes = [], [], [], {}
+    for blocos, nomes, valores in _lotes_aba_chamados(fonte, aba):
+        if not hashes:
+            hashes = {f"{d:%Y-%m}": hashlib.sha1() for _, d in blocos}
         
-        if pd.isna(data_mes):
-            continue
+        # Hash linha a linha (cliente + 5 valores): o resultado não depende do tamanho do lote
+        h_clientes = pd.util.hash_pandas_object(pd.Series(nomes), index=False).to_numpy()
+        for b, (_, data) in enumerate(blocos):
+            linha_hash = np.empty((len(nomes), 1 + num_cats), dtype=np.uint64)
+            linha_hash[:, 0] = h_clientes
+            linha_hash[:, 1:] = np.ascontiguousarray(valores[:, b, :]).view(np.uint64)
+            hashes[f"{data:%Y-%m}"].update(linha_hash.tobytes())
         
-        # CORREÇÃO: Ignorar dados futuros (2026 vazio)
-        hoje = pd.Timestamp.now()
-        if data_mes > hoje:
+        clientes.extend(nomes)
+        partes.append(valores)
+    
+    valores = np.concatenate(partes) if partes else np.zeros((0, len(blocos), num_cats))
+    return blocos, np.array(clientes, dtype=object), valores, {mes: h.hexdigest() for mes, h in hashes.items()}
+
+def _verticalizar_chamados(clientes, valores, blocos, selecionados=None):
+    """
+    Verticaliza a matriz de chamados (clientes x meses x 5 categorias)
+    
+    Trabalha sobre o bloco inteiro de valores com operações de numpy,
+    sem laço por célula.
+    
+    Args:
+        clientes, valores, blocos: saída de _ler_aba_chamados
+        selecionados: posições em blocos a verticalizar (padrão: todas)
+    """
+    colunas_saida = ["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"]
+    if selecionados is None:
+        selecionados = range(len(blocos))
+    selecionados = list(selecionados)
+    
+    # CORREÇÃO: Se não há clientes, retornar vazio
+    if len(clientes) == 0 or not selecionados:
+        return pd.DataFrame(columns=colunas_saida)
+    
+    num_clientes = len(clientes)
+    num_cats = len(CATEGORIAS_CHAMADOS)
+    datas_validas = pd.DatetimeIndex([blocos[b][1] for b in selecionados])
+    
+    # (clientes, meses, 5) -> ordem mês, cliente, categoria
+    valores = valores[:, selecionados, :].transpose(1, 0, 2).ravel()
+    
+    n_linhas_mes = num_clientes * num_cats
+    anos = datas_validas.year.to_numpy(dtype="int64")
+    meses = datas_validas.month.to_numpy(dtype="int64")
+    
+    return pd.DataFrame({
+        "CLIENTE": np.tile(np.repeat(clientes, num_cats), len(selecionados)),
+        "ANO": np.repeat(anos, n_linhas_mes),
+        "MES": np.repeat(meses, n_linhas_mes),
+        "MES_NOME": np.repeat([MESES_MAP.get(m, str(m)) for m in meses], n_linhas_mes),
+        "MES_REF": np.repeat(datas_validas.normalize(), n_linhas_mes),
+        "CATEGORIA": np.tile(CATEGORIAS_CHAMADOS, len(selecionados) * num_clientes),
+        "VALOR": valores,
+    })
+
+def impressao_digital_base():
+    """
+    Hash de conteúdo da fonte de dados e de cada aba (ver modules.fingerprint);
+    nas fontes tabulares as abas são as tabelas lógicas (ver modules.fontes);
+    na fonte regional o conjunto de workbooks é a única aba, ORIGEM_REGIONAIS;
+    tickets, contatos e a tabela de aliases, se configurados, entram como
+    ORIGEM_TICKETS/ORIGEM_CONTATOS/ORIGEM_ALIASES;
+    o CRM entra como ORIGEM_CRM, identificado pela marca da última sincronização,
+    e a API de tickets como ORIGEM_TICKETS_API, identificada pelo ciclo de coleta
+    
+    Returns:
+        dict {'arquivo': hash, 'abas': {nome: hash}}; com a fonte ausente
+        ou ilegível os hashes ficam vazios e os loaders exibem o erro
+    """
+    try:
+        if TIPO_FONTE == "xlsx":
+            base = impressao_digital(ARQ_CS)
+        elif TIPO_FONTE == "regional":
+            base = _impressao_digital_regionais()
+        else:
+            base = impressao_digital_tabelas(FONTE_DADOS, TIPO_FONTE)
+    except Exception:
+        base = {"arquivo": None, "abas": {}}
+    extras = [
+        (nome, arq)
+        for nome, arq in ((ORIGEM_TICKETS, ARQ_TICKETS), (ORIGEM_CONTATOS, ARQ_CONTATOS), (ORIGEM_ALIASES, ARQ_ALIASES))
+        if arq
+    ]
+    if not extras and not ARQ_CRM and not URL_TICKETS_API:
+        return base
+    
+    # Arquivo extra ausente fica fora do hash; o loader correspondente exibe o erro
+    abas = dict(base["abas"])
+    h = hashlib.sha1(str(base["arquivo"]).encode("ascii"))
+    for nome, arq in extras:
+        try:
+            abas[nome] = hash_arquivo(arq)
+        except OSError:
             continue
-        
-        ano = int(data_mes.year)
-        mes = int(data_mes.month)
-        mes_ref = data_mes.normalize()
-        
-        # Para cada cliente
-        for i, cliente in enumerate(clientes.tolist()):
-            linha = linha_dados + i
-            
-            if linha >= df_raw.shape[0]:
-                break
-            
-            # Pegar valores das 5 categorias
-            valores = df_raw.iloc[linha, col_inicio:col_fim].tolist()
-            
-            for cat_idx, cat in categorias_map.items():
-                v = valores[cat_idx] if cat_idx < len(valores) else 0
-                
-                # Normalizar valor
-                if pd.isna(v):
-                    v = 0
-                elif isinstance(v, str):
-                    if v.strip().upper() in {"NÃO TEM", "NAO TEM", "", "IMPLANTAÇÃO", "IMPLANTACAO"}:
-                        v = 0
-                    else:
-                        v = pd.to_numeric(v, errors="coerce")
-                        v = 0 if pd.isna(v) else float(v)
-                else:
-                    v = pd.to_numeric(v, errors="coerce")
-                    v = 0 if pd.isna(v) else float(v)
-                
-                out.append({
-                    "CLIENTE": str(cliente).strip(),
-                    "ANO": ano,
-                    "MES": mes,
-                    "MES_NOME": MESES_MAP.get(mes, str(mes)),
-                    "MES_REF": mes_ref,
-                    "CATEGORIA": cat,
-                    "VALOR": float(v),
-                })
-    
-    return pd.DataFrame(out)
-
-@st.cache_data
-def load_info_gerais():
-    """Carrega e processa Informações Gerais"""
+        h.update(f"|{nome}:{abas[nome]}".encode("ascii"))
+    
+    marca_crm = _load_crm()[1] if ARQ_CRM else None
+    if marca_crm is not None:
+        abas[ORIGEM_CRM] = hashlib.sha1(str(marca_crm).encode("utf-8")).hexdigest()
+        h.update(f"|{ORIGEM_CRM}:{abas[ORIGEM_CRM]}".encode("ascii"))
+    
+    if URL_TICKETS_API:
+        abas[ORIGEM_TICKETS_API] = f"{URL_TICKETS_API}@{int(time.time() // INTERVALO_TICKETS_API)}"
+        h.update(f"|{ORIGEM_TICKETS_API}:{abas[ORIGEM_TICKETS_API]}".encode("utf-8"))
+    return {"arquivo": h.hexdigest(), "abas": abas}
+
+def _impressao_digital_regionais():
+    """
+    Impressão digital da fonte regional: o hash do conjunto combina o de
+    cada workbook, então qualquer região alterada muda a versão
+    
+    Raises:
+        OSError se algum workbook não existir; ValueError sem nenhum workbook
+    """
+    workbooks = workbooks_regionais(FONTE_DADOS)
+    if not workbooks:
+        raise ValueError("nenhum workbook .xlsx na fonte regional")
+    h = hashlib.sha1(b"regional")
+    for caminho in workbooks:
+        h.update(f"|{caminho.name}:{impressao_digital(caminho)['arquivo']}".encode("utf-8"))
+    return {"arquivo": h.hexdigest(), "abas": {ORIGEM_REGIONAIS: h.hexdigest()}}
+
+def _aba_info():
+    """Aba (xlsx) ou tabela lógica de onde vem Informações Gerais"""
+    if TIPO_FONTE == "regional":
+        return ORIGEM_REGIONAIS
+    return ABA_INFO if TIPO_FONTE == "xlsx" else TABELA_INFO
+
+def _aba_mrr():
+    """Aba (xlsx) ou tabela lógica do histórico de MRR"""
+    return ABA_MRR if TIPO_FONTE == "xlsx" else TABELA_MRR
+
+def _hashes_abas(abas):
+    """Tupla com o hash de cada aba pedida (None se a aba não existir)"""
+    hashes = impressao_digital_base()["abas"]
+    return tuple(hashes.get(aba) for aba in abas)
+
+def _abas_chamados():
+    """
+    Abas "Chamados Mensais AAAA" do workbook, em ordem de ano
+    (inclui anos arquivados e futuros, sem lista fixa); nas fontes
+    tabulares, a tabela lógica de chamados; na fonte regional, ORIGEM_REGIONAIS;
+    com exportação de tickets, ORIGEM_TICKETS
+    """
+    abas = impressao_digital_base()["abas"]
+    if ARQ_TICKETS:
+        return [ORIGEM_TICKETS] if ORIGEM_TICKETS in abas else []
+    if TIPO_FONTE == "regional":
+        return [ORIGEM_REGIONAIS] if ORIGEM_REGIONAIS in abas else []
+    if TIPO_FONTE != "xlsx":
+        return [TABELA_CHAMADOS] if TABELA_CHAMADOS in abas else []
+    return _ordenar_abas_chamados(abas)
+
+def _ordenar_abas_chamados(nomes):
+    """Abas "Chamados Mensais AAAA" entre os nomes dados, em ordem de ano (a 1ª de cada ano)"""
+    anos = {}
+    for aba in nomes:
+        m = RE_ABA_CHAMADOS.match(aba)
+        if m:
+            anos.setdefault(int(m.group(1)), aba)
+    return [anos[ano] for ano in sorted(anos)]
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def _ler_aba_info(hash_aba):
+    """
+    Lê a aba Informações Gerais (uma vez por conteúdo), ou a tabela
+    lógica equivalente nas fontes tabulares
+    
+    Args:
+        hash_aba: impressão digital da aba (só chaveia o cache)
+    """
+    if TIPO_FONTE == "regional":
+        # Relatório de schema: as regiões seguem o mesmo layout, vale o 1º workbook
+        return pd.read_excel(workbooks_regionais(FONTE_DADOS)[0], sheet_name=ABA_INFO)
+    if TIPO_FONTE != "xlsx":
+        return ler_tabela(FONTE_DADOS, TIPO_FONTE, TABELA_INFO)
+    with _excel_fonte() as excel:
+        return excel.parse(ABA_INFO)
+
+def _processar_aba_chamados(fonte, aba, hashes_conhecidos):
+    """
+    Lê uma aba de chamados e verticaliza só os blocos mensais cujo hash não
+    esteja em hashes_conhecidos. Roda em processo separado quando o parse
+    é paralelo, por isso recebe tudo por argumento.
+    
+    Args:
+        fonte: caminho do .xlsx ou workbook já aberto em modo read-only
+        aba: nome da aba
+        hashes_conhecidos: dict {'AAAA-MM': hash} dos blocos reaproveitáveis
+    
+    Returns:
+        (aba, meses 'AAAA-MM' na ordem da planilha, {mês: hash}, DataFrame dos blocos novos)
+    """
+    blocos, clientes, valores, hashes = _ler_aba_chamados(fonte, aba)
+    if len(clientes) == 0:
+        return aba, [], {}, pd.DataFrame()
+    
+    novos = [b for b, (_, d) in enumerate(blocos) if hashes_conhecidos.get(f"{d:%Y-%m}") != hashes[f"{d:%Y-%m}"]]
+    df_novos = _verticalizar_chamados(clientes, valores, blocos, novos) if novos else pd.DataFrame()
+    return aba, [f"{d:%Y-%m}" for _, d in blocos], hashes, df_novos
+
+def _processar_abas_chamados(abas, hashes_conhecidos):
+    """
+    Aplica _processar_aba_chamados a cada aba: em um pool de processos para
+    workbooks grandes com várias abas, em sequência (no workbook da carga,
+    ver fonte_compartilhada) nos demais casos
+    
+    Returns:
+        lista de resultados na mesma ordem de abas
+    """
+    paralelo = len(abas) > 1 and os.path.getsize(ARQ_CS) >= PARSE_PARALELO_MIN_BYTES
+    if paralelo:
+        contexto = multiprocessing.get_context("spawn")
+        trabalhadores = min(len(abas), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=trabalhadores, mp_context=contexto) as pool:
+            return list(pool.map(
+                _processar_aba_chamados,
+                [str(ARQ_CS)] * len(abas),
+                abas,
+                [hashes_conhecidos.get(aba, {}) for aba in abas],
+            ))
+    
+    with _excel_fonte() as excel:
+        return [_processar_aba_chamados(excel.book, aba, hashes_conhecidos.get(aba, {})) for aba in abas]
+
+def _com_snapshot(nome, abas, hashes, etl, incremental=False):
+    """
+    Devolve a tabela do snapshot em disco se ele ainda corresponder ao
+    conteúdo das abas de origem e a VERSAO_ETL; senão roda o ETL e grava
+    um novo snapshot
+    
+    Com incremental=True o ETL recebe o snapshot anterior e seus extras,
+    e devolve (DataFrame, extras) para reaproveitar o que não mudou.
+    
+    Fontes tabulares não passam pelo parse do Excel e não usam snapshot.
+    """
+    if not any(hashes) or TIPO_FONTE != "xlsx":
+        return etl()[0] if incremental else etl()
+    fonte = {"arquivo": ARQ_CS.name, "abas": dict(zip(abas, hashes))}
+    
+    df = ler_snapshot(SNAPSHOT_DIR, nome, fonte, VERSAO_ETL)
+    if df is not None:
+        return df
+    
+    if incremental:
+        df, extras = etl(*ler_snapshot_anterior(SNAPSHOT_DIR, nome, VERSAO_ETL))
+    else:
+        df, extras = etl(), None
+    if df.empty:
+        return df
+    return gravar_snapshot(SNAPSHOT_DIR, nome, df, fonte, VERSAO_ETL, extras)
+
+def load_info_gerais(referencia=None):
+    """
+    Carrega e processa Informações Gerais
+    
+    Args:
+        referencia: data "de hoje" dos campos relativos (ver data_referencia)
+    """
+    referencia = data_referencia(referencia)
+    df = _aplicar_referencia(_info_gerais_base(), referencia)
+    df = _aplicar_contatos(df, referencia)
+    
+    clientes_crm = _load_crm()[0] if ARQ_CRM else None
+    if clientes_crm is None:
+        return df
+    clientes_crm = _resolver_clientes(clientes_crm).drop_duplicates("CLIENTE", keep="last")
+    return aplicar_crm(df, clientes_crm)
+
+def data_referencia(referencia=None):
+    """
+    Data de referência dos campos relativos a datas (Timestamp à meia-noite):
+    a informada, senão CS_DATA_REFERENCIA, senão a data do dia
+    """
+    return pd.Timestamp(referencia or DATA_REFERENCIA or date.today()).normalize()
+
+def _info_gerais_base():
+    """Informações Gerais sem os campos relativos à data de referência"""
+    return _load_info_gerais_base(_hash_resolucao())
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_info_gerais_base(hashes):
+    """
+    Parte de Informações Gerais que não depende da data, em cache por versão
+    dos dados: clientes resolvidos e codificados, com CLIENTE_ID
+    """
+    df = _codificar_clientes(_resolver_clientes(_info_gerais_fonte()))
+    if not df.empty:
+        ids = _resolucao_clientes()["ids"] if RESOLVER_CLIENTES else {}
+        df["CLIENTE_ID"] = df["CLIENTE"].map(ids).fillna(df["CLIENTE"])
+    return df
+
+def _info_gerais_fonte():
+    """Informações Gerais como vêm da fonte (antes da resolução de clientes)"""
+    if _modo_lotes():
+        return _load_lotes("info_gerais", _pasta_lotes())
+    return _load_info_gerais(_hashes_abas([_aba_info()]))
+
+@st.cache_data(max_entries=2)
+def _load_info_gerais(hashes):
+    """Informações Gerais em cache, chaveado pelo hash de conteúdo da aba"""
+    if TIPO_FONTE == "regional":
+        return _load_regionais(hashes[0])[0]
+    return _com_snapshot("info_gerais", [ABA_INFO], hashes, _etl_info_gerais)
+
+def _etl_info_gerais():
+    """ETL da aba Informações Gerais"""
     try:
-        df = pd.read_excel(ARQ_CS, sheet_name="Informações Gerais")
+        df = _ler_aba_info(_hashes_abas([_aba_info()])[0])
     except FileNotFoundError:
-        st.error(f"❌ Arquivo não encontrado: {ARQ_CS}")
+        st.error(f"❌ Arquivo não encontrado: {FONTE_DADOS}")
         return pd.DataFrame()
     except Exception as e:
         st.error(f"❌ Erro ao carregar Informações Gerais: {e}")
         return pd.DataFrame()
     
+    df = _normalizar_info(df)
+    if df is None:
+        st.error("❌ Coluna 'CLIENTE' não encontrada")
+        return pd.DataFrame()
+    return df
+
+def _normalizar_info(df):
+    """
+    Normaliza um DataFrame cru de Informações Gerais (a aba inteira ou um
+    lote de linhas): colunas padronizadas, datas, flags e alertas
+    
+    Returns:
+        DataFrame normalizado ou None se não houver coluna de cliente
+    """
     # Normalizar nomes das colunas (manter originais mas criar mapeamento)
     df.columns = [str(c).strip() for c in df.columns]
     
-    # Encontrar colunas dinamicamente
-    col_cliente = _encontrar_coluna(df, ["CLIENTE"]) or "CLIENTE"
-    col_at_risk = _encontrar_coluna(df, ["AT", "RISK", "CUSTOMER"]) or _encontrar_coluna(df, ["AT-RISK"])
-    col_churn_risk = _encontrar_coluna(df, ["CHURN", "RISK"]) or _encontrar_coluna(df, ["CANCELAMENTO"])
-    col_ativacao = _encontrar_coluna(df, ["ATIVAÇÃO"]) or _encontrar_coluna(df, ["ATIVACAO"])
-    col_vig_inicial = _encontrar_coluna(df, ["VIGÊNCIA", "INICIAL"]) or _encontrar_coluna(df, ["VIGENCIA", "INICIAL"])
-    col_vig_final = _encontrar_coluna(df, ["VIGÊNCIA", "FINAL"]) or _encontrar_coluna(df, ["VIGENCIA", "FINAL"])
-    col_valor = _encontrar_coluna(df, ["VALOR"])
-    col_ultimo_contato = _encontrar_coluna(df, ["ÚLTIMO", "CONTATO"]) or _encontrar_coluna(df, ["ULTIMO", "CONTATO"])
-    col_csm = _encontrar_coluna(df, ["CUSTOMER", "SUCCESS"]) or _encontrar_coluna(df, ["CSM"])
-    col_gerente = _encontrar_coluna(df, ["GERENTE"])
-    col_atividade = _encontrar_coluna(df, ["ATIVIDADE"])
-    col_restricao = _encontrar_coluna(df, ["RESTRIÇÃO"]) or _encontrar_coluna(df, ["RESTRICAO"]) or _encontrar_coluna(df, ["SOLUÇÃO"])
-    col_unidade = _encontrar_coluna(df, ["UNIDADE"])
-    col_contato = _encontrar_coluna(df, ["CONTATO"])
-    col_telefone = _encontrar_coluna(df, ["TELEFONE"])
-    col_email = _encontrar_coluna(df, ["E-MAIL"]) or _encontrar_coluna(df, ["EMAIL"])
-    col_obs = _encontrar_coluna(df, ["OBSERVAÇÃO"]) or _encontrar_coluna(df, ["OBSERVACAO"])
+    # Resolver colunas pelo mapeamento declarativo (cacheado por cabeçalho)
+    mapa = _compilar_mapa_colunas(list(df.columns))["mapeamento"]
     
     # Filtrar linhas válidas
-    if col_cliente and col_cliente in df.columns:
+    col_cliente = mapa["CLIENTE"] or "CLIENTE"
+    if col_cliente in df.columns:
+        # Nulos saem antes do astype(str), senão viram os textos "None"/"nan"
+        df = df[df[col_cliente].notna()].copy()
         df["CLIENTE"] = df[col_cliente].astype(str).str.strip()
         df = df[df["CLIENTE"].ne("") & df["CLIENTE"].ne("nan")].copy()
     else:
-        st.error("❌ Coluna 'CLIENTE' não encontrada")
-        return pd.DataFrame()
-    
-    # Criar colunas padronizadas
-    
-    # Flags
-    if col_at_risk and col_at_risk in df.columns:
-        df["AT_RISK"] = df[col_at_risk].apply(_to_sim_nao)
-    else:
-        df["AT_RISK"] = "NÃO"
+        return None
     
-    if col_churn_risk and col_churn_risk in df.columns:
-        df["CHURN_RISK"] = df[col_churn_risk].apply(_to_sim_nao)
-    else:
-        df["CHURN_RISK"] = "NÃO"
-    
-    # Datas/valor
-    if col_ativacao and col_ativacao in df.columns:
-        df["DATA_ATIVACAO"] = pd.to_datetime(df[col_ativacao], errors="coerce")
-    else:
-        df["DATA_ATIVACAO"] = pd.NaT
+    # Criar colunas padronizadas: flags, datas/valor e último contato
+    df[COL_CONTATO_RELATIVO] = np.nan
+    for nome, (_alternativas, tipo, padrao) in MAPA_COLUNAS_INFO.items():
+        if tipo in ("cliente", "texto"):
+            continue
+        col = mapa[nome]
+        if col is None:
+            df[nome] = padrao
+        elif tipo == "flag":
+            df[nome] = _to_flag(df[col])
+        elif tipo == "data":
+            df[nome] = pd.to_datetime(df[col], errors="coerce", format="mixed")
+        elif tipo == "numero":
+            df[nome] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
+        elif tipo == "contato":
+            df[nome], df[COL_CONTATO_RELATIVO] = _parse_ultimo_contato(df[col])
     
-    if col_vig_inicial and col_vig_inicial in df.columns:
-        df["VIGENCIA_INICIAL"] = pd.to_datetime(df[col_vig_inicial], errors="coerce")
-    else:
-        df["VIGENCIA_INICIAL"] = pd.NaT
+    # Campos extras para views
+    for nome, (_alternativas, tipo, padrao) in MAPA_COLUNAS_INFO.items():
+        if tipo == "texto":
+            col = mapa[nome]
+            df[nome] = df[col] if col is not None else padrao
     
-    if col_vig_final and col_vig_final in df.columns:
-        df["VIGENCIA_FINAL"] = pd.to_datetime(df[col_vig_final], errors="coerce")
-    else:
-        df["VIGENCIA_FINAL"] = pd.NaT
+    # Cancelados (detecta texto "cancelado")
+    df["CANCELADO"] = _is_cancelado(
+        df, [mapa["DATA_ATIVACAO"], mapa["VIGENCIA_INICIAL"], mapa["VIGENCIA_FINAL"], mapa["VALOR_CONTRATO"]]
+    )
     
-    if col_valor and col_valor in df.columns:
-        df["VALOR_CONTRATO"] = pd.to_numeric(df[col_valor], errors="coerce").fillna(0.0)
-    else:
-        df["VALOR_CONTRATO"] = 0.0
+    # Colunas originais que misturam texto, número e data (ex.: VALOR com
+    # "a combinar") seguem como texto; as views usam as versões tipadas acima
+    return preparar_frame(df)
+
+def _aplicar_referencia(df, referencia):
+    """
+    Campos de Informações Gerais relativos à data de referência, calculados
+    em bloco sobre a saída do ETL (que não depende da data): a data dos
+    contatos relativos ('A 2 SEMANAS ATRÁS'), DIAS_SEM_CONTATO, FAIXA_CONTATO,
+    DIAS_ATE_VENCIMENTO e ALERTA_VENCIMENTO
+    """
+    if df.empty:
+        return df
     
-    # Último contato
-    if col_ultimo_contato and col_ultimo_contato in df.columns:
-        df["ULTIMO_CONTATO_DT"] = df[col_ultimo_contato].apply(_parse_ultimo_contato)
-    else:
-        df["ULTIMO_CONTATO_DT"] = pd.NaT
+    relativas = referencia - pd.to_timedelta(df.pop(COL_CONTATO_RELATIVO), unit="D")
+    df["ULTIMO_CONTATO_DT"] = pd.to_datetime(df["ULTIMO_CONTATO_DT"]).fillna(relativas)
+    df["DIAS_SEM_CONTATO"] = (referencia - df["ULTIMO_CONTATO_DT"]).dt.days
+    df["FAIXA_CONTATO"] = _faixa_contato(df["DIAS_SEM_CONTATO"])
     
-    hoje = pd.Timestamp(date.today())
-    df["DIAS_SEM_CONTATO"] = (hoje - df["ULTIMO_CONTATO_DT"]).dt.days
-    df["FAIXA_CONTATO"] = pd.cut(
-        df["DIAS_SEM_CONTATO"],
+    # Dias até vencimento do contrato
+    df["DIAS_ATE_VENCIMENTO"] = (df["VIGENCIA_FINAL"] - referencia).dt.days
+    dias = df["DIAS_ATE_VENCIMENTO"]
+    df["ALERTA_VENCIMENTO"] = pd.Categorical(
+        np.select(
+            [dias < 0, dias <= 30, dias <= 60, dias <= 90],
+            ALERTAS_VENCIMENTO[:-1],
+            default=ALERTAS_VENCIMENTO[-1]
+        ),
+        categories=ALERTAS_VENCIMENTO
+    )
+    return df
+
+def _faixa_contato(dias_sem_contato):
+    """Faixa de cadência (0-30 / 30-90 / 90+) a partir dos dias sem contato"""
+    return pd.cut(
+        dias_sem_contato,
         bins=[-999999, 30, 90, 999999],
         labels=["0-30", "30-90", "90+"]
     )
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_metricas_contato(hash_contatos, hash_resolucao, referencia):
+    """
+    Métricas por cliente dos eventos de contato (ver modules.contatos); os
+    nomes dos eventos são resolvidos antes de agregar
     
-    # Campos extras para views
-    if col_csm and col_csm in df.columns:
-        df["Customer Success Manager"] = df[col_csm]
-    else:
-        df["Customer Success Manager"] = "N/A"
+    Args:
+        hash_contatos: hash de conteúdo do arquivo de eventos (só chaveia o cache)
+        hash_resolucao: versão da resolução de clientes (só chaveia o cache)
+        referencia: data de referência (eventos depois do fim desse dia são ignorados)
     
-    if col_gerente and col_gerente in df.columns:
-        df["GERENTE RESPONSÁVEL"] = df[col_gerente]
-    else:
-        df["GERENTE RESPONSÁVEL"] = "N/A"
+    Returns:
+        DataFrame indexado por CLIENTE, ou None se os eventos não puderem ser lidos
+    """
+    try:
+        eventos = ler_contatos(ARQ_CONTATOS)
+    except FileNotFoundError:
+        st.error(f"❌ Arquivo não encontrado: {ARQ_CONTATOS}")
+        return None
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar contatos: {e}")
+        return None
+    fim_do_dia = referencia.replace(hour=23, minute=59, second=59)
+    return metricas_contato(_resolver_clientes(eventos), fim_do_dia)
+
+def _aplicar_contatos(df, referencia):
+    """
+    Completa Informações Gerais com as métricas dos eventos de contato
     
-    if col_atividade and col_atividade in df.columns:
-        df["ATIVIDADE PRINCIPAL "] = df[col_atividade]
-    else:
-        df["ATIVIDADE PRINCIPAL "] = "N/A"
+    O último contato passa a ser o mais recente entre a planilha e os eventos;
+    DIAS_SEM_CONTATO e FAIXA_CONTATO são recalculados a partir dele. Sem
+    eventos configurados, devolve df sem mudanças.
+    """
+    if not ARQ_CONTATOS or df.empty:
+        return df
+    metricas = _load_metricas_contato(_hashes_abas([ORIGEM_CONTATOS])[0], _hash_resolucao(), referencia)
+    if metricas is None:
+        return df
     
-    if col_restricao and col_restricao in df.columns:
-        df["RESTRIÇÃO/SOLUÇÃO"] = df[col_restricao]
-    else:
-        df["RESTRIÇÃO/SOLUÇÃO"] = "N/A"
+    df = df.join(metricas, on="CLIENTE")
+    df["ULTIMO_CONTATO_DT"] = pd.concat(
+        [df["ULTIMO_CONTATO_DT"], df.pop("ULTIMO_CONTATO_EVENTO").dt.normalize()], axis=1
+    ).max(axis=1)
+    df["DIAS_SEM_CONTATO"] = (referencia - df["ULTIMO_CONTATO_DT"]).dt.days
+    df["FAIXA_CONTATO"] = _faixa_contato(df["DIAS_SEM_CONTATO"])
+    df["CONTATOS_30D"] = df["CONTATOS_30D"].fillna(0).astype(int)
+    df["CONTATOS_90D"] = df["CONTATOS_90D"].fillna(0).astype(int)
+    return df
+
+@st.cache_data(ttl=INTERVALO_CRM, show_spinner=False)
+def _load_crm():
+    """
+    Dados cadastrais do CRM em dia (ver modules.crm.sincronizar)
     
-    if col_unidade and col_unidade in df.columns:
-        df["UNIDADE"] = df[col_unidade]
-    else:
-        df["UNIDADE"] = "N/A"
+    O cache com ttl limita a sincronização a uma consulta por INTERVALO_CRM
+    segundos; cada consulta traz só as linhas alteradas desde a anterior.
     
-    if col_contato and col_contato in df.columns:
-        df["CONTATO"] = df[col_contato]
-    else:
-        df["CONTATO"] = "N/A"
+    Returns:
+        (DataFrame por CLIENTE, marca) ou (None, None) se o CRM não puder ser lido
+    """
+    try:
+        return sincronizar(ARQ_CRM)
+    except Exception as e:
+        st.error(f"❌ Erro ao sincronizar CRM: {e}")
+        return None, None
+
+def load_relatorio_schema():
+    """
+    Relatório de resolução de colunas da aba Informações Gerais
     
-    if col_telefone and col_telefone in df.columns:
-        df["TELEFONE"] = df[col_telefone]
+    Returns:
+        dict com assinatura do cabeçalho, coluna de origem de cada campo
+        padronizado, campos ausentes (usam o valor padrão) e colunas ignoradas
+    """
+    return _load_relatorio_schema(_hashes_abas([_aba_info()]))
+
+def load_relatorio_memoria(por_coluna=False):
+    """
+    Memória ocupada por Informações Gerais, chamados e base consolidada
+    (ver modules.utils.relatorio_memoria); os frames vêm do cache
+    """
+    return relatorio_memoria({
+        "info_gerais": load_info_gerais(),
+        "chamados": load_chamados_all(),
+        "base_cs_dashboard": load_base_cs_dashboard(),
+    }, por_coluna)
+
+@st.cache_data(max_entries=2)
+def _load_relatorio_schema(hashes):
+    """Relatório de schema em cache, chaveado pelo hash da aba"""
+    if not hashes[0]:
+        return {}
+    if _modo_lotes():
+        # Só o cabeçalho: a aba não é lida inteira
+        with _excel_fonte() as excel:
+            linhas = _linhas_aba(excel.book, ABA_INFO)
+            try:
+                colunas = _nomes_colunas(next(linhas, ()))
+            finally:
+                linhas.close()
     else:
-        df["TELEFONE"] = "N/A"
+        colunas = _ler_aba_info(hashes[0]).columns
+    colunas = [str(c).strip() for c in colunas]
+    return _compilar_mapa_colunas(colunas)
+
+def load_chamados_all(referencia=None):
+    """
+    Carrega e verticaliza chamados de todas as abas 'Chamados Mensais AAAA'
     
-    if col_email and col_email in df.columns:
-        df["E-MAIL"] = df[col_email]
+    Args:
+        referencia: meses depois dela ficam de fora (ver data_referencia);
+            tickets em aberto vencidos nela entram em FORA_SLA
+    """
+    return _somar_abertos_vencidos(_ate_referencia(_chamados_base(), referencia), data_referencia(referencia))
+
+def _ate_referencia(df, referencia):
+    """Linhas com MES_REF até a data de referência (meses futuros ficam de fora)"""
+    if df.empty:
+        return df
+    return df[df["MES_REF"] <= data_referencia(referencia)].reset_index(drop=True)
+
+def _chamados_base():
+    """Chamados de todos os meses com data, inclusive os futuros"""
+    return _load_chamados_base(_hash_resolucao())
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_chamados_base(hashes):
+    """Chamados com clientes resolvidos e codificados, em cache por versão dos dados"""
+    return _codificar_clientes(_resolver_clientes(_chamados_fonte()))
+
+def _chamados_fonte():
+    """Chamados como vêm das fontes (antes da resolução de clientes)"""
+    if ARQ_TICKETS:
+        df = _load_tickets_csv(_hashes_abas([ORIGEM_TICKETS])[0])["chamados"]
+    elif _modo_lotes():
+        df = _load_lotes("chamados", _pasta_lotes())
     else:
-        df["E-MAIL"] = "N/A"
+        abas = tuple(_abas_chamados())
+        df = _load_chamados_all(abas, _hashes_abas(abas))
+    return _aplicar_tickets_api(df)
+
+def _hash_resolucao():
+    """Hashes das origens dos nomes de cliente (chaveiam a resolução)"""
+    return _hashes_abas([_aba_info()] + _abas_chamados() + [ORIGEM_TICKETS_API, ORIGEM_ALIASES])
+
+def _resolucao_clientes():
+    """Resolução de clientes da versão atual dos dados (ver modules.clientes)"""
+    return _load_resolucao_clientes(_hash_resolucao())
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_resolucao_clientes(hashes):
+    """
+    Resolução em cache, chaveada pelo hash das origens; Informações Gerais
+    vem primeiro, então a grafia do cadastro é a canônica (a não ser que a
+    tabela de aliases diga outra)
+    """
+    return resolver_clientes(_nomes_clientes_fonte(), _ler_aliases())
+
+def _ler_aliases():
+    """Tabela de aliases de CS_ALIASES_CLIENTES ({} se não configurada ou ilegível)"""
+    if not ARQ_ALIASES:
+        return {}
+    try:
+        return ler_aliases(pd.read_csv(ARQ_ALIASES, dtype=str))
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar a tabela de aliases de clientes: {e}")
+        return {}
+
+def _nomes_clientes_fonte():
+    """Nomes distintos de cliente de Informações Gerais e dos chamados, como vêm das fontes"""
+    nomes = {}
+    for origem, df in (("info_gerais", _info_gerais_fonte()), ("chamados", _chamados_clientes_fonte())):
+        if "CLIENTE" in df.columns:
+            nomes[origem] = df["CLIENTE"].drop_duplicates()
+    return nomes
+
+def _chamados_clientes_fonte():
+    """Coluna CLIENTE dos chamados (no modo lotes, só os nomes distintos de cada parte)"""
+    if not chamados_em_lotes():
+        return _chamados_fonte()
+    pasta = _pasta_lotes()
+    partes = [
+        parte["CLIENTE"].astype(object).drop_duplicates()
+        for parte in (iterar_partes(pasta, "chamados", colunas=["CLIENTE"]) if pasta else [])
+    ]
+    return pd.DataFrame({"CLIENTE": pd.concat(partes, ignore_index=True) if partes else pd.Series(dtype=object)})
+
+def load_dicionario_clientes():
+    """
+    Dicionário global de clientes: pd.Index com os nomes (já resolvidos) de
+    Informações Gerais e dos chamados, em ordem alfabética. A posição é o
+    COD_CLIENTE (int32) de df_info, df_chamados e do eixo de clientes do
+    cubo: dicionario[cod] dá o nome e dicionario.get_loc(nome) o código
     
-    if col_obs and col_obs in df.columns:
-        df["OBSERVAÇÃO"] = df[col_obs]
-    else:
-        df["OBSERVAÇÃO"] = ""
+    Os códigos valem para a versão atual dos dados (são refeitos a cada
+    versão); para um id estável entre versões use CLIENTE_ID.
+    """
+    return _load_dicionario_clientes(_hash_resolucao())
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_dicionario_clientes(hashes):
+    """Dicionário de clientes em cache, chaveado pelo hash das origens dos nomes"""
+    nomes = list(_nomes_clientes_fonte().values())
+    nomes = pd.concat(nomes, ignore_index=True).astype(str) if nomes else pd.Series(dtype=object)
+    if RESOLVER_CLIENTES:
+        nomes = aplicar_resolucao(nomes, _resolucao_clientes())
+    return pd.Index(np.sort(nomes.unique()), dtype=object, name="CLIENTE")
+
+def _codificar_clientes(df):
+    """
+    Acrescenta COD_CLIENTE (posição de CLIENTE no dicionário de clientes);
+    CLIENTE categórico passa a ter o dicionário como categorias, então os
+    códigos das categorias são os mesmos de COD_CLIENTE
+    """
+    if df is None or df.empty or "CLIENTE" not in df.columns:
+        return df
+    dicionario = load_dicionario_clientes()
+    df = df.copy()
+    if isinstance(df["CLIENTE"].dtype, pd.CategoricalDtype):
+        df["CLIENTE"] = df["CLIENTE"].cat.set_categories(dicionario)
+    df["COD_CLIENTE"] = dicionario.get_indexer(df["CLIENTE"]).astype("int32")
+    return df
+
+def _resolver_clientes(df):
+    """Troca CLIENTE pelo nome canônico (sem mudanças com a resolução desligada)"""
+    if not RESOLVER_CLIENTES or df is None or df.empty or "CLIENTE" not in df.columns:
+        return df
+    df = df.copy()
+    df["CLIENTE"] = aplicar_resolucao(df["CLIENTE"], _resolucao_clientes())
+    return df
+
+def load_relatorio_clientes():
+    """
+    Relatório das uniões de nomes de cliente (ver modules.clientes.relatorio_uniao):
+    um registro por nome original de cada cliente com mais de uma grafia
+    """
+    return _resolucao_clientes()["relatorio"]
+
+def load_candidatos_clientes():
+    """
+    Pares de clientes parecidos que não foram unidos, para revisão (ver
+    modules.clientes.relatorio_candidatos); os confirmados vão para a
+    tabela de aliases (CS_ALIASES_CLIENTES)
     
-    # Cancelados (detecta texto "cancelado")
-    def _is_cancelado(row):
-        for c in [col_ativacao, col_vig_inicial, col_vig_final, col_valor]:
-            if c and c in row.index:
-                val = row[c]
-                if isinstance(val, str) and "CANCEL" in val.upper():
-                    return True
-        return False
+    Calculado só quando pedido (o carregamento dos dados não depende dele).
+    """
+    return _load_candidatos_clientes(_hash_resolucao())
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_candidatos_clientes(hashes):
+    """Candidatos em cache, chaveados pelo hash das origens dos nomes"""
+    return relatorio_candidatos(_resolucao_clientes())
+
+@st.cache_data(max_entries=2)
+def _load_chamados_all(abas, hashes):
+    """Chamados em cache, chaveados pelo hash de conteúdo das abas de chamados"""
+    if TIPO_FONTE == "regional":
+        return _load_regionais(hashes[0])[1]
+    if TIPO_FONTE != "xlsx":
+        return _etl_chamados_tabela()
+    return _com_snapshot("chamados", abas, hashes, partial(_etl_chamados, abas), incremental=True)
+
+def _etl_chamados(abas, anterior=None, extras=None):
+    """
+    ETL das abas Chamados Mensais
     
-    df["CANCELADO"] = df.apply(_is_cancelado, axis=1)
+    Cada aba é lida e verticalizada por _processar_abas_chamados (em paralelo
+    para workbooks grandes) e o resultado é concatenado uma única vez.
     
-    # Dias até vencimento do contrato
-    df["DIAS_ATE_VENCIMENTO"] = (df["VIGENCIA_FINAL"] - hoje).dt.days
-    df["ALERTA_VENCIMENTO"] = df["DIAS_ATE_VENCIMENTO"].apply(
-        lambda x: "VENCIDO" if pd.notna(x) and x < 0
-        else "30_DIAS" if pd.notna(x) and x <= 30
-        else "60_DIAS" if pd.notna(x) and x <= 60
-        else "90_DIAS" if pd.notna(x) and x <= 90
-        else "OK"
-    )
+    Modo incremental: cada bloco mensal (5 colunas) tem um hash de conteúdo.
+    Blocos cujo hash bate com o do snapshot anterior são reaproveitados de lá;
+    só os meses novos ou alterados são verticalizados.
     
-    return df
-
-@st.cache_data
-def load_chamados_all():
-    """Carrega e verticaliza chamados de 2025 e 2026"""
+    Args:
+        abas: abas "Chamados Mensais AAAA" a processar, em ordem
+        anterior: DataFrame do último snapshot de chamados (ou None)
+        extras: metadados desse snapshot, com o hash de cada bloco
+    
+    Returns:
+        (DataFrame, {'blocos': {'aba|AAAA-MM': hash}})
+    """
     try:
-        # 2025
-        raw_2025 = pd.read_excel(ARQ_CS, sheet_name="Chamados Mensais 2025", header=None)
-        df_2025 = _verticalizar_chamados(raw_2025)
+        if not abas:
+            raise ValueError("nenhuma aba 'Chamados Mensais AAAA' encontrada")
         
-        # 2026 - IGNORAR SE VAZIO
-        try:
-            raw_2026 = pd.read_excel(ARQ_CS, sheet_name="Chamados Mensais 2026", header=None)
-            df_2026 = _verticalizar_chamados(raw_2026)
-        except:
-            df_2026 = pd.DataFrame()
+        # Linhas reaproveitáveis do snapshot anterior, por mês
+        hashes_anteriores = (extras or {}).get("blocos", {})
+        linhas_anteriores = {}
+        if anterior is not None and hashes_anteriores:
+            linhas_anteriores = {f"{mes:%Y-%m}": g for mes, g in anterior.groupby("MES_REF", sort=False)}
         
-        # Concatenar apenas se 2026 tiver dados
-        if not df_2026.empty:
-            df = pd.concat([df_2025, df_2026], ignore_index=True)
-        else:
-            df = df_2025.copy()
+        conhecidos = {aba: {} for aba in abas}
+        for chave, h in hashes_anteriores.items():
+            aba, mes = chave.rsplit("|", 1)
+            if aba in conhecidos and mes in linhas_anteriores:
+                conhecidos[aba][mes] = h
+        
+        resultados = _processar_abas_chamados(list(abas), conhecidos)
         
-        if not df.empty:
-            df["MES_REF"] = pd.to_datetime(df["MES_REF"], errors="coerce")
-            df["ANO"] = pd.to_numeric(df["ANO"], errors="coerce").astype("Int64")
-            df["MES"] = pd.to_numeric(df["MES"], errors="coerce").astype("Int64")
-            df["VALOR"] = pd.to_numeric(df["VALOR"], errors="coerce").fillna(0.0)
+        # Mês repetido em mais de um bloco: as linhas não se separam por mês,
+        # então tudo é verticalizado de novo e nada fica para reaproveitar depois
+        meses = [mes for _, meses_aba, _, _ in resultados for mes in meses_aba]
+        repetidos = len(meses) != len(set(meses))
+        if repetidos and linhas_anteriores:
+            linhas_anteriores = {}
+            resultados = _processar_abas_chamados(list(abas), {})
         
+        partes, hashes = [], {}
+        for aba, meses_aba, hashes_aba, df_novos in resultados:
+            hashes.update({f"{aba}|{mes}": h for mes, h in hashes_aba.items()})
+            if not any(mes in linhas_anteriores for mes in meses_aba) or repetidos:
+                partes.append(df_novos)
+                continue
+            
+            novos_por_mes = {}
+            if not df_novos.empty:
+                novos_por_mes = {f"{mes:%Y-%m}": g for mes, g in df_novos.groupby("MES_REF", sort=False)}
+            for mes in meses_aba:
+                partes.append(novos_por_mes[mes] if mes in novos_por_mes else linhas_anteriores[mes])
+        
+        partes = [p for p in partes if not p.empty]
+        colunas = ["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"]
+        df = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=colunas)
+        
+        return _tipar_chamados(df), {"blocos": {} if repetidos else hashes}
+    
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar chamados: {e}")
+        return pd.DataFrame(), {}
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_tickets_csv(hash_arquivo):
+    """
+    Chamados a partir da exportação bruta de tickets (ver modules.tickets)
+    
+    As contagens por cliente e mês viram o mesmo DataFrame vertical das abas
+    mensais (ver _verticalizar_agregados).
+    
+    Args:
+        hash_arquivo: hash de conteúdo da exportação (só chaveia o cache)
+    
+    Returns:
+        dict de _tickets_verticais, com 'chamados' (DataFrame vertical),
+        'abertos' e 'datas_invalidas'
+    """
+    try:
+        agregados = agregar_tickets(ARQ_TICKETS)
+    except FileNotFoundError:
+        st.error(f"❌ Arquivo não encontrado: {ARQ_TICKETS}")
+        return {"chamados": pd.DataFrame(), "abertos": pd.DataFrame(), "datas_invalidas": {}}
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar tickets: {e}")
+        return {"chamados": pd.DataFrame(), "abertos": pd.DataFrame(), "datas_invalidas": {}}
+    return _tickets_verticais(agregados)
+
+def _tickets_verticais(agregados):
+    """
+    Saída de modules.tickets no formato dos loaders: contagens no DataFrame
+    vertical de chamados e tickets em aberto em colunas (CLIENTE, MES_REF,
+    VENCIMENTO_SLA, ABERTOS), para _somar_abertos_vencidos
+    """
+    return {
+        "chamados": _verticalizar_agregados(agregados["contagens"]),
+        "abertos": agregados["abertos"].reset_index(),
+        "datas_invalidas": agregados["datas_invalidas"],
+    }
+
+def _tickets_abertos():
+    """
+    Tickets em aberto da exportação e da API (a API substitui os meses
+    recentes, como em _aplicar_tickets_api); None sem fonte de tickets
+    """
+    partes = []
+    if ARQ_TICKETS:
+        partes.append(_load_tickets_csv(_hashes_abas([ORIGEM_TICKETS])[0])["abertos"])
+    if URL_TICKETS_API:
+        recentes = _load_tickets_api(_hashes_abas([ORIGEM_TICKETS_API])[0])
+        if recentes is not None:
+            inicio, _ = _periodo_tickets_api()
+            partes = [p[p["MES_REF"] < inicio] for p in partes if not p.empty] + [recentes["abertos"]]
+    partes = [p for p in partes if not p.empty]
+    return pd.concat(partes, ignore_index=True) if partes else None
+
+def _somar_abertos_vencidos(df, referencia):
+    """
+    Soma a FORA_SLA os tickets em aberto que já passaram da meta na data de
+    referência (o ETL guarda só o dia em que cada um vence, ver
+    modules.tickets), como _aplicar_referencia faz com os campos de
+    Informações Gerais: o resultado acompanha a data sem refazer o ETL
+    
+    Args:
+        df: chamados (ou agregado) com CATEGORIA e VALOR e com CLIENTE,
+            MES_REF ou os dois
+    """
+    abertos = _tickets_abertos()
+    if abertos is None or df is None or df.empty:
+        return df
+    vencidos = abertos[(abertos["VENCIMENTO_SLA"] <= referencia) & (abertos["MES_REF"] <= referencia)]
+    if vencidos.empty:
+        return df
+    
+    chaves = [col for col in ("CLIENTE", "MES_REF") if col in df.columns]
+    vencidos = _resolver_clientes(vencidos).groupby(chaves)["ABERTOS"].sum()
+    linhas = pd.MultiIndex.from_arrays([df[col].to_numpy(dtype=object if col == "CLIENTE" else None) for col in chaves])
+    if len(chaves) == 1:
+        linhas = linhas.get_level_values(0)
+    somar = vencidos.reindex(linhas).fillna(0).to_numpy()
+    
+    df = df.copy()
+    fora = df["CATEGORIA"].to_numpy(dtype=object) == "FORA_SLA"
+    df["VALOR"] = df["VALOR"].to_numpy() + np.where(fora, somar, 0)
+    return df
+
+def load_avisos_tickets():
+    """
+    Avisos de tickets com data preenchida mas ilegível, na exportação e na
+    API (lista de textos, vazia se não houver); app.carregar_dados os entrega
+    às páginas, que exibem uma vez por carga
+    """
+    fontes = []
+    if ARQ_TICKETS:
+        fontes.append(("Exportação de tickets", _load_tickets_csv(_hashes_abas([ORIGEM_TICKETS])[0])))
+    if URL_TICKETS_API:
+        fontes.append(("API de tickets", _load_tickets_api(_hashes_abas([ORIGEM_TICKETS_API])[0])))
+    
+    avisos = []
+    for origem, tickets in fontes:
+        invalidas = (tickets or {}).get("datas_invalidas", {})
+        if any(invalidas.values()):
+            avisos.append(
+                f"⚠️ {origem}: {invalidas['ABERTURA']} ticket(s) com abertura ilegível ficaram fora "
+                f"das contagens e {invalidas['FECHAMENTO']} com fechamento ilegível ficaram sem SLA"
+            )
+    return avisos
+
+def _verticalizar_agregados(agregados):
+    """
+    Contagens por (CLIENTE, MES_REF) de modules.tickets no DataFrame vertical
+    de chamados (meses futuros são cortados na carga, como nas abas mensais)
+    """
+    colunas = ["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"]
+    if agregados.empty:
+        return pd.DataFrame(columns=colunas)
+    agregados = agregados.sort_index(level=["MES_REF", "CLIENTE"])
+    
+    num_cats = len(CATEGORIAS_CHAMADOS)
+    mes_ref = pd.DatetimeIndex(agregados.index.get_level_values("MES_REF")).repeat(num_cats)
+    df = pd.DataFrame({
+        "CLIENTE": agregados.index.get_level_values("CLIENTE").to_numpy(dtype=object).repeat(num_cats),
+        "ANO": mes_ref.year,
+        "MES": mes_ref.month,
+        "MES_NOME": [MESES_MAP[m] for m in mes_ref.month],
+        "MES_REF": mes_ref,
+        "CATEGORIA": np.tile(CATEGORIAS_CHAMADOS, len(agregados)),
+        "VALOR": agregados[CATEGORIAS_CHAMADOS].to_numpy(dtype=float).ravel(),
+    })
+    return _tipar_chamados(df)
+
+def _periodo_tickets_api():
+    """Período de abertura coletado da API: do 1º dia de MESES_TICKETS_API meses atrás até amanhã"""
+    hoje = pd.Timestamp(date.today())
+    inicio = (hoje - pd.DateOffset(months=MESES_TICKETS_API)).replace(day=1)
+    return inicio, hoje + pd.Timedelta(days=1)
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_tickets_api(ciclo):
+    """
+    Chamados dos meses recentes coletados da API (uma coleta por ciclo)
+    
+    Args:
+        ciclo: identidade do ciclo de coleta (só chaveia o cache)
+    
+    Returns:
+        dict de _tickets_verticais, ou None se a coleta falhar
+    """
+    inicio, fim = _periodo_tickets_api()
+    try:
+        agregados = agregar_tickets_api(URL_TICKETS_API, inicio, fim, ESTADO_TICKETS_API)
+    except Exception as e:
+        st.error(f"❌ Erro ao coletar tickets da API: {e}")
+        return None
+    return _tickets_verticais(agregados)
+
+def _aplicar_tickets_api(df):
+    """
+    Substitui os meses recentes dos chamados pelos coletados da API
+    (sem API configurada, ou com a coleta falhando, devolve df sem mudanças)
+    """
+    if not URL_TICKETS_API:
         return df
+    recentes = _load_tickets_api(_hashes_abas([ORIGEM_TICKETS_API])[0])
+    if recentes is None:
+        return df
+    recentes = recentes["chamados"]
+    if df.empty:
+        return _tipar_chamados(recentes)
     
+    inicio, _ = _periodo_tickets_api()
+    antigos = df[df["MES_REF"] < inicio]
+    return _tipar_chamados(pd.concat([antigos, recentes], ignore_index=True))
+
+def _tipar_chamados(df):
+    """
+    Tipos finais das colunas de chamados, compactos por serem repetidos em
+    toda linha: CLIENTE, CATEGORIA e MES_NOME como categorias, ANO em int16
+    e MES em int8 (anuláveis só se houver vazios), MES_REF data e VALOR float
+    """
+    if not df.empty:
+        df["CLIENTE"] = df["CLIENTE"].astype("category")
+        df["CATEGORIA"] = pd.Categorical(df["CATEGORIA"], categories=CATEGORIAS_CHAMADOS)
+        df["MES_NOME"] = pd.Categorical(df["MES_NOME"], categories=list(MESES_MAP.values()))
+        df["MES_REF"] = pd.to_datetime(df["MES_REF"], errors="coerce")
+        df["ANO"] = _inteiro_compacto(df["ANO"], "int16")
+        df["MES"] = _inteiro_compacto(df["MES"], "int8")
+        df["VALOR"] = pd.to_numeric(df["VALOR"], errors="coerce").fillna(0.0)
+    return df
+
+def _inteiro_compacto(serie, tipo):
+    """Converte para o inteiro `tipo` (ex.: 'int16'), ou sua versão anulável se houver vazios"""
+    serie = pd.to_numeric(serie, errors="coerce")
+    return serie.astype(tipo if serie.notna().all() else tipo.capitalize())
+
+def _etl_chamados_tabela():
+    """
+    ETL da tabela lógica de chamados das fontes tabulares
+    
+    A tabela já vem vertical (CLIENTE, MES_REF, CATEGORIA, VALOR); aplica
+    as mesmas regras das abas do Excel: clientes vazios e meses futuros
+    ficam de fora e os valores são normalizados para float.
+    """
+    colunas = ["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"]
+    try:
+        df = ler_tabela(FONTE_DADOS, TIPO_FONTE, TABELA_CHAMADOS)
+        faltando = [c for c in ("CLIENTE", "MES_REF", "CATEGORIA", "VALOR") if c not in df.columns]
+        if faltando:
+            raise ValueError(f"colunas ausentes na tabela '{TABELA_CHAMADOS}': {', '.join(faltando)}")
     except Exception as e:
         st.error(f"❌ Erro ao carregar chamados: {e}")
         return pd.DataFrame()
+    
+    clientes = df["CLIENTE"].map(_nome_cliente)
+    categorias = df["CATEGORIA"].astype(str).str.strip().str.upper()
+    mes_ref = pd.to_datetime(df["MES_REF"], errors="coerce")
+    
+    # CORREÇÃO: Ignorar meses sem data (os futuros são cortados na carga, como nas abas do Excel)
+    validas = clientes.notna() & categorias.isin(CATEGORIAS_CHAMADOS) & mes_ref.notna()
+    if not validas.any():
+        return pd.DataFrame(columns=colunas)
+    
+    mes_ref = mes_ref[validas].dt.normalize()
+    df = pd.DataFrame({
+        "CLIENTE": clientes[validas],
+        "ANO": mes_ref.dt.year,
+        "MES": mes_ref.dt.month,
+        "MES_NOME": mes_ref.dt.month.map(MESES_MAP),
+        "MES_REF": mes_ref,
+        "CATEGORIA": categorias[validas],
+        "VALOR": _normalizar_valores(df.loc[validas, "VALOR"].to_numpy(dtype=object)),
+    })
+    return _tipar_chamados(df.sort_values("MES_REF", kind="stable").reset_index(drop=True))
 
-@st.cache_data
-def load_base_cs_dashboard():
-    """Carrega base consolidada para dashboard"""
-    info = load_info_gerais()
-    chamados = load_chamados_all()
+@st.cache_data(max_entries=1, show_spinner=False)
+def _load_regionais(hash_conjunto):
+    """
+    ETL da fonte regional: cada workbook é processado num processo do pool
+    (todos ao mesmo tempo, até o número de CPUs) e os resultados são unidos
+    
+    Args:
+        hash_conjunto: impressão digital do conjunto de workbooks (só chaveia o cache)
+    
+    Returns:
+        (info, chamados) já unidos, com a coluna REGIAO
+    """
+    workbooks = workbooks_regionais(FONTE_DADOS)
+    try:
+        if not hash_conjunto or not workbooks:
+            raise FileNotFoundError(FONTE_DADOS)
+        if len(workbooks) > 1:
+            contexto = multiprocessing.get_context("spawn")
+            trabalhadores = min(len(workbooks), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=trabalhadores, mp_context=contexto) as pool:
+                resultados = list(pool.map(_etl_workbook, [str(w) for w in workbooks]))
+        else:
+            resultados = [_etl_workbook(str(workbooks[0]))]
+    except FileNotFoundError:
+        st.error(f"❌ Arquivo não encontrado: {FONTE_DADOS}")
+        return pd.DataFrame(), pd.DataFrame()
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar workbooks regionais: {e}")
+        return pd.DataFrame(), pd.DataFrame()
+    
+    return _unir_regionais([w.stem for w in workbooks], resultados)
+
+def _etl_workbook(caminho):
+    """
+    Informações Gerais e chamados de um workbook no layout do BASE-CS; roda
+    em processo separado na fonte regional, por isso recebe tudo por argumento
+    
+    Returns:
+        (info normalizada, chamados verticalizados)
+    """
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        abas = _ordenar_abas_chamados(wb.sheetnames)
+        resultados = [_processar_aba_chamados(wb, aba, {}) for aba in abas]
+    finally:
+        wb.close()
+    
+    partes = [df for _, _, _, df in resultados if not df.empty]
+    colunas = ["CLIENTE", "ANO", "MES", "MES_NOME", "MES_REF", "CATEGORIA", "VALOR"]
+    chamados = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=colunas)
+    
+    info = _normalizar_info(pd.read_excel(caminho, sheet_name=ABA_INFO))
+    if info is None:
+        raise ValueError(f"coluna 'CLIENTE' não encontrada em {Path(caminho).name}")
+    return info, _tipar_chamados(chamados)
+
+def _unir_regionais(regioes, resultados):
+    """
+    Concatena info e chamados das regiões, com a coluna REGIAO
+    
+    Cliente presente em mais de uma região fica só na região do contato mais
+    recente (empate: a primeira na ordem dos workbooks), com a info e os
+    chamados dessa região, para que cópias da mesma conta não somem em dobro.
+    Clientes só com chamados ficam na primeira região em que aparecem.
+    """
+    infos, chamados = [], []
+    for ordem, (regiao, (info, ch)) in enumerate(zip(regioes, resultados)):
+        infos.append(info.assign(REGIAO=regiao, _ORDEM=ordem))
+        chamados.append(ch.assign(REGIAO=regiao, _ORDEM=ordem))
+    info = pd.concat(infos, ignore_index=True)
+    ch = pd.concat(chamados, ignore_index=True)
+    
+    dono = (
+        info.sort_values(["ULTIMO_CONTATO_DT", "_ORDEM"], ascending=[False, True], na_position="last", kind="stable")
+        .drop_duplicates("CLIENTE")[["CLIENTE", "_ORDEM"]]
+    )
+    dono_chamados = pd.concat([dono, ch.groupby("CLIENTE", as_index=False, observed=True)["_ORDEM"].min()]).drop_duplicates("CLIENTE")
+    
+    info = info.merge(dono, on=["CLIENTE", "_ORDEM"]).drop(columns="_ORDEM")
+    ch = ch.merge(dono_chamados, on=["CLIENTE", "_ORDEM"]).drop(columns="_ORDEM")
+    return info, _tipar_chamados(ch.sort_values("MES_REF", kind="stable").reset_index(drop=True))
+
+def load_mrr(referencia=None):
+    """
+    Histórico mensal de MRR por cliente até a data de referência (vazio se a
+    fonte não tiver a aba/tabela)
+    """
+    return _ate_referencia(_load_mrr(_hashes_abas([_aba_mrr()])), referencia)
+
+@st.cache_data(max_entries=2)
+def _load_mrr(hashes):
+    """MRR em cache, chaveado pelo hash de conteúdo da aba; snapshot junto com chamados"""
+    if hashes[0] is None:
+        return pd.DataFrame(columns=["CLIENTE", "MES_REF", "MRR"])
+    return _com_snapshot("mrr", [ABA_MRR], hashes, _etl_mrr)
+
+def _etl_mrr():
+    """
+    ETL do histórico de MRR (aba ABA_MRR ou tabela TABELA_MRR)
+    
+    Mesmas regras dos chamados: clientes vazios ficam de fora e os meses
+    futuros são cortados na carga; MES_REF vira o 1º dia do mês e MRR não
+    numérico vira 0.
+    """
+    colunas = ["CLIENTE", "MES_REF", "MRR"]
+    try:
+        if TIPO_FONTE == "xlsx":
+            with _excel_fonte() as excel:
+                df = excel.parse(ABA_MRR)
+        else:
+            df = ler_tabela(FONTE_DADOS, TIPO_FONTE, TABELA_MRR)
+        df.columns = [_normalizar_nome_coluna(c) for c in df.columns]
+        faltando = [c for c in colunas if c not in df.columns]
+        if faltando:
+            raise ValueError(f"colunas ausentes no histórico de MRR: {', '.join(faltando)}")
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar histórico de MRR: {e}")
+        return pd.DataFrame(columns=colunas)
+    
+    clientes = df["CLIENTE"].map(_nome_cliente)
+    mes_ref = pd.to_datetime(df["MES_REF"], errors="coerce").dt.to_period("M").dt.to_timestamp()
+    validas = clientes.notna() & mes_ref.notna()
+    
+    df = pd.DataFrame({
+        "CLIENTE": clientes[validas],
+        "MES_REF": mes_ref[validas],
+        "MRR": pd.to_numeric(df.loc[validas, "MRR"], errors="coerce").fillna(0.0).astype(float),
+    })
+    return df.sort_values(["MES_REF", "CLIENTE"], kind="stable").reset_index(drop=True)
+
+def load_indicadores_receita(referencia=None):
+    """
+    Indicadores de receita do histórico de MRR (ver modules.receita)
+    
+    Returns:
+        dict com 'mensal' (NRR/GRR mês a mês), 'anual' (contra 12 meses
+        antes) e 'clientes' (movimento de cada cliente mês a mês)
+    """
+    return _load_indicadores_receita(_hashes_abas([_aba_mrr()]), data_referencia(referencia))
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_indicadores_receita(hashes, referencia):
+    """Indicadores em cache: calculados uma vez por conteúdo da aba e data de referência, não a cada rerun"""
+    matriz = matriz_mrr(_ate_referencia(_load_mrr(hashes), referencia))
+    return {
+        "mensal": indicadores_receita(matriz, janela=1),
+        "anual": indicadores_receita(matriz, janela=12),
+        "clientes": movimentos_clientes(matriz),
+    }
+
+def _modo_lotes():
+    """Modo lotes ligado e aplicável à fonte (fontes tabulares não passam pelo Excel)"""
+    return MODO_LOTES and TIPO_FONTE == "xlsx"
+
+def chamados_em_lotes():
+    """
+    Chamados servidos pelas partes do modo lotes (sem tickets nem API
+    sobrepostos): cubo e agregados saem das partes,
+    lidas uma a uma, e o DataFrame completo de chamados nunca é montado
+    (load_chamados_all e load_base_cs_dashboard continuam disponíveis, mas
+    o montam inteiro)
+    """
+    return _modo_lotes() and not ARQ_TICKETS and not URL_TICKETS_API
+
+def _nomes_colunas(cabecalho):
+    """
+    Nomes de coluna a partir da linha de cabeçalho, como o read_excel:
+    células vazias viram 'Unnamed: N' e repetidos ganham sufixo '.1', '.2'...
+    """
+    nomes, vistos = [], {}
+    for j, valor in enumerate(cabecalho):
+        nome = f"Unnamed: {j}" if valor is None else str(valor)
+        base = nome
+        while nome in vistos:
+            vistos[base] += 1
+            nome = f"{base}.{vistos[base]}"
+        vistos.setdefault(base, 0)
+        vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+def _lotes_info_gerais(fonte):
+    """DataFrames crus de até LINHAS_POR_LOTE linhas da aba Informações Gerais"""
+    linhas = _linhas_aba(fonte, ABA_INFO)
+    try:
+        colunas = _nomes_colunas(next(linhas, ()))
+        largura = len(colunas)
+        for lote in _lotes(linhas, LINHAS_POR_LOTE):
+            lote = [
+                tuple(linha[:largura]) + (None,) * (largura - len(linha))
+                for linha in lote if any(v is not None for v in linha)
+            ]
+            if lote:
+                yield pd.DataFrame.from_records(lote, columns=colunas)
+    finally:
+        linhas.close()
+
+def _pasta_lotes():
+    """Pasta com as partes da versão atual, processando-a se ainda não existir"""
+    abas = [ABA_INFO] + ([] if ARQ_TICKETS else _abas_chamados())
+    return _processar_em_lotes(tuple(abas), _hashes_abas(abas))
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _processar_em_lotes(abas, hashes):
+    """
+    ETL em lotes: memória limitada ao tamanho do lote, qualquer que seja a base
+    
+    Cada lote de Informações Gerais é normalizado e cada lote de cada aba de
+    chamados é verticalizado e gravado em disco como uma parte Parquet; em
+    memória ficam só os agregados por mês e por cliente, somados lote a lote.
+    Uma versão já gravada por outro processo é reaproveitada.
+    
+    Args:
+        abas: ABA_INFO seguida das abas de chamados
+        hashes: hash de conteúdo de cada aba (identidade da versão)
+    
+    Returns:
+        pasta das partes, ou None em erro
+    """
+    if not any(hashes):
+        st.error(f"❌ Arquivo não encontrado: {ARQ_CS}")
+        return None
+    fonte = {"arquivo": ARQ_CS.name, "abas": dict(zip(abas, hashes))}
+    pasta = pasta_versao(LOTES_DIR, fonte, VERSAO_ETL)
+    if versao_completa(pasta):
+        return pasta
+    
+    try:
+        iniciar_versao(pasta)
+        with _excel_fonte() as excel:
+            wb = excel.book
+            for i, df in enumerate(_lotes_info_gerais(wb)):
+                df = _normalizar_info(df)
+                if df is None:
+                    raise ValueError("coluna 'CLIENTE' não encontrada em Informações Gerais")
+                if not df.empty:
+                    gravar_parte(pasta, "info_gerais", i, df)
+            
+            mensal = por_cliente = None
+            i = 0
+            for aba in abas[1:]:
+                for blocos, nomes, valores in _lotes_aba_chamados(wb, aba):
+                    df = _tipar_chamados(_verticalizar_chamados(np.array(nomes, dtype=object), valores, blocos))
+                    gravar_parte(pasta, "chamados", i, df)
+                    i += 1
+                    
+                    parcial = df.groupby(["MES_REF", "CATEGORIA"], observed=True)["VALOR"].sum()
+                    mensal = parcial if mensal is None else mensal.add(parcial, fill_value=0.0)
+                    parcial = df.groupby(["CLIENTE", "CATEGORIA"], observed=True)["VALOR"].sum()
+                    por_cliente = parcial if por_cliente is None else por_cliente.add(parcial, fill_value=0.0)
+        
+        if mensal is not None:
+            gravar_tabela(pasta, "chamados_mensal", mensal.reset_index().sort_values("MES_REF"))
+            gravar_tabela(pasta, "chamados_por_cliente", por_cliente.reset_index())
+        finalizar_versao(pasta, fonte, VERSAO_ETL)
+    except Exception as e:
+        st.error(f"❌ Erro no processamento em lotes: {e}")
+        return None
+    return pasta
+
+@st.cache_data(max_entries=4)
+def _load_lotes(tabela, pasta):
+    """Tabela final montada a partir das partes do modo lotes (uma vez por versão)"""
+    if pasta is None:
+        return pd.DataFrame()
+    df = ler_partes(pasta, tabela)
+    if tabela == "chamados":
+        df = _tipar_chamados(df)
+    return df
+
+def load_base_cs_dashboard(referencia=None):
+    """Carrega base consolidada para dashboard (na data de referência, ver data_referencia)"""
+    return _load_base_cs_dashboard(
+        _hash_resolucao() + _hashes_abas([ORIGEM_CONTATOS]), data_referencia(referencia)
+    )
+
+@st.cache_data(max_entries=2)
+def _load_base_cs_dashboard(hashes, referencia):
+    """
+    Base consolidada em cache, chaveada pelas origens dos clientes e dos
+    chamados (abas, API de tickets e aliases, ver _hash_resolucao), pelos
+    contatos e pela data de referência
+    """
+    info = load_info_gerais(referencia)
+    chamados = load_chamados_all(referencia)
     
     if info.empty or chamados.empty:
         st.warning("⚠️ Dados insuficientes para consolidação")
         return pd.DataFrame()
     
+    # Junção pelo código inteiro do cliente (mesmo dicionário nos dois lados)
     df = chamados.merge(
-        info[["CLIENTE", "AT_RISK", "CHURN_RISK", "VALOR_CONTRATO", "FAIXA_CONTATO",
+        info[["COD_CLIENTE", "AT_RISK", "CHURN_RISK", "VALOR_CONTRATO", "FAIXA_CONTATO",
               "DIAS_SEM_CONTATO", "CANCELADO", "DIAS_ATE_VENCIMENTO", "ALERTA_VENCIMENTO"]],
-        on="CLIENTE",
+        on="COD_CLIENTE",
         how="left"
     )
     
-    df["AT_RISK"] = df["AT_RISK"].fillna("NÃO")
-    df["CHURN_RISK"] = df["CHURN_RISK"].fillna("NÃO")
+    # Chamados de cliente sem cadastro: flags falsas
+    for col in ("AT_RISK", "CHURN_RISK", "CANCELADO"):
+        df[col] = df[col].eq(True)
+    df["CLIENTE"] = df["CLIENTE"].astype("category")
     df["VALOR_CONTRATO"] = df["VALOR_CONTRATO"].fillna(0.0)
-    df["CANCELADO"] = df["CANCELADO"].fillna(False)
     
     return df
+
+def _base_sqlite():
+    """Caminho da base SQLite em dia com a fonte; None com o modo desligado ou sem dados"""
+    if not BASE_SQLITE:
+        return None
+    versao_dados = impressao_digital_base()["arquivo"]
+    return _materializar_base_sqlite(versao_dados) if versao_dados else None
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _materializar_base_sqlite(versao_dados):
+    """
+    Materializa chamados e clientes na base SQLite, uma vez por versão dos
+    dados (se outro processo já gravou essa versão, só reaproveita); grava
+    todos os meses e só campos que não dependem da data de referência, que
+    entra nas consultas. No modo lotes os chamados são gravados parte a parte
+    
+    Args:
+        versao_dados: hash de conteúdo da fonte (chaveia o cache e a base)
+    """
+    if base_atualizada(BASE_SQLITE, versao_dados, VERSAO_ETL):
+        return BASE_SQLITE
+    info = _info_gerais_base()
+    if chamados_em_lotes():
+        pasta = _pasta_lotes()
+        chamados = (
+            _codificar_clientes(_resolver_clientes(_tipar_chamados(parte)))
+            for parte in (iterar_partes(pasta, "chamados") if pasta else [])
+        )
+    else:
+        chamados = _chamados_base()
+        if chamados.empty:
+            return None
+    if info.empty:
+        return None
+    if not materializar(BASE_SQLITE, info, chamados, versao_dados, VERSAO_ETL):
+        return None
+    # Gravada a base, os chamados completos saem do cache (as consultas vão à base)
+    _load_chamados_base.clear()
+    return BASE_SQLITE
+
+def chamados_na_base():
+    """
+    Chamados servidos pela base SQLite (CS_BASE_SQLITE, gravada e em dia com
+    a fonte): cubo e agregados saem de consultas SQL e o DataFrame completo de
+    chamados não fica no processo (load_chamados_all e load_base_cs_dashboard
+    continuam disponíveis, mas o montam inteiro)
+    """
+    return _base_sqlite() is not None
+
+def load_cubo_chamados(referencia=None):
+    """
+    Chamados como cubo cliente x mês x categoria (ver modules.cubo), montado
+    uma vez por versão dos chamados e data de referência a partir da soma
+    por cliente e mês da base SQLite, quando ativa, senão de
+    load_chamados_all; o eixo de clientes é o dicionário de clientes
+    (posição = COD_CLIENTE, ver serie_posicao)
+    """
+    return _load_cubo_chamados(_hash_resolucao(), data_referencia(referencia), chamados_em_lotes())
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_cubo_chamados(hashes, referencia, em_lotes):
+    """
+    Cubo em cache, chaveado pelo hash das origens dos chamados e dos clientes
+    e pela data; no modo lotes é somado parte a parte (ver chamados_em_lotes)
+    e com a base SQLite vem da soma por cliente e mês (ver chamados_na_base)
+    """
+    if not em_lotes:
+        base = _base_sqlite()
+        df = chamados_cliente_mes(base, referencia) if base else None
+        df = _somar_abertos_vencidos(df, referencia) if df is not None else load_chamados_all(referencia)
+        return montar_cubo(df, CATEGORIAS_CHAMADOS, load_dicionario_clientes())
+    pasta = _pasta_lotes()
+    mensal = _ate_referencia(ler_tabela_lotes(pasta, "chamados_mensal"), referencia) if pasta else pd.DataFrame()
+    meses = mensal["MES_REF"] if not mensal.empty else []
+    partes = (_resolver_clientes(parte) for parte in (iterar_partes(pasta, "chamados") if pasta else []))
+    return montar_cubo_partes(partes, CATEGORIAS_CHAMADOS, load_dicionario_clientes(), meses)
+
+def _cubo_para_vertical(tabela):
+    """Tabela larga do cubo (rótulo x categorias) -> rótulo, CATEGORIA, VALOR"""
+    return tabela.stack().rename("VALOR").reset_index()
+
+def load_chamados_mensal(df_chamados, referencia=None):
+    """
+    Soma de VALOR por MES_REF e CATEGORIA até a data de referência, em ordem
+    de mês (SQL ou agregado do modo lotes quando ativos; senão, soma sobre o
+    eixo de clientes do cubo); df_chamados é None no modo lotes e com a base
+    SQLite
+    """
+    referencia = data_referencia(referencia)
+    base = _base_sqlite()
+    df = chamados_mensal(base, referencia) if base else None
+    if df is None and chamados_em_lotes():
+        pasta = _pasta_lotes()
+        df = _ate_referencia(ler_tabela_lotes(pasta, "chamados_mensal"), referencia) if pasta else None
+    if df is not None:
+        return _somar_abertos_vencidos(df, referencia)
+    if df_chamados is not None and df_chamados.empty:
+        return pd.DataFrame(columns=["MES_REF", "CATEGORIA", "VALOR"])
+    return _cubo_para_vertical(soma_por_mes(load_cubo_chamados(referencia)))
+
+def load_chamados_por_cliente(df_chamados, referencia=None):
+    """
+    Soma de VALOR por CLIENTE e CATEGORIA até a data de referência (SQL ou
+    agregado do modo lotes quando ativos; senão, soma sobre o eixo de meses
+    do cubo); df_chamados é None no modo lotes e com a base SQLite
+    """
+    referencia = data_referencia(referencia)
+    base = _base_sqlite()
+    df = chamados_por_cliente(base, referencia) if base else None
+    if df is None and chamados_em_lotes():
+        pasta = _pasta_lotes()
+        # O agregado do modo lotes soma todos os meses: só vale se os meses
+        # depois da referência estiverem zerados (senão, soma pelo cubo)
+        mensal = ler_tabela_lotes(pasta, "chamados_mensal") if pasta else None
+        if mensal is not None and not mensal.empty and not mensal.loc[mensal["MES_REF"] > referencia, "VALOR"].any():
+            df = ler_tabela_lotes(pasta, "chamados_por_cliente")
+        if df is not None and RESOLVER_CLIENTES:
+            # Partes gravadas com os nomes da fonte: grafias unidas são somadas
+            df = _resolver_clientes(df).groupby(["CLIENTE", "CATEGORIA"], as_index=False, observed=True, sort=False)["VALOR"].sum()
+    if df is not None:
+        return _somar_abertos_vencidos(df, referencia)
+    if df_chamados is not None and df_chamados.empty:
+        return pd.DataFrame(columns=["CLIENTE", "CATEGORIA", "VALOR"])
+    return _cubo_para_vertical(soma_por_cliente(load_cubo_chamados(referencia)))
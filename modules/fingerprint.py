@@ -0,0 +1,160 @@
+"""
+Impressão digital (hash de conteúdo) do workbook e de cada aba
+Permite chavear os caches pelo conteúdo real do Excel, e não por data/tamanho
+"""
+
+import os
+import re
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Só o bloco de dados entra no hash (troca de aba ativa, zoom etc. não contam)
+INICIO_DADOS = b"<sheetData"
+FIM_DADOS = b"</sheetData>"
+FIM_LINHA = b"</row>"
+RE_STRING_COMPARTILHADA = re.compile(rb"<si\b[^>]*?(?:/>|>(.*?)</si>)", re.S)
+RE_CELULA_TEXTO = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+
+# Os XML do pacote são lidos em blocos deste tamanho (nunca inteiros)
+TAMANHO_BLOCO = 1024 * 1024
+
+# Último resultado por arquivo, reaproveitado enquanto tamanho/mtime não mudarem
+_ULTIMA = {}
+
+def _mapa_abas(zf):
+    """Nome da aba -> caminho do XML dentro do pacote"""
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    alvos = {
+        r.get("Id"): r.get("Target")
+        for r in rels.iter(f"{_NS_PKG}Relationship")
+    }
+    
+    abas = {}
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+        alvo = alvos.get(sheet.get(f"{_NS_REL}id"))
+        if not alvo:
+            continue
+        if alvo.startswith("/"):
+            abas[sheet.get("name")] = alvo.lstrip("/")
+        else:
+            abas[sheet.get("name")] = posixpath.normpath(posixpath.join("xl", alvo))
+    return abas
+
+def _blocos(zf, nome):
+    """Conteúdo de uma parte do pacote em blocos (nada se ela não existir)"""
+    try:
+        fluxo = zf.open(nome)
+    except KeyError:
+        return
+    with fluxo:
+        for bloco in iter(lambda: fluxo.read(TAMANHO_BLOCO), b""):
+            yield bloco
+
+def _hashes_compartilhadas(zf):
+    """Hash de cada string compartilhada, na ordem do sharedStrings.xml"""
+    hashes = []
+    resto = b""
+    for bloco in _blocos(zf, "xl/sharedStrings.xml"):
+        resto += bloco
+        fim = 0
+        for m in RE_STRING_COMPARTILHADA.finditer(resto):
+            hashes.append(hashlib.sha1(m.group(1) or b"").digest())
+            fim = m.end()
+        resto = resto[fim:]
+    return hashes
+
+def _hash_aba(zf, parte, compartilhadas, hash_estilos):
+    """
+    Hash do bloco sheetData da aba e das strings compartilhadas que ele
+    referencia, lendo o XML em blocos cortados no fim de uma linha
+    """
+    h = hashlib.sha1(hash_estilos)
+    h_textos = hashlib.sha1()
+    resto = b""
+    etapa = "antes"
+    for bloco in _blocos(zf, parte):
+        resto += bloco
+        if etapa == "antes":
+            inicio = resto.find(INICIO_DADOS)
+            if inicio < 0:
+                resto = resto[-len(INICIO_DADOS):]
+                continue
+            resto = resto[inicio:]
+            etapa = "tag"
+        if etapa == "tag":
+            fim_tag = resto.find(b">")
+            if fim_tag < 0:
+                continue
+            if resto[fim_tag - 1:fim_tag] == b"/":
+                # <sheetData/>: aba sem dados
+                h.update(resto[:fim_tag + 1])
+                break
+            etapa = "dados"
+        
+        fim = resto.find(FIM_DADOS)
+        if fim >= 0:
+            corte, terminou = fim + len(FIM_DADOS), True
+        else:
+            corte, terminou = resto.rfind(FIM_LINHA), False
+            if corte < 0:
+                continue
+            corte += len(FIM_LINHA)
+        
+        dados, resto = resto[:corte], resto[corte:]
+        h.update(dados)
+        for i in RE_CELULA_TEXTO.findall(dados):
+            i = int(i)
+            h_textos.update(compartilhadas[i] if i < len(compartilhadas) else b"\x00")
+        if terminou:
+            break
+    
+    h.update(h_textos.digest())
+    return h.hexdigest()
+
+def impressao_digital(caminho):
+    """
+    Calcula o hash de conteúdo do workbook e de cada aba
+    
+    O hash de uma aba cobre os dados da aba (sheetData), as strings
+    compartilhadas que ela referencia e os estilos (que decidem, por exemplo,
+    se um número é data). Editar uma aba não muda o hash das outras.
+    
+    Args:
+        caminho: caminho do .xlsx
+    
+    Returns:
+        dict {'arquivo': hash do workbook, 'abas': {nome da aba: hash}}
+    
+    Raises:
+        OSError/zipfile.BadZipFile se o arquivo não existir ou não for xlsx
+    """
+    st_info = os.stat(caminho)
+    chave = (st_info.st_size, st_info.st_mtime_ns)
+    anterior = _ULTIMA.get(str(caminho))
+    if anterior and anterior[0] == chave:
+        return anterior[1]
+    
+    with zipfile.ZipFile(caminho) as zf:
+        abas = _mapa_abas(zf)
+        compartilhadas = _hashes_compartilhadas(zf)
+        h_estilos = hashlib.sha1()
+        for bloco in _blocos(zf, "xl/styles.xml"):
+            h_estilos.update(bloco)
+        hash_estilos = h_estilos.digest()
+        
+        hashes = {nome: _hash_aba(zf, parte, compartilhadas, hash_estilos) for nome, parte in abas.items()}
+    
+    h_arquivo = hashlib.sha1()
+    for nome in sorted(hashes):
+        h_arquivo.update(nome.encode("utf-8") + b"\x00" + hashes[nome].encode("ascii"))
+    
+    resultado = {"arquivo": h_arquivo.hexdigest(), "abas": hashes}
+    _ULTIMA[str(caminho)] = (chave, resultado)
+    return resultado
@@ -0,0 +1,133 @@
+"""
+Fontes de dados alternativas ao BASE-CS.xlsx
+Lê as mesmas tabelas lógicas de um diretório de CSV, de arquivos Parquet
+ou de um banco SQLite, sem passar pelo parse do Excel; também localiza os
+workbooks de uma fonte regional (vários .xlsx no layout do BASE-CS)
+"""
+
+import os
+import sqlite3
+import hashlib
+from pathlib import Path
+from contextlib import closing
+import pandas as pd
+
+# Tabelas lógicas das fontes tabulares:
+# - info_gerais: mesmas colunas da aba "Informações Gerais"
+# - chamados: já vertical, com CLIENTE, MES_REF, CATEGORIA e VALOR
+# - mrr (opcional): histórico mensal, com CLIENTE, MES_REF e MRR
+TABELA_INFO = "info_gerais"
+TABELA_CHAMADOS = "chamados"
+TABELA_MRR = "mrr"
+TABELAS = (TABELA_INFO, TABELA_CHAMADOS, TABELA_MRR)
+
+EXTENSOES_SQLITE = {".db", ".sqlite", ".sqlite3"}
+
+# Último hash por arquivo, reaproveitado enquanto tamanho/mtime não mudarem
+_ULTIMA = {}
+
+def tipo_fonte(caminho):
+    """
+    Tipo da fonte de dados pelo caminho
+    
+    Returns:
+        'sqlite' (arquivo .db/.sqlite), 'parquet' ou 'csv' (diretório com
+        <tabela>.parquet ou <tabela>.csv), 'regional' (lista de .xlsx
+        separada por os.pathsep, ou diretório só com .xlsx) e 'xlsx' nos
+        demais casos
+    """
+    if os.pathsep in str(caminho):
+        return "regional"
+    caminho = Path(caminho)
+    if caminho.suffix.lower() in EXTENSOES_SQLITE:
+        return "sqlite"
+    if caminho.is_dir():
+        if any((caminho / f"{t}.parquet").exists() for t in TABELAS):
+            return "parquet"
+        if not any((caminho / f"{t}.csv").exists() for t in TABELAS) and workbooks_regionais(caminho):
+            return "regional"
+        return "csv"
+    return "xlsx"
+
+def workbooks_regionais(caminho):
+    """
+    Workbooks de uma fonte regional, na ordem em que serão unidos: os da
+    lista separada por os.pathsep, ou os .xlsx do diretório em ordem de nome
+    (arquivos temporários do Excel, '~$...', ficam de fora)
+    """
+    texto = str(caminho)
+    if os.pathsep in texto:
+        return [Path(p.strip()) for p in texto.split(os.pathsep) if p.strip()]
+    return sorted(p for p in Path(caminho).glob("*.xlsx") if not p.name.startswith("~$"))
+
+def _conectar(caminho):
+    """Conexão somente leitura (não cria o banco se ele não existir)"""
+    return sqlite3.connect(f"{Path(caminho).resolve().as_uri()}?mode=ro", uri=True)
+
+def hash_arquivo(caminho):
+    """Hash do conteúdo do arquivo, lido em blocos"""
+    st_info = os.stat(caminho)
+    chave = (st_info.st_size, st_info.st_mtime_ns)
+    anterior = _ULTIMA.get(str(caminho))
+    if anterior and anterior[0] == chave:
+        return anterior[1]
+    
+    h = hashlib.sha1()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    _ULTIMA[str(caminho)] = (chave, h.hexdigest())
+    return h.hexdigest()
+
+def impressao_digital_tabelas(caminho, tipo):
+    """
+    Hash de conteúdo de cada tabela lógica, no mesmo formato de
+    modules.fingerprint.impressao_digital (tabelas no lugar das abas)
+    
+    No SQLite todas as tabelas recebem o hash do arquivo do banco.
+    
+    Returns:
+        dict {'arquivo': hash do conjunto, 'abas': {tabela: hash}};
+        tabelas ausentes ficam de fora
+    
+    Raises:
+        OSError/sqlite3.Error se a fonte não existir ou estiver ilegível
+    """
+    if tipo == "sqlite":
+        h = hash_arquivo(caminho)
+        with closing(_conectar(caminho)) as con:
+            existentes = {nome for (nome,) in con.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+        hashes = {t: h for t in TABELAS if t in existentes}
+    else:
+        arquivos = {t: Path(caminho) / f"{t}.{tipo}" for t in TABELAS}
+        hashes = {t: hash_arquivo(arq) for t, arq in arquivos.items() if arq.exists()}
+    
+    h_conjunto = hashlib.sha1(tipo.encode("ascii"))
+    for nome in sorted(hashes):
+        h_conjunto.update(nome.encode("utf-8") + b"\x00" + hashes[nome].encode("ascii"))
+    return {"arquivo": h_conjunto.hexdigest() if hashes else None, "abas": hashes}
+
+def ler_tabela(caminho, tipo, tabela):
+    """
+    Lê uma tabela lógica da fonte
+    
+    Args:
+        caminho: diretório (CSV/Parquet) ou arquivo do banco (SQLite)
+        tipo: 'csv', 'parquet' ou 'sqlite' (ver tipo_fonte)
+        tabela: TABELA_INFO, TABELA_CHAMADOS ou TABELA_MRR
+    
+    Raises:
+        FileNotFoundError se o arquivo da tabela não existir
+    """
+    if tipo == "sqlite":
+        if not Path(caminho).exists():
+            raise FileNotFoundError(caminho)
+        with closing(_conectar(caminho)) as con:
+            return pd.read_sql_query(f'SELECT * FROM "{tabela}"', con)
+    
+    arquivo = Path(caminho) / f"{tabela}.{tipo}"
+    if tipo == "parquet":
+        if not arquivo.exists():
+            raise FileNotFoundError(arquivo)
+        return pd.read_parquet(arquivo)
+    return pd.read_csv(arquivo)
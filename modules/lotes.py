@@ -0,0 +1,128 @@
+"""
+Partes em disco do processamento em lotes
+Cada lote processado vira uma parte Parquet numa pasta por versão dos dados;
+tabelas finais, agregados e leituras filtradas saem dessas partes
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import pandas as pd
+import pyarrow.parquet as pq
+from modules.snapshot import tabela_arrow, frame_pandas
+
+# Gravado por último: pasta sem manifesto é gravação em andamento ou interrompida
+MANIFESTO = "manifesto.json"
+
+# Versões completas mantidas ao finalizar uma nova: ela e a anterior, que
+# processos ainda em recarga podem estar lendo
+MANTER_VERSOES = 2
+
+# Pasta sem manifesto e sem nada escrito há mais que isso (em segundos) é
+# gravação abandonada; uma gravação viva escreve uma parte a cada lote
+ABANDONADA_APOS = 24 * 60 * 60
+
+def pasta_versao(raiz, fonte, versao):
+    """Pasta das partes de uma versão dos dados (identidade da fonte + versão do ETL)"""
+    chave = json.dumps({"fonte": fonte, "versao": versao}, sort_keys=True).encode("utf-8")
+    return os.path.join(str(raiz), hashlib.sha1(chave).hexdigest()[:16])
+
+def versao_completa(pasta):
+    """True se todas as partes da versão já foram gravadas"""
+    return os.path.exists(os.path.join(pasta, MANIFESTO))
+
+def iniciar_versao(pasta):
+    """Cria a pasta da versão vazia (descarta uma gravação interrompida)"""
+    shutil.rmtree(pasta, ignore_errors=True)
+    os.makedirs(pasta)
+
+def _gravar(df, caminho):
+    pq.write_table(tabela_arrow(df, preserve_index=False), caminho)
+
+def gravar_parte(pasta, tabela, indice, df):
+    """Grava o lote `indice` da tabela como <pasta>/<tabela>/parte-NNNNN.parquet"""
+    os.makedirs(os.path.join(pasta, tabela), exist_ok=True)
+    _gravar(df, os.path.join(pasta, tabela, f"parte-{indice:05d}.parquet"))
+
+def gravar_tabela(pasta, nome, df):
+    """Grava uma tabela pequena inteira (ex.: agregados) como <pasta>/<nome>.parquet"""
+    _gravar(df, os.path.join(pasta, f"{nome}.parquet"))
+
+def finalizar_versao(pasta, fonte, versao):
+    """Grava o manifesto (a versão passa a valer) e apaga as versões antigas (ver _apagar_antigas)"""
+    temporario = os.path.join(pasta, f"{MANIFESTO}.tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump({"fonte": fonte, "versao": versao}, f)
+    os.replace(temporario, os.path.join(pasta, MANIFESTO))
+    _apagar_antigas(pasta)
+
+def _apagar_antigas(pasta):
+    """
+    Apaga, na raiz das versões, as completas mais antigas que `pasta` além
+    das MANTER_VERSOES mais recentes (contando `pasta`) e as gravações
+    abandonadas (ver ABANDONADA_APOS); versões mais novas, finalizadas por
+    outro processo, e gravações em andamento ficam
+    """
+    finalizada = os.path.getmtime(os.path.join(pasta, MANIFESTO))
+    raiz = os.path.dirname(pasta)
+    anteriores = []
+    for nome in os.listdir(raiz):
+        outra = os.path.join(raiz, nome)
+        if outra == pasta or not os.path.isdir(outra):
+            continue
+        try:
+            if versao_completa(outra):
+                instante = os.path.getmtime(os.path.join(outra, MANIFESTO))
+                if instante <= finalizada:
+                    anteriores.append((instante, outra))
+            elif time.time() - _ultima_escrita(outra) > ABANDONADA_APOS:
+                shutil.rmtree(outra, ignore_errors=True)
+        except OSError:
+            # Apagada por outro processo durante a varredura
+            continue
+    for _, outra in sorted(anteriores, reverse=True)[MANTER_VERSOES - 1:]:
+        shutil.rmtree(outra, ignore_errors=True)
+
+def _ultima_escrita(pasta):
+    """Instante da escrita mais recente na pasta ou em qualquer arquivo dentro dela"""
+    instantes = [os.path.getmtime(pasta)]
+    for raiz, pastas, arquivos in os.walk(pasta):
+        instantes.extend(os.path.getmtime(os.path.join(raiz, nome)) for nome in pastas + arquivos)
+    return max(instantes)
+
+def ler_partes(pasta, tabela, filtro=None):
+    """
+    Lê as partes de uma tabela, uma a uma, e as concatena
+    
+    Args:
+        filtro: filtro do pyarrow (ex.: [("CLIENTE", "==", nome)]), aplicado
+            em cada parte antes de virar pandas
+    """
+    partes = list(iterar_partes(pasta, tabela, filtro))
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+def iterar_partes(pasta, tabela, filtro=None, colunas=None):
+    """
+    Partes de uma tabela, uma por vez (só uma fica em memória), na ordem
+    em que foram gravadas; partes que o filtro esvazia são puladas
+    
+    Args:
+        filtro: filtro do pyarrow, como em ler_partes
+        colunas: lista de colunas a ler (None = todas)
+    """
+    caminho = os.path.join(pasta, tabela)
+    if not os.path.isdir(caminho):
+        return
+    for arquivo in sorted(os.listdir(caminho)):
+        parte = pq.read_table(os.path.join(caminho, arquivo), columns=colunas, filters=filtro)
+        if parte.num_rows:
+            yield frame_pandas(parte)
+
+def ler_tabela(pasta, nome):
+    """Lê uma tabela gravada por gravar_tabela (DataFrame vazio se não existir)"""
+    caminho = os.path.join(pasta, f"{nome}.parquet")
+    if not os.path.exists(caminho):
+        return pd.DataFrame()
+    return frame_pandas(pq.read_table(caminho))
@@ -0,0 +1,84 @@
+"""
+Recarga dos dados em segundo plano
+Uma thread vigia a fonte de dados e, quando ela muda, reconstrói os dados
+enquanto as sessões continuam servindo a versão atual; pronta a nova
+versão, ela entra no lugar com uma única troca de referência
+"""
+
+import threading
+
+# Intervalo (segundos) entre verificações da fonte; a verificação só faz
+# stat dos arquivos enquanto tamanho/mtime não mudam (ver modules.fingerprint)
+INTERVALO_VERIFICACAO = 5
+
+# Versão servida às sessões: (identidade da fonte, dados) ou None antes da 1ª
+# carga; 'vigia': (thread, evento que a encerra) ou None
+_ESTADO = {"atual": None, "vigia": None}
+_TRAVA = threading.Lock()
+
+def dados_atuais(construir, versao_fonte, aceitar=None, intervalo=INTERVALO_VERIFICACAO):
+    """
+    Dados da versão atual
+    
+    Na primeira chamada do processo os dados são construídos de forma
+    síncrona e a thread de vigia é iniciada; depois disso nenhuma sessão
+    espera ETL, só lê a referência atual.
+    
+    Args:
+        construir: função sem argumentos que monta os dados da fonte atual
+        versao_fonte: função sem argumentos que devolve a identidade da fonte (hash)
+        aceitar: função (dados) -> bool; versões recusadas não substituem a atual
+        intervalo: segundos entre verificações da fonte
+    
+    Returns:
+        (identidade da fonte, dados)
+    """
+    atual = _ESTADO["atual"]
+    if atual is not None:
+        return atual
+    
+    with _TRAVA:
+        if _ESTADO["atual"] is None:
+            versao = versao_fonte()
+            _ESTADO["atual"] = (versao, construir())
+            parar_vigia = threading.Event()
+            vigia = threading.Thread(
+                target=_vigiar,
+                args=(construir, versao_fonte, aceitar, intervalo, parar_vigia),
+                name="recarga-dados",
+                daemon=True,
+            )
+            _ESTADO["vigia"] = (vigia, parar_vigia)
+            vigia.start()
+    return _ESTADO["atual"]
+
+def parar():
+    """
+    Encerra a thread de vigia (esperando a construção em andamento) e
+    esquece a versão atual: a próxima chamada a dados_atuais constrói de novo
+    """
+    with _TRAVA:
+        vigia = _ESTADO["vigia"]
+        _ESTADO["atual"] = _ESTADO["vigia"] = None
+    if vigia is not None:
+        thread, parar_vigia = vigia
+        parar_vigia.set()
+        thread.join()
+
+def _vigiar(construir, versao_fonte, aceitar, intervalo, parar_vigia):
+    """Laço da thread: reconstrói e troca a versão quando a fonte muda, até parar_vigia"""
+    while not parar_vigia.wait(intervalo):
+        try:
+            versao = versao_fonte()
+            if versao is None or versao == _ESTADO["atual"][0]:
+                continue
+            dados = construir()
+            # Fonte mudou durante a construção: as partes podem ser de versões
+            # diferentes; descarta e refaz na próxima verificação
+            if versao_fonte() != versao:
+                continue
+        except Exception:
+            # Fonte em escrita ou ilegível: mantém a versão atual e tenta de novo
+            continue
+        if (aceitar is None or aceitar(dados)) and not parar_vigia.is_set():
+            _ESTADO["atual"] = (versao, dados)
@@ -0,0 +1,120 @@
+"""
+Histórico de MRR e retenção de receita
+Monta a matriz clientes x meses do MRR e calcula, para todos os clientes
+e meses de uma vez, novo, expansão, contração, churn, NRR e GRR
+"""
+
+import numpy as np
+import pandas as pd
+
+# Movimentos de receita de um cliente entre dois meses
+MOVIMENTOS = ["NOVO", "EXPANSAO", "CONTRACAO", "CHURN"]
+
+COLUNAS_INDICADORES = ["MES_REF", "MRR", "MRR_INICIAL", *MOVIMENTOS, "NRR", "GRR"]
+
+def matriz_mrr(serie):
+    """
+    Matriz clientes x meses do MRR
+    
+    Args:
+        serie: DataFrame com CLIENTE, MES_REF (1º dia do mês) e MRR;
+            linhas repetidas do mesmo cliente e mês são somadas
+    
+    Returns:
+        DataFrame indexado por CLIENTE com um mês por coluna, sem buracos
+        entre o primeiro e o último mês (mês sem registro vale 0)
+    """
+    if serie.empty:
+        return pd.DataFrame(dtype=float)
+    matriz = serie.pivot_table(index="CLIENTE", columns="MES_REF", values="MRR", aggfunc="sum", fill_value=0.0)
+    meses = pd.date_range(matriz.columns.min(), matriz.columns.max(), freq="MS")
+    return matriz.reindex(columns=meses, fill_value=0.0).astype(float)
+
+def _movimentos(atual, anterior):
+    """
+    (novo, expansão, contração, churn) elemento a elemento
+    
+    Novo: sem MRR antes e com MRR agora. Expansão/contração: variação de quem
+    tinha MRR nos dois meses. Churn: o MRR anterior de quem zerou.
+    """
+    antes = anterior > 0
+    agora = atual > 0
+    continua = antes & agora
+    variacao = atual - anterior
+    return (
+        np.where(~antes & agora, atual, 0.0),
+        np.where(continua, np.clip(variacao, 0, None), 0.0),
+        np.where(continua, np.clip(-variacao, 0, None), 0.0),
+        np.where(antes & ~agora, anterior, 0.0),
+    )
+
+def indicadores_receita(matriz, janela=1):
+    """
+    Retenção de receita de cada mês contra `janela` meses antes
+    
+    MRR_INICIAL é o MRR do mês de comparação; sobre ele:
+    NRR = (inicial + expansão - contração - churn) / inicial e
+    GRR = (inicial - contração - churn) / inicial, em %.
+    
+    Args:
+        matriz: saída de matriz_mrr
+        janela: meses entre os dois pontos (1 = mês a mês, 12 = anual)
+    
+    Returns:
+        DataFrame com COLUNAS_INDICADORES, um mês por linha; os primeiros
+        `janela` meses (sem comparação) ficam de fora
+    """
+    valores = matriz.to_numpy(dtype=float)
+    if valores.ndim != 2 or valores.shape[1] <= janela:
+        return pd.DataFrame(columns=COLUNAS_INDICADORES)
+    
+    atual, anterior = valores[:, janela:], valores[:, :-janela]
+    novo, expansao, contracao, churn = (m.sum(axis=0) for m in _movimentos(atual, anterior))
+    inicial = anterior.sum(axis=0)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nrr = np.where(inicial > 0, (inicial + expansao - contracao - churn) / inicial * 100, np.nan)
+        grr = np.where(inicial > 0, (inicial - contracao - churn) / inicial * 100, np.nan)
+    
+    return pd.DataFrame({
+        "MES_REF": matriz.columns[janela:],
+        "MRR": atual.sum(axis=0),
+        "MRR_INICIAL": inicial,
+        "NOVO": novo,
+        "EXPANSAO": expansao,
+        "CONTRACAO": contracao,
+        "CHURN": churn,
+        "NRR": nrr,
+        "GRR": grr,
+    })
+
+def movimentos_clientes(matriz):
+    """
+    Movimento de cada cliente em cada mês contra o mês anterior
+    
+    Returns:
+        DataFrame com CLIENTE, MES_REF, MRR, MRR_ANTERIOR, VARIACAO e
+        MOVIMENTO (um de MOVIMENTOS ou 'ESTAVEL'); pares cliente/mês sem
+        MRR nos dois meses ficam de fora
+    """
+    colunas = ["CLIENTE", "MES_REF", "MRR", "MRR_ANTERIOR", "VARIACAO", "MOVIMENTO"]
+    valores = matriz.to_numpy(dtype=float)
+    if valores.ndim != 2 or valores.shape[1] < 2:
+        return pd.DataFrame(columns=colunas)
+    
+    atual, anterior = valores[:, 1:], valores[:, :-1]
+    movimento = np.select(
+        [m > 0 for m in _movimentos(atual, anterior)], MOVIMENTOS, default="ESTAVEL"
+    )
+    
+    num_clientes, num_meses = atual.shape
+    presentes = ((atual > 0) | (anterior > 0)).ravel()
+    df = pd.DataFrame({
+        "CLIENTE": np.repeat(matriz.index.to_numpy(dtype=object), num_meses),
+        "MES_REF": np.tile(matriz.columns[1:].to_numpy(), num_clientes),
+        "MRR": atual.ravel(),
+        "MRR_ANTERIOR": anterior.ravel(),
+        "VARIACAO": (atual - anterior).ravel(),
+        "MOVIMENTO": movimento.astype(object).ravel(),
+    })
+    return df[presentes].reset_index(drop=True)
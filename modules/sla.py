@@ -0,0 +1,163 @@
+"""
+Cálculo de SLA em horas úteis
+Tempo útil entre abertura e fechamento dos tickets, por calendário de
+expediente e feriados, calculado em bloco com numpy (sem laço por ticket)
+"""
+
+import numpy as np
+import pandas as pd
+
+_EPOCA = np.datetime64("1970-01-01", "D")
+
+def _minutos(hora):
+    """'HH:MM' -> minutos desde a meia-noite"""
+    h, m = str(hora).split(":")
+    return int(h) * 60 + int(m)
+
+def pascoa(ano):
+    """Domingo de Páscoa do ano (calendário gregoriano, algoritmo de Meeus/Jones/Butcher)"""
+    a, b, c = ano % 19, ano // 100, ano % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    s = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * s) // 451
+    mes, dia = divmod(h + s - 7 * m + 114, 31)
+    return pd.Timestamp(ano, mes, dia + 1)
+
+def gerar_feriados(anos, fixos=(), pascoa_dias=()):
+    """
+    Feriados de cada ano do intervalo
+    
+    Args:
+        anos: (primeiro, último), inclusive
+        fixos: 'MM-DD', ou ('MM-DD', primeiro ano em que vale)
+        pascoa_dias: dias a partir do domingo de Páscoa (ex.: -2, Sexta-feira Santa)
+    
+    Returns:
+        lista de Timestamps
+    """
+    feriados = []
+    for ano in range(anos[0], anos[1] + 1):
+        for fixo in fixos:
+            data, desde = (fixo, anos[0]) if isinstance(fixo, str) else fixo
+            if ano >= desde:
+                feriados.append(pd.Timestamp(f"{ano}-{data}"))
+        domingo = pascoa(ano)
+        feriados.extend(domingo + pd.Timedelta(days=dias) for dias in pascoa_dias)
+    return feriados
+
+def criar_calendario(inicio="08:00", fim="18:00", dias_uteis="Mon Tue Wed Thu Fri", feriados=(),
+                     feriados_fixos=(), feriados_pascoa=(), anos=(1970, 2100)):
+    """
+    Calendário de expediente para horas_uteis
+    
+    Args:
+        inicio, fim: horário do expediente ('HH:MM'), igual em todos os dias úteis
+        dias_uteis: weekmask do numpy (ex.: 'Mon Tue Wed Thu Fri')
+        feriados: datas avulsas sem expediente (qualquer formato aceito por pd.to_datetime)
+        feriados_fixos, feriados_pascoa: feriados gerados para cada ano (ver gerar_feriados)
+        anos: (primeiro, último) anos cobertos; horas_uteis e prazo_util
+            recusam datas fora deles
+    
+    Returns:
+        dict {'inicio': minutos, 'fim': minutos, 'dias': np.busdaycalendar, 'anos': (primeiro, último)}
+    """
+    inicio, fim = _minutos(inicio), _minutos(fim)
+    if fim <= inicio:
+        raise ValueError("o fim do expediente deve ser depois do início")
+    feriados = list(pd.to_datetime(list(feriados))) + gerar_feriados(anos, feriados_fixos, feriados_pascoa)
+    feriados = pd.DatetimeIndex(feriados).to_numpy().astype("datetime64[D]")
+    return {
+        "inicio": inicio,
+        "fim": fim,
+        "dias": np.busdaycalendar(weekmask=dias_uteis, holidays=feriados),
+        "anos": tuple(anos),
+    }
+
+def _verificar_anos(valores, nulos, calendario):
+    """ValueError se alguma data estiver fora dos anos do calendário (feriados desconhecidos)"""
+    if nulos.all():
+        return
+    anos = valores[~nulos].astype("datetime64[Y]").astype("int64") + 1970
+    primeiro, ultimo = calendario["anos"]
+    if anos.min() < primeiro or anos.max() > ultimo:
+        raise ValueError(
+            f"datas de {anos.min()} a {anos.max()} fora dos anos do calendário de SLA ({primeiro}-{ultimo})"
+        )
+
+def _minutos_uteis_acumulados(momentos, calendario):
+    """
+    Minutos úteis entre 1970-01-01 e cada momento (NaN para NaT)
+    
+    Dias úteis inteiros antes da data valem o expediente completo; no
+    próprio dia conta só a parte do expediente já decorrida.
+    """
+    valores = pd.to_datetime(momentos).to_numpy().astype("datetime64[m]")
+    nulos = np.isnat(valores)
+    _verificar_anos(valores, nulos, calendario)
+    valores = np.where(nulos, _EPOCA.astype("datetime64[m]"), valores)
+    
+    dias = valores.astype("datetime64[D]")
+    minuto_do_dia = (valores - dias.astype("datetime64[m]")).astype("int64")
+    expediente = calendario["fim"] - calendario["inicio"]
+    
+    dias_anteriores = np.busday_count(_EPOCA, dias, busdaycal=calendario["dias"])
+    no_dia = np.clip(minuto_do_dia - calendario["inicio"], 0, expediente)
+    no_dia = np.where(np.is_busday(dias, busdaycal=calendario["dias"]), no_dia, 0)
+    
+    total = (dias_anteriores * expediente + no_dia).astype(float)
+    total[nulos] = np.nan
+    return total
+
+def horas_uteis(abertura, fechamento, calendario):
+    """
+    Horas úteis entre abertura e fechamento, elemento a elemento
+    
+    Args:
+        abertura, fechamento: Series de datas (mesmo índice)
+        calendario: saída de criar_calendario
+    
+    Returns:
+        Series float com o índice de abertura (NaN se alguma data faltar)
+    """
+    minutos = (
+        _minutos_uteis_acumulados(fechamento, calendario)
+        - _minutos_uteis_acumulados(abertura, calendario)
+    )
+    return pd.Series(np.clip(minutos, 0, None) / 60, index=abertura.index)
+
+def prazo_util(abertura, horas, calendario):
+    """
+    Momento em que se completam `horas` horas úteis depois da abertura
+    (inverso de horas_uteis: horas_uteis(abertura, prazo) == horas)
+    
+    Prazo que cai exatamente no fim do expediente fica nesse fim, e não
+    no início do próximo dia útil.
+    
+    Args:
+        abertura: Series de datas
+        horas: horas úteis (escalar ou array do tamanho de abertura)
+        calendario: saída de criar_calendario
+    
+    Returns:
+        Series datetime com o índice de abertura (NaT se a abertura faltar)
+    """
+    expediente = calendario["fim"] - calendario["inicio"]
+    alvo = _minutos_uteis_acumulados(abertura, calendario) + np.asarray(horas, dtype=float) * 60
+    nulos = np.isnan(alvo)
+    alvo = np.where(nulos, 0, alvo)
+    
+    # Dias úteis completos antes do prazo e minutos no dia do prazo
+    dias = np.floor(alvo / expediente).astype("int64")
+    minutos = alvo - dias * expediente
+    no_fim = (minutos == 0) & (dias > 0)
+    dias = np.where(no_fim, dias - 1, dias)
+    minutos = np.where(no_fim, expediente, minutos)
+    
+    dia = np.busday_offset(_EPOCA, dias, roll="forward", busdaycal=calendario["dias"])
+    prazo = dia.astype("datetime64[m]") + np.round(calendario["inicio"] + minutos).astype("int64")
+    prazo = pd.Series(prazo.astype("datetime64[ns]"), index=abertura.index)
+    return prazo.mask(nulos)
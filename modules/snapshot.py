@@ -0,0 +1,133 @@
+"""
+Snapshot colunar (Parquet) da saída do ETL
+Evita refazer o parse do Excel a cada reinício do servidor
+"""
+
+import os
+import json
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Chave dos metadados gravados no schema do Parquet
+CHAVE_METADADOS = b"dashboard_cs"
+
+def colunas_misturadas(df):
+    """Colunas object que o pyarrow recusa (ex.: texto e número na mesma coluna do Excel)"""
+    colunas = []
+    for col in df.columns[df.dtypes.eq(object)]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            colunas.append(col)
+    return colunas
+
+def preparar_frame(df):
+    """
+    Deixa o DataFrame gravável em SQL/Parquet como texto: nas colunas que o
+    pyarrow recusa, os valores não nulos viram str (as demais não mudam)
+    """
+    df = df.copy()
+    for col in colunas_misturadas(df):
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def tabela_arrow(df, preserve_index=None):
+    """
+    Converte o DataFrame em tabela Arrow
+    
+    Colunas que o pyarrow recusa são gravadas como texto (preparar_frame):
+    o arquivo continua legível por qualquer leitor de Parquet, sem objetos
+    serializados. O ETL já entrega essas colunas como texto, então a leitura
+    devolve os mesmos valores.
+    """
+    if colunas_misturadas(df):
+        df = preparar_frame(df)
+    return pa.Table.from_pandas(df, preserve_index=preserve_index)
+
+def frame_pandas(tabela):
+    """Inverso de tabela_arrow"""
+    df = tabela.to_pandas()
+    # Nulos de colunas texto voltam do Arrow como None; o ETL usa NaN
+    for col in df.columns[df.dtypes.eq(object)]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+def _caminho(pasta, nome):
+    return os.path.join(str(pasta), f"{nome}.parquet")
+
+def _ler(caminho):
+    """Lê tabela e metadados do snapshot; None se não existir ou estiver corrompido"""
+    if not os.path.exists(caminho):
+        return None, {}
+    
+    try:
+        metadados = pq.read_schema(caminho).metadata or {}
+        info = json.loads(metadados.get(CHAVE_METADADOS, b"{}"))
+        df = frame_pandas(pq.read_table(caminho))
+    except (OSError, ValueError, pa.ArrowException):
+        return None, {}
+    return df, info
+
+def ler_snapshot(pasta, nome, fonte, versao):
+    """
+    Lê o snapshot se ele foi gerado a partir da mesma fonte e versão do ETL
+    
+    Args:
+        pasta: diretório dos snapshots
+        nome: nome lógico da tabela (ex.: 'info_gerais')
+        fonte: identidade da origem (ex.: hash de conteúdo das abas)
+        versao: versão do ETL que gerou os dados
+    
+    Returns:
+        DataFrame ou None se não houver snapshot válido
+    """
+    caminho = _caminho(pasta, nome)
+    try:
+        metadados = pq.read_schema(caminho).metadata or {}
+        info = json.loads(metadados.get(CHAVE_METADADOS, b"{}"))
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    if info.get("fonte") != fonte or info.get("versao") != versao:
+        return None
+    return _ler(caminho)[0]
+
+def ler_snapshot_anterior(pasta, nome, versao):
+    """
+    Lê o último snapshot gravado pela mesma versão do ETL, qualquer que seja a fonte
+    (base para processamento incremental)
+    
+    Returns:
+        (DataFrame, extras) ou (None, {}) se não houver snapshot aproveitável
+    """
+    df, info = _ler(_caminho(pasta, nome))
+    if df is None or info.get("versao") != versao:
+        return None, {}
+    return df, info.get("extras", {})
+
+def gravar_snapshot(pasta, nome, df, fonte, versao, extras=None):
+    """
+    Grava o snapshot de forma atômica (arquivo temporário + rename)
+    
+    Args:
+        extras: dict serializável em JSON guardado junto (ex.: hash por bloco mensal)
+    
+    Returns:
+        o próprio DataFrame (a leitura devolve os mesmos valores e tipos,
+        exceto colunas misturadas, que voltam como texto)
+    """
+    try:
+        os.makedirs(str(pasta), exist_ok=True)
+        tabela = tabela_arrow(df)
+        metadados = dict(tabela.schema.metadata or {})
+        metadados[CHAVE_METADADOS] = json.dumps({"fonte": fonte, "versao": versao, "extras": extras or {}}).encode("utf-8")
+        tabela = tabela.replace_schema_metadata(metadados)
+        
+        caminho = _caminho(pasta, nome)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        pq.write_table(tabela, temporario)
+        os.replace(temporario, caminho)
+    except (OSError, pa.ArrowException):
+        # Snapshot é só otimização: sem permissão de escrita, segue sem ele
+        pass
+    return df
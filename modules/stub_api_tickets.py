@@ -0,0 +1,113 @@
+"""
+Servidor local que imita a API de tickets (para testes e desenvolvimento)
+Serve tickets sintéticos e determinísticos no contrato de modules.tickets_api,
+com latência e falhas configuráveis para exercitar concorrência e retentativas
+
+    python -m modules.stub_api_tickets --porta 8765 --tickets 50000 --latencia 0.05
+    CS_TICKETS_API=http://127.0.0.1:8765/tickets streamlit run app.py
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+import pandas as pd
+from modules.tickets_api import PARAM_INICIO, PARAM_FIM, PARAM_LIMITE, PARAM_CURSOR, CAMPO_ITENS, CAMPO_PROXIMO
+
+TIPOS = ["Incidente", "Solicitação", "Dúvida"]
+
+def gerar_tickets(quantidade, inicio, fim, clientes=50, semente=0):
+    """
+    Tickets sintéticos com abertura uniforme em [inicio, fim), em ordem de abertura
+    
+    Returns:
+        DataFrame com ID, CLIENTE, ABERTURA, FECHAMENTO, TIPO e STATUS_SLA (texto)
+    """
+    rng = np.random.default_rng(semente)
+    inicio, fim = pd.Timestamp(inicio), pd.Timestamp(fim)
+    segundos = np.sort(rng.integers(0, int((fim - inicio).total_seconds()), quantidade))
+    abertura = inicio + pd.to_timedelta(segundos, unit="s")
+    fechamento = abertura + pd.to_timedelta(rng.exponential(12, quantidade), unit="h")
+    aberto = rng.random(quantidade) < 0.1
+    return pd.DataFrame({
+        "ID": np.arange(1, quantidade + 1).astype(str),
+        "CLIENTE": [f"CLIENTE {i:03d}" for i in rng.integers(0, clientes, quantidade)],
+        "ABERTURA": abertura.strftime("%Y-%m-%d %H:%M:%S"),
+        "FECHAMENTO": np.where(aberto, None, fechamento.strftime("%Y-%m-%d %H:%M:%S")),
+        "TIPO": rng.choice(TIPOS, quantidade),
+        "STATUS_SLA": rng.choice(["Dentro", "Fora"], quantidade, p=[0.85, 0.15]),
+    })
+
+def criar_servidor(tickets, porta=0, latencia=0.0, taxa_falhas=0.0):
+    """
+    Servidor HTTP (ainda não iniciado) da API de tickets
+    
+    O cursor é a posição do próximo ticket dentro do filtro de abertura.
+    
+    Args:
+        tickets: saída de gerar_tickets
+        porta: 0 = porta livre escolhida pelo sistema (ver server_address)
+        latencia: segundos de espera por requisição
+        taxa_falhas: fração das requisições respondidas com 503
+    """
+    abertura = pd.to_datetime(tickets["ABERTURA"]).to_numpy()
+    registros = tickets.to_dict("records")
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            parametros = dict(urllib.parse.parse_qsl(url.query))
+            time.sleep(latencia)
+            if random.random() < taxa_falhas:
+                self.send_error(503)
+                return
+            
+            try:
+                de = np.searchsorted(abertura, np.datetime64(pd.Timestamp(parametros[PARAM_INICIO])), "left")
+                ate = np.searchsorted(abertura, np.datetime64(pd.Timestamp(parametros[PARAM_FIM])), "left")
+                posicao = de + int(parametros.get(PARAM_CURSOR, 0))
+                limite = int(parametros.get(PARAM_LIMITE, 100))
+            except (KeyError, ValueError):
+                self.send_error(400)
+                return
+            
+            fim_pagina = min(posicao + limite, ate)
+            corpo = json.dumps({
+                CAMPO_ITENS: registros[posicao:fim_pagina],
+                CAMPO_PROXIMO: str(fim_pagina - de) if fim_pagina < ate else None,
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+        
+        def log_message(self, *args):
+            pass
+    
+    return ThreadingHTTPServer(("127.0.0.1", porta), Handler)
+
+def iniciar_em_segundo_plano(servidor):
+    """Roda o servidor numa thread daemon e devolve a URL do endpoint de tickets"""
+    threading.Thread(target=servidor.serve_forever, name="stub-api-tickets", daemon=True).start()
+    host, porta = servidor.server_address[:2]
+    return f"http://{host}:{porta}/tickets"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API de tickets local para testes")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--dias", type=int, default=60, help="tickets abertos nos últimos N dias")
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--falhas", type=float, default=0.0, help="fração de respostas 503")
+    args = parser.parse_args()
+    
+    fim = pd.Timestamp.now().normalize() + pd.Timedelta(days=1)
+    tickets = gerar_tickets(args.tickets, fim - pd.Timedelta(days=args.dias), fim)
+    servidor = criar_servidor(tickets, args.porta, args.latencia, args.falhas)
+    print(f"API de tickets em http://127.0.0.1:{args.porta}/tickets ({len(tickets)} tickets)")
+    servidor.serve_forever()
@@ -0,0 +1,204 @@
+"""
+Ingestão de exportações brutas de tickets (CSV)
+Lê o arquivo em lotes e agrega por cliente e mês nas mesmas cinco
+categorias da aba "Chamados Mensais", com memória limitada ao lote
+"""
+
+import numpy as np
+import pandas as pd
+from modules.config import SLA_CALENDARIO, SLA_METAS_HORAS
+from modules.sla import criar_calendario, horas_uteis, prazo_util
+
+# Campo interno -> coluna no CSV exportado
+COLUNAS_TICKETS = {
+    "ID": "ID",
+    "CLIENTE": "CLIENTE",
+    "ABERTURA": "ABERTURA",
+    "FECHAMENTO": "FECHAMENTO",
+    "TIPO": "TIPO",
+    "STATUS_SLA": "STATUS_SLA",
+}
+
+# Linhas do CSV processadas por vez
+LINHAS_POR_LOTE_TICKETS = 200_000
+
+# Formato das datas de abertura/fechamento: "mixed" aceita formatos
+# diferentes no mesmo arquivo (ISO, dd/mm/aaaa...); com DIA_PRIMEIRO_TICKETS,
+# datas ambíguas como 05/03/2026 são lidas como dia/mês
+FORMATO_DATA_TICKETS = "mixed"
+DIA_PRIMEIRO_TICKETS = True
+
+# Fuso no fim da data ('Z', '-03:00'): ignorado, vale a hora local escrita
+RE_FUSO = r"(:\d{2}(?:\.\d+)?)(?:Z|[+-]\d{2}:?\d{2})$"
+
+# DENTRO_SLA/FORA_SLA calculados pelas horas úteis entre abertura e fechamento
+# (calendário e metas em modules.config); com False vêm da coluna STATUS_SLA
+CALCULAR_SLA = True
+
+# Classificação por prefixo do tipo e do status de SLA (já em maiúsculas)
+RE_TIPO_INCIDENTE = r"INCIDEN"
+RE_TIPO_SOLICITACAO = r"SOLICITA|REQUISI|REQUEST|SERVICE REQUEST"
+RE_SLA_DENTRO = r"DENTRO|OK|SIM|CUMPRID|MET|WITHIN"
+RE_SLA_FORA = r"FORA|VIOLAD|N[AÃ]O|ESTOURAD|BREACH"
+
+# Mesma ordem de CATEGORIAS_CHAMADOS no data_loader
+CATEGORIAS = ["CHAMADOS", "INCIDENTES", "SOLICITACOES", "DENTRO_SLA", "FORA_SLA"]
+
+_CALENDARIO = criar_calendario(**SLA_CALENDARIO)
+
+def _texto(serie):
+    return serie.fillna("").str.strip().str.upper()
+
+def _data(serie):
+    texto = serie.astype("string").str.strip().str.replace(RE_FUSO, r"\1", regex=True)
+    return pd.to_datetime(texto, errors="coerce", format=FORMATO_DATA_TICKETS, dayfirst=DIA_PRIMEIRO_TICKETS)
+
+def _invalidas(serie, datas):
+    """Valores preenchidos que não viraram data"""
+    return serie.notna() & serie.astype("string").str.strip().ne("") & datas.isna()
+
+def _status_sla(lote, abertura, incidente, solicitacao):
+    """
+    (dentro, fora, vencimento, fechamento ilegível) de cada ticket
+    
+    Com CALCULAR_SLA, compara as horas úteis até o fechamento com a meta do
+    tipo: fechado dentro da meta conta como DENTRO_SLA; fechado depois dela
+    conta como FORA_SLA. Ticket aberto não é medido aqui (o resultado
+    dependeria do dia da carga): recebe o vencimento, a primeira data de
+    referência em que já passou da meta, e entra em FORA_SLA na carga (ver
+    data_loader._somar_abertos_vencidos). Fechamento preenchido mas
+    ilegível não torna o ticket aberto: ele fica sem DENTRO_SLA/FORA_SLA.
+    """
+    if not CALCULAR_SLA:
+        sla = _texto(lote["STATUS_SLA"])
+        nada = pd.Series(False, index=lote.index)
+        return sla.str.match(RE_SLA_DENTRO), sla.str.match(RE_SLA_FORA), pd.Series(pd.NaT, index=lote.index), nada
+    
+    fechamento = _data(lote["FECHAMENTO"])
+    ilegivel = _invalidas(lote["FECHAMENTO"], fechamento)
+    aberto = fechamento.isna() & ~ilegivel & abertura.notna()
+    meta = np.select(
+        [incidente, solicitacao],
+        [SLA_METAS_HORAS["INCIDENTES"], SLA_METAS_HORAS["SOLICITACOES"]],
+        default=SLA_METAS_HORAS["PADRAO"]
+    )
+    horas = horas_uteis(abertura, fechamento, _CALENDARIO)
+    
+    # Datas de referência são meia-noite: vence no dia seguinte ao prazo
+    vencimento = pd.Series(pd.NaT, index=lote.index, dtype="datetime64[ns]")
+    if aberto.any():
+        prazo = prazo_util(abertura[aberto], meta[aberto.to_numpy()], _CALENDARIO)
+        vencimento[aberto] = prazo.dt.normalize() + pd.Timedelta(days=1)
+    return fechamento.notna() & horas.le(meta), horas.gt(meta), vencimento, ilegivel
+
+def agregar_lote(lote):
+    """
+    Contagens por (CLIENTE, MES_REF) de um lote de tickets
+    
+    O mês é o da abertura; tickets sem cliente ou sem data de abertura
+    válida ficam de fora. Datas preenchidas que não puderam ser lidas são
+    contadas em 'datas_invalidas' (ABERTURA: tickets descartados;
+    FECHAMENTO: tickets contados sem DENTRO_SLA/FORA_SLA).
+    
+    Returns:
+        dict com 'contagens' (DataFrame), 'abertos' (tickets em aberto por
+        CLIENTE, MES_REF e VENCIMENTO_SLA, coluna ABERTOS) e
+        'datas_invalidas' ({campo: n})
+    """
+    cliente = lote["CLIENTE"].str.strip()
+    abertura = _data(lote["ABERTURA"])
+    tipo = _texto(lote["TIPO"])
+    incidente = tipo.str.match(RE_TIPO_INCIDENTE)
+    solicitacao = tipo.str.match(RE_TIPO_SOLICITACAO)
+    dentro, fora, vencimento, fechamento_ilegivel = _status_sla(lote, abertura, incidente, solicitacao)
+    
+    contagens = pd.DataFrame({
+        "CHAMADOS": 1,
+        "INCIDENTES": incidente,
+        "SOLICITACOES": solicitacao,
+        "DENTRO_SLA": dentro,
+        "FORA_SLA": fora,
+    }, index=lote.index).astype("int64")
+    
+    com_cliente = cliente.notna() & cliente.ne("")
+    validas = com_cliente & abertura.notna()
+    chaves = [
+        cliente[validas].rename("CLIENTE"),
+        abertura[validas].dt.to_period("M").dt.to_timestamp().rename("MES_REF"),
+    ]
+    abertos = validas & vencimento.notna()
+    return {
+        "contagens": contagens[validas].groupby(chaves).sum(),
+        "abertos": pd.Series(1, index=lote.index, name="ABERTOS")[abertos].groupby(
+            [chave[abertos[validas]] for chave in chaves] + [vencimento[abertos].rename("VENCIMENTO_SLA")]
+        ).sum().to_frame(),
+        "datas_invalidas": {
+            "ABERTURA": int((com_cliente & _invalidas(lote["ABERTURA"], abertura)).sum()),
+            "FECHAMENTO": int((validas & fechamento_ilegivel).sum()),
+        },
+    }
+
+def campos_lidos():
+    """Campos usados na agregação (o de SLA depende de CALCULAR_SLA)"""
+    return ["CLIENTE", "ABERTURA", "TIPO", "FECHAMENTO" if CALCULAR_SLA else "STATUS_SLA"]
+
+def acumular(total, parcial):
+    """Soma a saída de agregar_lote de um lote ao acumulado (None = nada acumulado ainda)"""
+    if total is None:
+        return parcial
+    return {
+        "contagens": total["contagens"].add(parcial["contagens"], fill_value=0),
+        "abertos": total["abertos"].add(parcial["abertos"], fill_value=0),
+        "datas_invalidas": {
+            campo: total["datas_invalidas"][campo] + parcial["datas_invalidas"][campo]
+            for campo in total["datas_invalidas"]
+        },
+    }
+
+def contagens_finais(total):
+    """
+    Acumulado no formato de saída (contagens vazias, com o mesmo índice, se for None)
+    
+    Returns:
+        dict com 'contagens' (DataFrame indexado por CLIENTE e MES_REF, uma
+        coluna int64 por categoria), 'abertos' (indexado por CLIENTE, MES_REF
+        e VENCIMENTO_SLA, coluna ABERTOS) e 'datas_invalidas' ({campo: n})
+    """
+    if total is None:
+        indice = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=["CLIENTE", "MES_REF"])
+        abertos = pd.MultiIndex.from_arrays(
+            [[], pd.DatetimeIndex([]), pd.DatetimeIndex([])], names=["CLIENTE", "MES_REF", "VENCIMENTO_SLA"]
+        )
+        return {
+            "contagens": pd.DataFrame(columns=CATEGORIAS, index=indice, dtype="int64"),
+            "abertos": pd.DataFrame(columns=["ABERTOS"], index=abertos, dtype="int64"),
+            "datas_invalidas": {"ABERTURA": 0, "FECHAMENTO": 0},
+        }
+    return {
+        **total,
+        "contagens": total["contagens"][CATEGORIAS].astype("int64"),
+        "abertos": total["abertos"].astype("int64"),
+    }
+
+def agregar_tickets(caminho, colunas=None, linhas_por_lote=LINHAS_POR_LOTE_TICKETS):
+    """
+    Agrega a exportação de tickets por cliente e mês de abertura
+    
+    O CSV é lido em lotes de linhas_por_lote linhas, só com as colunas usadas;
+    em memória ficam apenas o lote atual e o acumulado (clientes x meses).
+    
+    Args:
+        caminho: arquivo CSV exportado
+        colunas: sobrescreve parte de COLUNAS_TICKETS (campo -> coluna no CSV)
+    
+    Returns:
+        dict de contagens_finais: 'contagens' indexado por (CLIENTE, MES_REF)
+        com uma coluna por categoria, 'abertos' e 'datas_invalidas'
+    """
+    colunas = {**COLUNAS_TICKETS, **(colunas or {})}
+    renomear = {colunas[c]: c for c in campos_lidos()}
+    
+    total = None
+    for lote in pd.read_csv(caminho, usecols=list(renomear), dtype=str, chunksize=linhas_por_lote):
+        total = acumular(total, agregar_lote(lote.rename(columns=renomear)))
+    return contagens_finais(total)
@@ -0,0 +1,203 @@
+"""
+Ingestão de tickets por API REST paginada
+O período é dividido em janelas de abertura; cada janela é paginada pelo
+cursor da API e as janelas correm em paralelo (asyncio, com limite de
+requisições em voo). Cada página é agregada assim que chega, e o progresso
+fica num arquivo de estado para retomar uma coleta interrompida.
+"""
+
+import os
+import json
+import random
+import asyncio
+import urllib.error
+import urllib.parse
+import urllib.request
+import pandas as pd
+from modules.tickets import COLUNAS_TICKETS, CATEGORIAS, agregar_lote, acumular, contagens_finais, campos_lidos
+
+# Contrato da API: GET <url>?start=...&end=...&limit=...[&cursor=...]
+# -> {"items": [ticket, ...], "next_cursor": "..." ou null}
+# Os campos de cada ticket seguem COLUNAS_TICKETS (mesmos nomes da exportação CSV)
+PARAM_INICIO = "start"
+PARAM_FIM = "end"
+PARAM_LIMITE = "limit"
+PARAM_CURSOR = "cursor"
+CAMPO_ITENS = "items"
+CAMPO_PROXIMO = "next_cursor"
+
+ITENS_POR_PAGINA = 500
+
+# Janelas de abertura (dias) paginadas em paralelo; requisições em voo ao mesmo tempo
+DIAS_POR_JANELA = 1
+CONCORRENCIA_MAXIMA = 8
+
+# Retentativas com espera exponencial (segundos, dobra a cada tentativa, com jitter)
+TENTATIVAS = 4
+ESPERA_INICIAL = 0.5
+TIMEOUT = 30
+
+# Versão do arquivo de estado: estados de outra versão são ignorados
+FORMATO_ESTADO = 3
+
+def _baixar(url):
+    """GET síncrono com resposta JSON (roda numa thread do executor)"""
+    with urllib.request.urlopen(url, timeout=TIMEOUT) as resposta:
+        return json.load(resposta)
+
+def _retentavel(erro):
+    """Erros de rede, 429 e 5xx valem nova tentativa; demais erros HTTP não"""
+    if isinstance(erro, urllib.error.HTTPError):
+        return erro.code == 429 or erro.code >= 500
+    return True
+
+async def _pagina(url, parametros, limite):
+    """Uma página da API, com até TENTATIVAS tentativas"""
+    endereco = f"{url}?{urllib.parse.urlencode(parametros)}"
+    for tentativa in range(TENTATIVAS):
+        try:
+            async with limite:
+                return await asyncio.to_thread(_baixar, endereco)
+        except (OSError, ValueError) as erro:
+            if tentativa == TENTATIVAS - 1 or not _retentavel(erro):
+                raise
+        await asyncio.sleep(ESPERA_INICIAL * 2 ** tentativa * (1 + random.random()))
+
+def _para_lote(itens, renomear):
+    """Tickets da página (lista de dicts) no formato de lote de modules.tickets"""
+    lote = pd.DataFrame.from_records(itens, columns=list(renomear)).rename(columns=renomear)
+    for col in lote.columns:
+        lote[col] = lote[col].where(lote[col].isna(), lote[col].astype(str))
+    return lote
+
+# Colunas de data dos registros do estado e seus formatos
+FORMATOS_ESTADO = {"MES_REF": "%Y-%m", "VENCIMENTO_SLA": "%Y-%m-%d"}
+
+def _de_registros(registros, indice, colunas):
+    """Registros do estado ([cliente, 'AAAA-MM', ..., valores]) -> DataFrame indexado"""
+    df = pd.DataFrame(registros, columns=[*indice, *colunas])
+    for col in indice[1:]:
+        df[col] = pd.to_datetime(df[col], format=FORMATOS_ESTADO[col])
+    return df.set_index(indice)
+
+def _para_registros(df):
+    """DataFrame indexado -> lista serializável em JSON"""
+    df = df.reset_index()
+    for col, formato in FORMATOS_ESTADO.items():
+        if col in df.columns:
+            df[col] = df[col].dt.strftime(formato)
+    return df.to_numpy().tolist()
+
+def _ler_progresso(progresso):
+    """
+    Acumulado salvo no estado (contagens, abertos e datas inválidas por
+    campo) -> formato de modules.tickets (ou None)
+    """
+    if not progresso["contagens"] and not progresso["abertos"] and not progresso["datas_invalidas"]:
+        return None
+    return {
+        "contagens": _de_registros(progresso["contagens"], ["CLIENTE", "MES_REF"], CATEGORIAS),
+        "abertos": _de_registros(progresso["abertos"], ["CLIENTE", "MES_REF", "VENCIMENTO_SLA"], ["ABERTOS"]),
+        "datas_invalidas": progresso["datas_invalidas"],
+    }
+
+def _gravar_progresso(total, progresso):
+    """Grava o acumulado no progresso da janela, serializável em JSON"""
+    if total is None:
+        return
+    total = contagens_finais(total)
+    progresso["contagens"] = _para_registros(total["contagens"])
+    progresso["abertos"] = _para_registros(total["abertos"])
+    progresso["datas_invalidas"] = total["datas_invalidas"]
+
+def _gravar_estado(caminho, estado):
+    """Grava o estado de forma atômica (arquivo temporário + rename)"""
+    if not caminho:
+        return
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(estado, f, default=int)
+    os.replace(temporario, caminho)
+
+def _ler_estado(caminho, coleta):
+    """Progresso salvo de uma coleta igual (mesma URL e período); senão, estado novo"""
+    if caminho and os.path.exists(caminho):
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                estado = json.load(f)
+            if estado.get("coleta") == coleta:
+                return estado
+        except (OSError, ValueError):
+            pass
+    return {"coleta": coleta, "janelas": {}}
+
+async def _coletar_janela(url, inicio, fim, estado, limite, renomear, salvar):
+    """
+    Pagina uma janela de abertura pelo cursor, agregando página a página;
+    retoma do cursor e das contagens salvos no estado
+    """
+    progresso = estado["janelas"].setdefault(
+        inicio.isoformat(), {"cursor": None, "fim": False, "contagens": [], "abertos": [], "datas_invalidas": {}}
+    )
+    total = _ler_progresso(progresso)
+    
+    while not progresso["fim"]:
+        parametros = {PARAM_INICIO: inicio.isoformat(), PARAM_FIM: fim.isoformat(), PARAM_LIMITE: ITENS_POR_PAGINA}
+        if progresso["cursor"]:
+            parametros[PARAM_CURSOR] = progresso["cursor"]
+        resposta = await _pagina(url, parametros, limite)
+        
+        itens = resposta.get(CAMPO_ITENS) or []
+        if itens:
+            total = acumular(total, agregar_lote(_para_lote(itens, renomear)))
+        progresso["cursor"] = resposta.get(CAMPO_PROXIMO)
+        progresso["fim"] = not progresso["cursor"]
+        _gravar_progresso(total, progresso)
+        salvar()
+    return total
+
+async def _coletar(url, inicio, fim, caminho_estado, renomear):
+    """Coleta todas as janelas do período em paralelo e soma as contagens"""
+    coleta = {"url": url, "inicio": inicio.isoformat(), "fim": fim.isoformat(), "formato": FORMATO_ESTADO}
+    estado = _ler_estado(caminho_estado, coleta)
+    limite = asyncio.Semaphore(CONCORRENCIA_MAXIMA)
+    
+    limites = list(pd.date_range(inicio, fim, freq=f"{DIAS_POR_JANELA}D"))
+    if limites[-1] < fim:
+        limites.append(fim)
+    janelas = [
+        _coletar_janela(url, a, b, estado, limite, renomear, lambda: _gravar_estado(caminho_estado, estado))
+        for a, b in zip(limites[:-1], limites[1:])
+    ]
+    
+    total = None
+    for parcial in await asyncio.gather(*janelas):
+        if parcial is not None:
+            total = acumular(total, parcial)
+    return total
+
+def agregar_tickets_api(url, inicio, fim, caminho_estado=None, colunas=None):
+    """
+    Agrega por cliente e mês os tickets abertos em [inicio, fim) lidos da API
+    
+    Args:
+        url: endpoint de tickets da API
+        inicio, fim: período de abertura (Timestamp)
+        caminho_estado: arquivo JSON de progresso; uma coleta interrompida do
+            mesmo período continua dos cursores salvos (apagado ao terminar)
+        colunas: sobrescreve parte de COLUNAS_TICKETS (campo -> nome na API)
+    
+    Returns:
+        dict com 'contagens' (indexado por CLIENTE e MES_REF), 'abertos' e
+        'datas_invalidas', como agregar_tickets
+    """
+    colunas = {**COLUNAS_TICKETS, **(colunas or {})}
+    renomear = {colunas[c]: c for c in campos_lidos()}
+    inicio, fim = pd.Timestamp(inicio), pd.Timestamp(fim)
+    if fim <= inicio:
+        return contagens_finais(None)
+    
+    total = asyncio.run(_coletar(url, inicio, fim, caminho_estado, renomear))
+    if caminho_estado and os.path.exists(caminho_estado):
+        os.remove(caminho_estado)
+    return contagens_finais(total)
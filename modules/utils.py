@@ -22,14 +22,19 @@ def format_percent(value, decimals=1):
         return "0.0%"
     return f"{value:.{decimals}f}%"
 
-def calcular_health_score(row, df_chamados_cliente):
+def format_flag(value):
+    """Formata flag booleana como SIM/NÃO (vazio = NÃO)"""
+    return "SIM" if pd.notna(value) and bool(value) else "NÃO"
+
+def calcular_health_score(row, serie_chamados):
     """
     Calcula Health Score de um cliente (0-100)
     Usa os últimos 3 meses COM DADOS (ignora meses vazios)
     
     Args:
         row: linha do DataFrame de informações gerais
-        df_chamados_cliente: DataFrame filtrado com chamados deste cliente
+        serie_chamados: chamados do cliente por mês, uma coluna por
+            categoria (modules.cubo.serie_cliente)
     
     Returns:
         dict com score e detalhamento
@@ -53,23 +58,13 @@ def calcular_health_score(row, df_chamados_cliente):
     detalhes['contato'] = pontos_contato
     
     # 2. PONTOS POR INCIDENTES (0-30)
-    if not df_chamados_cliente.empty:
-        # CORREÇÃO: Identificar meses COM DADOS (total de chamados > 0)
-        df_chamados_por_mes = df_chamados_cliente[
-            df_chamados_cliente['CATEGORIA'] == 'CHAMADOS'
-        ].groupby('MES_REF')['VALOR'].sum().reset_index()
-        
-        # Filtrar apenas meses com chamados > 0
-        meses_com_dados = df_chamados_por_mes[df_chamados_por_mes['VALOR'] > 0]['MES_REF'].tolist()
-        
-        # Pegar últimos 3 meses COM DADOS
-        meses_com_dados = sorted(meses_com_dados, reverse=True)[:3]
+    if not serie_chamados.empty:
+        # CORREÇÃO: Pegar últimos 3 meses COM DADOS (total de chamados > 0)
+        df_recente = serie_chamados[serie_chamados['CHAMADOS'] > 0].tail(3)
         
-        if len(meses_com_dados) > 0:
-            df_recente = df_chamados_cliente[df_chamados_cliente['MES_REF'].isin(meses_com_dados)]
-            
-            total_chamados = df_recente[df_recente['CATEGORIA'] == 'CHAMADOS']['VALOR'].sum()
-            total_incidentes = df_recente[df_recente['CATEGORIA'] == 'INCIDENTES']['VALOR'].sum()
+        if len(df_recente) > 0:
+            total_chamados = df_recente['CHAMADOS'].sum()
+            total_incidentes = df_recente['INCIDENTES'].sum()
             
             if total_chamados > 0:
                 taxa_incidentes = (total_incidentes / total_chamados) * 100
@@ -96,23 +91,14 @@ def calcular_health_score(row, df_chamados_cliente):
         detalhes['incidentes'] = 30
     
     # 3. PONTOS POR SLA (0-25)
-    if not df_chamados_cliente.empty:
-        # CORREÇÃO: Identificar meses COM DADOS de SLA (dentro + fora > 0)
-        df_sla_por_mes = df_chamados_cliente[
-            df_chamados_cliente['CATEGORIA'].isin(['DENTRO_SLA', 'FORA_SLA'])
-        ].groupby('MES_REF')['VALOR'].sum().reset_index()
-        
-        # Filtrar apenas meses com SLA > 0
-        meses_com_sla = df_sla_por_mes[df_sla_por_mes['VALOR'] > 0]['MES_REF'].tolist()
+    if not serie_chamados.empty:
+        # CORREÇÃO: Pegar últimos 3 meses COM DADOS de SLA (dentro + fora > 0)
+        total_sla_mes = serie_chamados['DENTRO_SLA'] + serie_chamados['FORA_SLA']
+        df_recente = serie_chamados[total_sla_mes > 0].tail(3)
         
-        # Pegar últimos 3 meses COM DADOS de SLA
-        meses_com_sla = sorted(meses_com_sla, reverse=True)[:3]
-        
-        if len(meses_com_sla) > 0:
-            df_recente = df_chamados_cliente[df_chamados_cliente['MES_REF'].isin(meses_com_sla)]
-            
-            dentro_sla = df_recente[df_recente['CATEGORIA'] == 'DENTRO_SLA']['VALOR'].sum()
-            fora_sla = df_recente[df_recente['CATEGORIA'] == 'FORA_SLA']['VALOR'].sum()
+        if len(df_recente) > 0:
+            dentro_sla = df_recente['DENTRO_SLA'].sum()
+            fora_sla = df_recente['FORA_SLA'].sum()
             total_sla = dentro_sla + fora_sla
             
             if total_sla > 0:
@@ -140,10 +126,10 @@ def calcular_health_score(row, df_chamados_cliente):
     # 4. PENALIDADES POR FLAGS (0-20)
     pontos_flags = 20
     
-    if row.get('AT_RISK') == 'SIM':
+    if row.get('AT_RISK', False):
         pontos_flags -= 8
     
-    if row.get('CHURN_RISK') == 'SIM':
+    if row.get('CHURN_RISK', False):
         pontos_flags -= 12
     
     score += max(0, pontos_flags)
@@ -165,37 +151,70 @@ def get_health_label(score):
     else:
         return "CRÍTICO", "#DC2626"
 
-def classificar_perfil_incidentes(df_chamados_cliente):
+def relatorio_memoria(frames, por_coluna=False):
+    """
+    Memória ocupada pelos DataFrames (memory_usage com deep=True)
+    
+    Args:
+        frames: dict nome -> DataFrame
+        por_coluna: detalha cada coluna (e o índice) em vez do total do frame
+    
+    Returns:
+        DataFrame com FRAME, LINHAS, MB e BYTES_POR_LINHA; por coluna,
+        FRAME, COLUNA, DTYPE e MB (maiores primeiro em cada frame)
+    """
+    linhas = []
+    for nome, df in frames.items():
+        uso = df.memory_usage(deep=True, index=True)
+        if not por_coluna:
+            linhas.append({
+                'FRAME': nome,
+                'LINHAS': len(df),
+                'MB': uso.sum() / 1024 ** 2,
+                'BYTES_POR_LINHA': uso.sum() / len(df) if len(df) else 0.0,
+            })
+            continue
+        for coluna, bytes_coluna in uso.sort_values(ascending=False).items():
+            linhas.append({
+                'FRAME': nome,
+                'COLUNA': coluna,
+                'DTYPE': str(df.index.dtype if coluna == 'Index' else df[coluna].dtype),
+                'MB': bytes_coluna / 1024 ** 2,
+            })
+    
+    colunas = ['FRAME', 'COLUNA', 'DTYPE', 'MB'] if por_coluna else ['FRAME', 'LINHAS', 'MB', 'BYTES_POR_LINHA']
+    return pd.DataFrame(linhas, columns=colunas)
+
+def classificar_perfil_incidentes(serie_chamados):
     """
     Classifica perfil de incidentes do cliente
     Usa os últimos 6 meses COM DADOS (ignora meses vazios)
     
+    Args:
+        serie_chamados: chamados do cliente por mês (modules.cubo.serie_cliente)
+    
     Returns:
         str: "SEM_INCIDENTES" | "ESPORADICO" | "RECORRENTE" | "CRESCENTE"
     """
-    if df_chamados_cliente.empty:
+    if serie_chamados.empty:
         return "SEM_INCIDENTES"
     
-    # CORREÇÃO: Identificar meses COM DADOS de incidentes
-    df_inc = df_chamados_cliente[df_chamados_cliente['CATEGORIA'] == 'INCIDENTES'].copy()
-    
-    # Agrupar por mês
-    df_inc_mensal = df_inc.groupby('MES_REF')['VALOR'].sum().reset_index()
-    df_inc_mensal = df_inc_mensal.sort_values('MES_REF', ascending=False)
+    # Incidentes por mês, do mais recente para o mais antigo
+    inc_mensal = serie_chamados['INCIDENTES'].iloc[::-1]
     
     # Se não houver incidentes
-    if df_inc_mensal['VALOR'].sum() == 0:
+    if inc_mensal.sum() == 0:
         return "SEM_INCIDENTES"
     
     # Pegar últimos 6 meses (mesmo os com 0, para análise de tendência)
-    df_inc_mensal = df_inc_mensal.head(6)
+    inc_mensal = inc_mensal.head(6)
     
     # Contar meses com incidentes
-    meses_com_incidentes = (df_inc_mensal['VALOR'] > 0).sum()
+    meses_com_incidentes = (inc_mensal > 0).sum()
     
     # Verificar tendência crescente (últimos 3 meses)
-    if len(df_inc_mensal) >= 3:
-        ultimos_3 = df_inc_mensal.head(3)['VALOR'].tolist()
+    if len(inc_mensal) >= 3:
+        ultimos_3 = inc_mensal.head(3).tolist()
         if len(ultimos_3) == 3:
             # Crescente: cada mês tem mais incidentes que o anterior
             if ultimos_3[0] > ultimos_3[1] > 0 and ultimos_3[1] > ultimos_3[2]:
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Testes rodam a partir da raiz do repositório (modules/ e views/ importáveis)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules import data_loader
+
+@pytest.fixture(autouse=True)
+def dados_em_tmp(tmp_path, monkeypatch):
+    """Snapshots, partes do modo lotes e estado da API de tickets em tmp_path, nunca em data/"""
+    monkeypatch.setattr(data_loader, "SNAPSHOT_DIR", tmp_path / "snapshot")
+    monkeypatch.setattr(data_loader, "LOTES_DIR", tmp_path / "lotes")
+    monkeypatch.setattr(data_loader, "ESTADO_TICKETS_API", tmp_path / "tickets_api.json")
@@ -0,0 +1,66 @@
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pandas.testing import assert_frame_equal, assert_index_equal
+
+from modules import data_loader
+from modules.base_sqlite import TABELA_CHAMADOS
+
+REFERENCIA = "2026-06-15"
+
+def _materializar(caminho, monkeypatch):
+    monkeypatch.setattr(data_loader, "BASE_SQLITE", str(caminho))
+    st.cache_data.clear()
+    assert data_loader._base_sqlite() == str(caminho)
+    with closing(sqlite3.connect(caminho)) as con:
+        df = pd.read_sql_query(f"SELECT * FROM {TABELA_CHAMADOS} ORDER BY rowid", con)
+    return df, data_loader.load_chamados_mensal(None, REFERENCIA)
+
+def test_base_no_modo_lotes_gravada_parte_a_parte(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "MODO_LOTES", False)
+    memoria, mensal_memoria = _materializar(tmp_path / "memoria.db", monkeypatch)
+    
+    monkeypatch.setattr(data_loader, "MODO_LOTES", True)
+    monkeypatch.setattr(data_loader, "LOTES_DIR", tmp_path / "lotes")
+    
+    def proibido():
+        raise AssertionError("chamados montados inteiros no modo lotes")
+    monkeypatch.setattr(data_loader, "_chamados_fonte", proibido)
+    
+    lotes, mensal_lotes = _materializar(tmp_path / "lotes.db", monkeypatch)
+    
+    assert len(memoria) > 0
+    assert_frame_equal(lotes[memoria.columns], memoria)
+    assert_frame_equal(mensal_lotes, mensal_memoria)
+
+def test_cubo_e_agregados_saem_da_base_sem_os_chamados_em_memoria(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "MODO_LOTES", False)
+    st.cache_data.clear()
+    chamados = data_loader.load_chamados_all(REFERENCIA)
+    memoria = {
+        "cubo": data_loader.load_cubo_chamados(REFERENCIA),
+        "mensal": data_loader.load_chamados_mensal(chamados, REFERENCIA),
+        "por_cliente": data_loader.load_chamados_por_cliente(chamados, REFERENCIA),
+    }
+    
+    _materializar(tmp_path / "base.db", monkeypatch)
+    def proibido(*args, **kwargs):
+        raise AssertionError("chamados montados inteiros com a base SQLite")
+    monkeypatch.setattr(data_loader, "load_chamados_all", proibido)
+    monkeypatch.setattr(data_loader, "load_base_cs_dashboard", proibido)
+    st.cache_data.clear()
+    
+    assert data_loader.chamados_na_base()
+    cubo = data_loader.load_cubo_chamados(REFERENCIA)
+    for eixo in ("clientes", "meses", "categorias"):
+        assert_index_equal(cubo[eixo], memoria["cubo"][eixo])
+    np.testing.assert_allclose(cubo["valores"], memoria["cubo"]["valores"])
+    np.testing.assert_array_equal(cubo["presente"], memoria["cubo"]["presente"])
+    
+    mensal = data_loader.load_chamados_mensal(None, REFERENCIA)
+    por_cliente = data_loader.load_chamados_por_cliente(None, REFERENCIA)
+    assert np.isclose(mensal["VALOR"].sum(), memoria["mensal"]["VALOR"].sum())
+    assert np.isclose(por_cliente["VALOR"].sum(), memoria["por_cliente"]["VALOR"].sum())
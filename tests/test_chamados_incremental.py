@@ -0,0 +1,39 @@
+from pandas.testing import assert_frame_equal
+
+from modules import data_loader
+from modules.snapshot import gravar_snapshot, ler_snapshot_anterior
+
+def _completo():
+    abas = tuple(data_loader._abas_chamados())
+    df, extras = data_loader._etl_chamados(abas)
+    assert not df.empty and extras["blocos"]
+    return abas, df, extras
+
+def test_incremental_sem_mudancas_igual_ao_completo(tmp_path):
+    abas, completo, extras = _completo()
+    gravar_snapshot(tmp_path, "chamados", completo, {}, 1, extras)
+    
+    incremental, extras_incremental = data_loader._etl_chamados(abas, *ler_snapshot_anterior(tmp_path, "chamados", 1))
+    
+    assert_frame_equal(incremental, completo)
+    assert extras_incremental == extras
+
+def test_incremental_com_mes_alterado_e_mes_novo_igual_ao_completo():
+    abas, completo, extras = _completo()
+    meses = completo["MES_REF"].drop_duplicates().sort_values()
+    alterado, novo = meses.iloc[0], meses.iloc[-1]
+    
+    # Snapshot anterior com um mês desatualizado e sem o último mês
+    anterior = completo[completo["MES_REF"].ne(novo)].copy()
+    anterior.loc[anterior["MES_REF"].eq(alterado), "VALOR"] += 1
+    blocos = {}
+    for chave, h in extras["blocos"].items():
+        mes = chave.rsplit("|", 1)[1]
+        if mes == f"{novo:%Y-%m}":
+            continue
+        blocos[chave] = "desatualizado" if mes == f"{alterado:%Y-%m}" else h
+    
+    incremental, extras_incremental = data_loader._etl_chamados(abas, anterior, {"blocos": blocos})
+    
+    assert_frame_equal(incremental, completo)
+    assert extras_incremental == extras
@@ -0,0 +1,73 @@
+import pandas as pd
+import streamlit as st
+
+from modules import clientes, data_loader
+from modules.clientes import resolver_clientes, relatorio_candidatos, aplicar_resolucao, ler_aliases
+
+NOMES = {
+    "info_gerais": ["HOSPITAL SÃO LUCAS", "HOSPITAL SÃO LUIS", "CLINICA SANTA MARIA", "VOTORANTIM S.A."],
+    "chamados": ["Hospital Sao  Lucas", "CLINICA SANTA MARTA", "VOTORANTIM", "votorantim s/a"],
+}
+
+def test_so_chaves_normalizadas_iguais_sao_unidas():
+    resolucao = resolver_clientes(NOMES)
+    
+    assert resolucao["nomes"]["Hospital Sao  Lucas"] == "HOSPITAL SÃO LUCAS"
+    assert resolucao["nomes"]["votorantim s/a"] == "VOTORANTIM S.A."
+    assert resolucao["nomes"]["HOSPITAL SÃO LUIS"] == "HOSPITAL SÃO LUIS"
+    assert resolucao["nomes"]["CLINICA SANTA MARTA"] == "CLINICA SANTA MARTA"
+    assert resolucao["nomes"]["VOTORANTIM"] == "VOTORANTIM"
+    assert set(resolucao["relatorio"]["REGRA"]) == {"canônico", "normalização"}
+
+def test_quase_duplicatas_viram_candidatos():
+    candidatos = relatorio_candidatos(resolver_clientes(NOMES))
+    pares = {(a, b): regra for a, b, regra in zip(candidatos["CLIENTE"], candidatos["CANDIDATO"], candidatos["REGRA"])}
+    
+    assert pares == {
+        ("VOTORANTIM", "VOTORANTIM S.A."): "sufixo",
+        ("CLINICA SANTA MARIA", "CLINICA SANTA MARTA"): "similaridade",
+        ("HOSPITAL SÃO LUCAS", "HOSPITAL SÃO LUIS"): "similaridade",
+    }
+
+def test_tabela_de_aliases_une_grafias_revisadas():
+    aliases = ler_aliases(pd.DataFrame({"ALIAS": ["VOTORANTIM", None], "CLIENTE": ["VOTORANTIM S.A.", "X"]}))
+    resolucao = resolver_clientes(NOMES, aliases)
+    
+    assert aliases == {"VOTORANTIM": "VOTORANTIM S.A."}
+    assert resolucao["nomes"]["VOTORANTIM"] == "VOTORANTIM S.A."
+    assert "alias" in set(resolucao["relatorio"]["REGRA"])
+    assert not relatorio_candidatos(resolucao)["CLIENTE"].eq("VOTORANTIM").any()
+    
+    serie = pd.Series(["VOTORANTIM", "votorantim s/a", "HOSPITAL SÃO LUIS"], dtype="category")
+    assert list(aplicar_resolucao(serie, resolucao)) == ["VOTORANTIM S.A.", "VOTORANTIM S.A.", "HOSPITAL SÃO LUIS"]
+
+def test_base_consolidada_acompanha_a_tabela_de_aliases(tmp_path, monkeypatch):
+    arquivo = tmp_path / "aliases.csv"
+    monkeypatch.setattr(data_loader, "ARQ_ALIASES", str(arquivo))
+    
+    pd.DataFrame({"ALIAS": ["ACAD"], "CLIENTE": ["ACAD TECNOLOGIA"]}).to_csv(arquivo, index=False)
+    st.cache_data.clear()
+    antes = data_loader.load_base_cs_dashboard("2026-06-15")
+    assert antes["CLIENTE"].eq("ACAD TECNOLOGIA").any()
+    
+    pd.DataFrame({"ALIAS": ["ACAD"], "CLIENTE": ["ACAD"]}).to_csv(arquivo, index=False)
+    depois = data_loader.load_base_cs_dashboard("2026-06-15")
+    dicionario = data_loader.load_dicionario_clientes()
+    
+    assert not depois["CLIENTE"].eq("ACAD TECNOLOGIA").any()
+    assert depois["CLIENTE"].eq("ACAD").any()
+    assert (dicionario.get_indexer(depois["CLIENTE"]) == depois["COD_CLIENTE"].to_numpy()).all()
+
+def test_candidatos_so_sao_calculados_quando_pedidos(monkeypatch):
+    def proibido(resolucao):
+        raise AssertionError("candidatos calculados no carregamento")
+    
+    st.cache_data.clear()
+    monkeypatch.setattr(clientes, "relatorio_candidatos", proibido)
+    monkeypatch.setattr(data_loader, "relatorio_candidatos", proibido)
+    base = data_loader.load_base_cs_dashboard("2026-06-15")
+    monkeypatch.undo()
+    candidatos = data_loader.load_candidatos_clientes()
+    
+    assert not base.empty
+    assert list(candidatos.columns) == ["CLIENTE", "CANDIDATO", "REGRA", "SIMILARIDADE"]
@@ -0,0 +1,11 @@
+from modules import fingerprint
+from modules.data_loader import ARQ_CS
+
+def test_hash_nao_depende_do_tamanho_dos_blocos(monkeypatch):
+    fingerprint._ULTIMA.clear()
+    referencia = fingerprint.impressao_digital(ARQ_CS)
+    
+    for tamanho in (7, 100, 4096):
+        fingerprint._ULTIMA.clear()
+        monkeypatch.setattr(fingerprint, "TAMANHO_BLOCO", tamanho)
+        assert fingerprint.impressao_digital(ARQ_CS) == referencia
@@ -0,0 +1,81 @@
+import sqlite3
+from contextlib import closing
+
+import openpyxl
+import pandas as pd
+import pytest
+import streamlit as st
+from pandas.testing import assert_frame_equal
+
+from modules import data_loader
+from modules.fontes import TABELA_INFO, TABELA_CHAMADOS
+from modules.snapshot import preparar_frame
+
+REFERENCIA = "2026-06-15"
+
+# Colunas padronizadas pelo ETL; as demais passam como vêm da fonte
+# (o CSV, por exemplo, não guarda o tipo de uma coluna com texto e número)
+COLUNAS_INFO = [
+    nome for nome in data_loader.MAPA_COLUNAS_INFO
+    if data_loader.MAPA_COLUNAS_INFO[nome][1] != "texto"
+] + [
+    "CLIENTE_ID", "COD_CLIENTE", "CANCELADO", "DIAS_SEM_CONTATO",
+    "FAIXA_CONTATO", "DIAS_ATE_VENCIMENTO", "ALERTA_VENCIMENTO",
+]
+
+def _tabelas_xlsx():
+    info = pd.read_excel(data_loader.ARQ_CS, sheet_name=data_loader.ABA_INFO)
+    chamados = data_loader._etl_chamados(tuple(data_loader._abas_chamados()))[0]
+    chamados = chamados[["CLIENTE", "MES_REF", "CATEGORIA", "VALOR"]].astype({"CLIENTE": str, "CATEGORIA": str})
+    return {TABELA_INFO: info, TABELA_CHAMADOS: chamados}
+
+def _exportar(tabelas, destino, tipo):
+    if tipo == "sqlite":
+        with closing(sqlite3.connect(destino)) as con:
+            for nome, df in tabelas.items():
+                preparar_frame(df).to_sql(nome, con, index=False)
+        return destino
+    
+    destino.mkdir()
+    for nome, df in tabelas.items():
+        if tipo == "csv":
+            df.to_csv(destino / f"{nome}.csv", index=False)
+        else:
+            preparar_frame(df).to_parquet(destino / f"{nome}.parquet", index=False)
+    return destino
+
+def _carregar(monkeypatch, fonte, tipo):
+    monkeypatch.setattr(data_loader, "FONTE_DADOS", fonte)
+    monkeypatch.setattr(data_loader, "TIPO_FONTE", tipo)
+    info = data_loader.load_info_gerais(REFERENCIA)
+    chamados = data_loader.load_chamados_all(REFERENCIA)
+    return info[COLUNAS_INFO].reset_index(drop=True), chamados.reset_index(drop=True)
+
+@pytest.mark.parametrize("tipo", ["csv", "parquet", "sqlite"])
+def test_fontes_tabulares_iguais_ao_xlsx(tmp_path, monkeypatch, tipo):
+    info_xlsx, chamados_xlsx = _carregar(monkeypatch, data_loader.ARQ_CS, "xlsx")
+    destino = tmp_path / ("base.db" if tipo == "sqlite" else tipo)
+    info, chamados = _carregar(monkeypatch, _exportar(_tabelas_xlsx(), destino, tipo), tipo)
+    
+    assert_frame_equal(info, info_xlsx)
+    assert_frame_equal(chamados, chamados_xlsx)
+
+def test_carga_abre_o_xlsx_uma_vez(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "SNAPSHOT_DIR", tmp_path)
+    abertos = []
+    abrir = openpyxl.load_workbook
+    def abrir_contando(*args, **kwargs):
+        abertos.append(abrir(*args, **kwargs))
+        return abertos[-1]
+    monkeypatch.setattr(openpyxl, "load_workbook", abrir_contando)
+    st.cache_data.clear()
+    
+    with data_loader.fonte_compartilhada():
+        info = data_loader.load_info_gerais(REFERENCIA)
+        chamados = data_loader.load_chamados_all(REFERENCIA)
+        data_loader.load_mrr(REFERENCIA)
+        schema = data_loader.load_relatorio_schema()
+    
+    assert not info.empty and not chamados.empty and schema
+    assert len(abertos) == 1
+    assert abertos[0]._archive.fp is None
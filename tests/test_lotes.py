@@ -0,0 +1,95 @@
+import os
+import time
+
+import numpy as np
+import pytest
+import streamlit as st
+from pandas.testing import assert_frame_equal, assert_index_equal
+
+from modules import cubo, data_loader
+from modules.lotes import MANIFESTO, iniciar_versao, finalizar_versao
+
+REFERENCIA = "2026-06-15"
+
+def _artefatos():
+    """Os artefatos de app.carregar_dados (sem chamados no modo lotes)"""
+    st.cache_data.clear()
+    chamados = None if data_loader.chamados_em_lotes() else data_loader.load_chamados_all(REFERENCIA)
+    return {
+        "info": data_loader.load_info_gerais(REFERENCIA),
+        "chamados": chamados,
+        "dicionario": data_loader.load_dicionario_clientes(),
+        "cubo": data_loader.load_cubo_chamados(REFERENCIA),
+        "mensal": data_loader.load_chamados_mensal(chamados, REFERENCIA),
+        "por_cliente": data_loader.load_chamados_por_cliente(chamados, REFERENCIA),
+    }
+
+def _ordenado(df, colunas):
+    df = df.astype({c: str for c in colunas if c != "MES_REF"})
+    return df.sort_values(colunas).reset_index(drop=True)[colunas + ["VALOR"]]
+
+@pytest.fixture
+def memoria(monkeypatch):
+    monkeypatch.setattr(data_loader, "MODO_LOTES", False)
+    return _artefatos()
+
+def test_modo_lotes_serve_os_mesmos_artefatos_sem_montar_os_chamados(tmp_path, monkeypatch, memoria):
+    monkeypatch.setattr(data_loader, "MODO_LOTES", True)
+    monkeypatch.setattr(data_loader, "LOTES_DIR", tmp_path)
+    
+    def proibido():
+        raise AssertionError("chamados montados inteiros no modo lotes")
+    monkeypatch.setattr(data_loader, "_chamados_fonte", proibido)
+    
+    assert data_loader.chamados_em_lotes()
+    lotes = _artefatos()
+    
+    colunas_info = [c for c in memoria["info"].columns if c != "COD_CLIENTE"]
+    assert_frame_equal(
+        lotes["info"][colunas_info].reset_index(drop=True),
+        memoria["info"][colunas_info].reset_index(drop=True),
+        check_dtype=False, check_categorical=False,
+    )
+    assert_index_equal(lotes["dicionario"], memoria["dicionario"])
+    for eixo in ("clientes", "meses", "categorias"):
+        assert_index_equal(lotes["cubo"][eixo], memoria["cubo"][eixo])
+    np.testing.assert_array_equal(lotes["cubo"]["valores"], memoria["cubo"]["valores"])
+    np.testing.assert_array_equal(lotes["cubo"]["presente"], memoria["cubo"]["presente"])
+    assert_frame_equal(_ordenado(lotes["mensal"], ["MES_REF", "CATEGORIA"]), _ordenado(memoria["mensal"], ["MES_REF", "CATEGORIA"]))
+    assert_frame_equal(_ordenado(lotes["por_cliente"], ["CLIENTE", "CATEGORIA"]), _ordenado(memoria["por_cliente"], ["CLIENTE", "CATEGORIA"]))
+
+def test_cubo_acima_do_limite_nao_e_montado(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "MODO_LOTES", True)
+    monkeypatch.setattr(data_loader, "LOTES_DIR", tmp_path)
+    monkeypatch.setattr(cubo, "LIMITE_BYTES_CUBO", 1024)
+    st.cache_data.clear()
+    
+    with pytest.raises(ValueError, match="cubo de chamados"):
+        data_loader.load_cubo_chamados(REFERENCIA)
+
+def _versao(raiz, nome, idade, completa=True):
+    """Pasta de versão com o manifesto (ou a última parte) gravado há `idade` segundos"""
+    pasta = str(raiz / nome)
+    iniciar_versao(pasta)
+    arquivo = os.path.join(pasta, MANIFESTO if completa else "parte-00000.parquet")
+    open(arquivo, "w").close()
+    instante = time.time() - idade
+    for caminho in (arquivo, pasta):
+        os.utime(caminho, (instante, instante))
+    return pasta
+
+def test_finalizar_versao_mantem_a_anterior_e_gravacoes_vivas(tmp_path):
+    antiga = _versao(tmp_path, "antiga", 300)
+    anterior = _versao(tmp_path, "anterior", 200)
+    mais_nova = _versao(tmp_path, "mais_nova", -60)
+    gravando = _versao(tmp_path, "gravando", 10, completa=False)
+    abandonada = _versao(tmp_path, "abandonada", 2 * 24 * 60 * 60, completa=False)
+    nova = str(tmp_path / "nova")
+    iniciar_versao(nova)
+    
+    finalizar_versao(nova, "fonte", 1)
+    
+    assert not os.path.exists(antiga)
+    assert not os.path.exists(abandonada)
+    for pasta in (nova, anterior, mais_nova, gravando):
+        assert os.path.isdir(pasta)
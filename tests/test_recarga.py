@@ -0,0 +1,39 @@
+import time
+import threading
+
+import pytest
+
+from modules import recarga
+
+@pytest.fixture(autouse=True)
+def sem_vigia():
+    recarga.parar()
+    yield
+    recarga.parar()
+    assert recarga._ESTADO == {"atual": None, "vigia": None}
+    assert not any(thread.name == "recarga-dados" for thread in threading.enumerate())
+
+def test_versao_alterada_durante_a_construcao_nao_e_servida():
+    fonte = {"versao": 1}
+    servidas = []
+    
+    def construir():
+        # Frames e cubo lidos da fonte; na versão 2 ela muda entre as duas leituras
+        frames = fonte["versao"]
+        if frames == 2:
+            fonte["versao"] = 3
+        return {"frames": frames, "cubo": fonte["versao"]}
+    
+    def versao_fonte():
+        return fonte["versao"]
+    
+    assert recarga.dados_atuais(construir, versao_fonte, intervalo=0.01) == (1, {"frames": 1, "cubo": 1})
+    fonte["versao"] = 2
+    
+    limite = time.time() + 5
+    while recarga._ESTADO["atual"][0] != 3 and time.time() < limite:
+        servidas.append(recarga._ESTADO["atual"])
+        time.sleep(0.002)
+    
+    assert recarga._ESTADO["atual"] == (3, {"frames": 3, "cubo": 3})
+    assert all(dados["frames"] == dados["cubo"] for _, dados in servidas)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+from pandas.testing import assert_series_equal
+
+from modules import data_loader
+from modules.data_loader import COL_CONTATO_RELATIVO
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    st.cache_data.clear()
+
+def test_campos_relativos_calculados_na_data_de_referencia():
+    base = pd.DataFrame({
+        "ULTIMO_CONTATO_DT": pd.to_datetime(["2026-06-01", None, None]),
+        COL_CONTATO_RELATIVO: [np.nan, 14, np.nan],
+        "VIGENCIA_FINAL": pd.to_datetime(["2026-06-10", "2026-07-05", "2026-12-31"]),
+    })
+    df = data_loader._aplicar_referencia(base.copy(), pd.Timestamp("2026-06-15"))
+    
+    assert COL_CONTATO_RELATIVO not in df.columns
+    assert df["ULTIMO_CONTATO_DT"].iloc[1] == pd.Timestamp("2026-06-01")
+    assert df["DIAS_SEM_CONTATO"].tolist()[:2] == [14, 14]
+    assert pd.isna(df["DIAS_SEM_CONTATO"].iloc[2])
+    assert df["DIAS_ATE_VENCIMENTO"].tolist() == [-5, 20, 199]
+    assert df["ALERTA_VENCIMENTO"].tolist() == ["VENCIDO", "30_DIAS", "OK"]
+    
+    depois = data_loader._aplicar_referencia(base.copy(), pd.Timestamp("2026-08-01"))
+    # O contato relativo é contado a partir da nova data; o absoluto não muda
+    assert depois["ULTIMO_CONTATO_DT"].tolist()[:2] == [pd.Timestamp("2026-06-01"), pd.Timestamp("2026-07-18")]
+    assert depois["ALERTA_VENCIMENTO"].tolist() == ["VENCIDO", "VENCIDO", "OK"]
+
+def test_outra_data_sem_refazer_o_etl(monkeypatch):
+    antes = data_loader.load_info_gerais("2026-06-15")
+    
+    def proibido():
+        raise AssertionError("ETL refeito para outra data de referência")
+    monkeypatch.setattr(data_loader, "_info_gerais_fonte", proibido)
+    depois = data_loader.load_info_gerais("2026-07-25")
+    
+    dias = 40
+    com_data = antes["ULTIMO_CONTATO_DT"].notna()
+    assert com_data.any()
+    assert_series_equal(depois.loc[com_data, "DIAS_SEM_CONTATO"], antes.loc[com_data, "DIAS_SEM_CONTATO"] + dias)
+    assert_series_equal(depois["DIAS_ATE_VENCIMENTO"], antes["DIAS_ATE_VENCIMENTO"] - dias)
+
+def test_chamados_cortados_na_data_de_referencia():
+    todos = data_loader.load_chamados_all("2026-06-15")
+    cortados = data_loader.load_chamados_all("2026-01-15")
+    
+    assert todos["MES_REF"].max() > pd.Timestamp("2026-01-15")
+    assert cortados["MES_REF"].max() <= pd.Timestamp("2026-01-15")
+    assert len(cortados) == (todos["MES_REF"] <= pd.Timestamp("2026-01-15")).sum()
+
+def test_data_referencia_informada_ambiente_ou_hoje(monkeypatch):
+    monkeypatch.setattr(data_loader, "DATA_REFERENCIA", "2026-03-01")
+    assert data_loader.data_referencia("2026-06-15 14:30") == pd.Timestamp("2026-06-15")
+    assert data_loader.data_referencia() == pd.Timestamp("2026-03-01")
+    
+    monkeypatch.setattr(data_loader, "DATA_REFERENCIA", None)
+    assert data_loader.data_referencia() == pd.Timestamp.today().normalize()
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from modules.config import SLA_CALENDARIO
+from modules.sla import criar_calendario, horas_uteis, prazo_util, pascoa
+
+CALENDARIO = criar_calendario(**SLA_CALENDARIO)
+
+def _horas(abertura, fechamento):
+    return horas_uteis(pd.Series(pd.to_datetime([abertura])), pd.Series(pd.to_datetime([fechamento])), CALENDARIO)[0]
+
+def test_fim_de_semana_nao_conta():
+    # Sexta 17:00 -> segunda 09:00: 1h na sexta e 1h na segunda
+    assert _horas("2026-03-06 17:00", "2026-03-09 09:00") == 2
+
+def test_feriado_nao_conta_inclusive_em_anos_sem_lista_fixa():
+    # Sexta-feira Santa de 2027 (Páscoa em 28/03): quinta 17:00 -> segunda 09:00
+    assert pascoa(2027) == pd.Timestamp("2027-03-28")
+    assert _horas("2027-03-25 17:00", "2027-03-29 09:00") == 2
+    # Tiradentes (segunda-feira em 2031): o expediente inteiro não conta
+    assert _horas("2031-04-21 08:00", "2031-04-21 18:00") == 0
+    # Consciência Negra só é feriado nacional a partir de 2024
+    assert _horas("2023-11-20 08:00", "2023-11-20 18:00") == 10
+    assert _horas("2025-11-20 08:00", "2025-11-20 18:00") == 0
+
+def test_ticket_que_passa_do_fim_do_expediente():
+    # Terça 17:00 -> quarta 10:00: 1h + 2h; fora do expediente não conta
+    assert _horas("2026-03-03 17:00", "2026-03-04 10:00") == 3
+    assert _horas("2026-03-03 19:00", "2026-03-04 07:30") == 0
+    assert _horas("2026-03-03 07:00", "2026-03-03 09:30") == 1.5
+
+def test_prazo_util_e_o_inverso_de_horas_uteis():
+    abertura = pd.Series(pd.to_datetime(["2026-03-06 17:00", "2026-04-02 08:00", "2026-03-03 20:00", None]))
+    prazo = prazo_util(abertura, 8, CALENDARIO)
+    
+    # Sexta 17:00 + 8h: 1h na sexta, 7h na segunda; o feriado de 03/04 é pulado
+    assert prazo[0] == pd.Timestamp("2026-03-09 15:00")
+    assert prazo[1] == pd.Timestamp("2026-04-02 16:00")
+    assert prazo[2] == pd.Timestamp("2026-03-04 16:00")
+    assert pd.isna(prazo[3])
+    assert horas_uteis(abertura[:3], prazo[:3], CALENDARIO).tolist() == [8, 8, 8]
+    # Prazo exatamente no fim do expediente fica nesse dia
+    assert prazo_util(abertura[:1], 1, CALENDARIO)[0] == pd.Timestamp("2026-03-06 18:00")
+
+def test_datas_fora_dos_anos_do_calendario_sao_recusadas():
+    calendario = criar_calendario(feriados_fixos=["01-01"], anos=(2020, 2030))
+    with pytest.raises(ValueError, match="fora dos anos"):
+        horas_uteis(pd.Series(pd.to_datetime(["2031-01-02 09:00"])), pd.Series(pd.to_datetime(["2031-01-02 10:00"])), calendario)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.testing import assert_frame_equal
+
+from modules import data_loader
+from modules.snapshot import gravar_snapshot, ler_snapshot
+from modules.lotes import gravar_parte, ler_partes
+
+FONTE = {"arquivo": "teste", "abas": {}}
+
+def test_colunas_misturadas_sao_gravadas_como_texto(tmp_path):
+    df = pd.DataFrame({
+        "CLIENTE": ["A", "B", "C"],
+        "VALOR": [55, "a combinar", None],
+        "ATIVAÇÃO": [pd.Timestamp("2024-01-05"), "CANCELADO", 3.5],
+    })
+    gravar_snapshot(tmp_path, "misturado", df, FONTE, 1)
+    lido = ler_snapshot(tmp_path, "misturado", FONTE, 1)
+    
+    # Sem objetos serializados: qualquer leitor de Parquet vê texto
+    schema = pq.read_schema(tmp_path / "misturado.parquet")
+    assert all(schema.field(col).type == pa.string() for col in df.columns)
+    assert lido["VALOR"].tolist()[:2] == ["55", "a combinar"] and np.isnan(lido["VALOR"].iloc[2])
+    assert lido["ATIVAÇÃO"].tolist() == ["2024-01-05 00:00:00", "CANCELADO", "3.5"]
+
+def test_carga_quente_igual_ao_etl_frio(tmp_path):
+    frio = data_loader._etl_info_gerais()
+    assert not frio.empty
+    
+    gravar_snapshot(tmp_path, "info_gerais", frio, FONTE, 1)
+    quente = ler_snapshot(tmp_path, "info_gerais", FONTE, 1)
+    
+    assert_frame_equal(quente, frio)
+
+def test_partes_dos_lotes_preservam_valores(tmp_path):
+    frio = data_loader._etl_info_gerais()
+    gravar_parte(str(tmp_path), "info_gerais", 0, frio.iloc[:20])
+    gravar_parte(str(tmp_path), "info_gerais", 1, frio.iloc[20:])
+    
+    assert_frame_equal(ler_partes(str(tmp_path), "info_gerais"), frio.reset_index(drop=True))
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+import streamlit as st
+
+from modules import data_loader
+from modules.tickets import CATEGORIAS, agregar_tickets
+
+TICKETS = pd.DataFrame([
+    ("1", "ALFA", "2026-03-02 09:00:00", "2026-03-02 10:00:00", "Incidente"),
+    ("2", "ALFA", "03/03/2026 09:00", "03/03/2026 11:00", "Incidente"),
+    ("3", "ALFA", "2026-03-04T09:00:00-03:00", "2026-03-04T12:00:00Z", "Incidente"),
+    ("4", "ALFA", "ontem", "2026-03-05 10:00:00", "Incidente"),
+    ("5", "BETA", "2026-04-01 10:00", "amanhã", "Dúvida"),
+    ("6", "", "lixo", "", "Incidente"),
+], columns=["ID", "CLIENTE", "ABERTURA", "FECHAMENTO", "TIPO"]).assign(STATUS_SLA="")
+
+@pytest.mark.parametrize("linhas_por_lote", [2, 100])
+def test_datas_em_formatos_misturados(tmp_path, linhas_por_lote):
+    caminho = tmp_path / "tickets.csv"
+    TICKETS.to_csv(caminho, index=False)
+    resultado = agregar_tickets(caminho, linhas_por_lote=linhas_por_lote)
+    contagens = resultado["contagens"]
+    
+    alfa = contagens.loc[("ALFA", pd.Timestamp("2026-03-01"))]
+    beta = contagens.loc[("BETA", pd.Timestamp("2026-04-01"))]
+    assert list(contagens.columns) == CATEGORIAS
+    assert alfa.to_dict() == {"CHAMADOS": 3, "INCIDENTES": 3, "SOLICITACOES": 0, "DENTRO_SLA": 3, "FORA_SLA": 0}
+    assert beta.to_dict() == {"CHAMADOS": 1, "INCIDENTES": 0, "SOLICITACOES": 0, "DENTRO_SLA": 0, "FORA_SLA": 0}
+    assert len(contagens) == 2
+    
+    # Ticket sem cliente não é problema de data; abertura ilegível é descartada e contada
+    assert resultado["datas_invalidas"] == {"ABERTURA": 1, "FECHAMENTO": 1}
+
+def test_abertos_entram_em_fora_sla_pela_data_de_referencia(tmp_path, monkeypatch):
+    caminho = tmp_path / "tickets.csv"
+    pd.DataFrame([
+        # Fechado depois da meta de 8h úteis: FORA_SLA em qualquer data
+        ("1", "AVANTIA", "2026-03-02 09:00", "2026-03-02 17:30", "Incidente"),
+        # Abertos: a meta vence em 02/03 17:00 (incidente) e em 04/03 13:00 (solicitação)
+        ("2", "AVANTIA", "2026-03-02 09:00", "", "Incidente"),
+        ("3", "AVANTIA", "2026-03-02 09:00", "", "Solicitação"),
+    ], columns=["ID", "CLIENTE", "ABERTURA", "FECHAMENTO", "TIPO"]).assign(STATUS_SLA="").to_csv(caminho, index=False)
+    monkeypatch.setattr(data_loader, "ARQ_TICKETS", str(caminho))
+    st.cache_data.clear()
+    
+    def fora_sla(referencia):
+        df = data_loader.load_chamados_all(referencia)
+        linhas = df["CLIENTE"].eq("AVANTIA") & df["CATEGORIA"].eq("FORA_SLA")
+        return df.loc[linhas, "VALOR"].sum()
+    
+    assert fora_sla("2026-03-02") == 1
+    
+    def proibido(*args, **kwargs):
+        raise AssertionError("ETL dos tickets refeito para outra data de referência")
+    monkeypatch.setattr(data_loader, "agregar_tickets", proibido)
+    assert fora_sla("2026-03-03") == 2
+    assert fora_sla("2026-03-04") == 2
+    assert fora_sla("2026-03-05") == 3
+    
+    mensal = data_loader.load_chamados_mensal(data_loader.load_chamados_all("2026-03-05"), "2026-03-05")
+    assert mensal.loc[mensal["CATEGORIA"].eq("FORA_SLA"), "VALOR"].sum() == 3
@@ -0,0 +1,124 @@
+import urllib.error
+from types import SimpleNamespace
+
+import pytest
+import streamlit as st
+from pandas.testing import assert_frame_equal
+
+from modules import data_loader, tickets_api
+from modules.stub_api_tickets import gerar_tickets, criar_servidor, iniciar_em_segundo_plano
+from modules.tickets import agregar_tickets, agregar_lote, contagens_finais
+
+INICIO, FIM = "2026-03-01", "2026-04-10"
+
+def _iguais(resultado, esperado):
+    assert_frame_equal(resultado["contagens"], esperado["contagens"])
+    assert_frame_equal(resultado["abertos"], esperado["abertos"])
+    assert resultado["datas_invalidas"] == esperado["datas_invalidas"]
+
+@pytest.fixture
+def tickets():
+    return gerar_tickets(1500, INICIO, FIM, clientes=12, semente=7)
+
+@pytest.fixture
+def esperado(tickets, tmp_path):
+    caminho = tmp_path / "tickets.csv"
+    tickets.to_csv(caminho, index=False)
+    return agregar_tickets(caminho)
+
+@pytest.fixture
+def api(tickets):
+    def abrir(taxa_falhas=0.0):
+        servidor = criar_servidor(tickets, taxa_falhas=taxa_falhas)
+        servidores.append(servidor)
+        return iniciar_em_segundo_plano(servidor)
+    servidores = []
+    yield abrir
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+@pytest.fixture
+def requisicoes(monkeypatch):
+    """URLs pedidas e respostas 503 recebidas por tickets_api._baixar"""
+    registro = {"urls": [], "falhas": 0}
+    baixar = tickets_api._baixar
+    
+    def contando(url):
+        registro["urls"].append(url)
+        try:
+            return baixar(url)
+        except urllib.error.HTTPError as erro:
+            registro["falhas"] += erro.code == 503
+            raise
+    monkeypatch.setattr(tickets_api, "_baixar", contando)
+    monkeypatch.setattr(tickets_api, "ITENS_POR_PAGINA", 20)
+    monkeypatch.setattr(tickets_api, "ESPERA_INICIAL", 0.001)
+    return registro
+
+def test_pagina_e_agrega_como_a_exportacao_csv(api, esperado, requisicoes):
+    df = tickets_api.agregar_tickets_api(api(), INICIO, FIM)
+    
+    _iguais(df, esperado)
+    assert any("cursor=" in url for url in requisicoes["urls"])
+    assert requisicoes["falhas"] == 0
+
+def test_repete_respostas_503(api, esperado, requisicoes, monkeypatch):
+    monkeypatch.setattr(tickets_api, "TENTATIVAS", 12)
+    df = tickets_api.agregar_tickets_api(api(taxa_falhas=0.3), INICIO, FIM)
+    
+    _iguais(df, esperado)
+    assert requisicoes["falhas"] > 0
+
+def test_retoma_coleta_interrompida_do_estado(api, esperado, requisicoes, monkeypatch, tmp_path):
+    url = api()
+    tickets_api.agregar_tickets_api(url, INICIO, FIM)
+    completa = len(requisicoes["urls"])
+    requisicoes["urls"].clear()
+    
+    estado = tmp_path / "estado.json"
+    baixar = tickets_api._baixar
+    
+    def interrompe(endereco):
+        if len(requisicoes["urls"]) >= 30:
+            raise urllib.error.HTTPError(endereco, 400, "Bad Request", None, None)
+        return baixar(endereco)
+    monkeypatch.setattr(tickets_api, "_baixar", interrompe)
+    with pytest.raises(urllib.error.HTTPError):
+        tickets_api.agregar_tickets_api(url, INICIO, FIM, caminho_estado=estado)
+    assert estado.exists()
+    
+    monkeypatch.setattr(tickets_api, "_baixar", baixar)
+    requisicoes["urls"].clear()
+    df = tickets_api.agregar_tickets_api(url, INICIO, FIM, caminho_estado=estado)
+    
+    _iguais(df, esperado)
+    assert not estado.exists()
+    assert 30 + len(requisicoes["urls"]) <= completa + tickets_api.CONCORRENCIA_MAXIMA
+    assert len(requisicoes["urls"]) < completa
+
+def test_novo_ciclo_da_api_atualiza_a_base_consolidada(monkeypatch, tmp_path):
+    inicio, fim = data_loader._periodo_tickets_api()
+    payload = {}
+    
+    def coleta(url, inicio, fim, caminho_estado=None, colunas=None):
+        lote = gerar_tickets(payload["tickets"], inicio, fim, semente=payload["tickets"]).assign(CLIENTE="AVANTIA")
+        return contagens_finais(agregar_lote(lote))
+    agora = {"t": 0.0}
+    monkeypatch.setattr(data_loader, "URL_TICKETS_API", "http://127.0.0.1:1/tickets")
+    monkeypatch.setattr(data_loader, "ESTADO_TICKETS_API", tmp_path / "estado.json")
+    monkeypatch.setattr(data_loader, "agregar_tickets_api", coleta)
+    monkeypatch.setattr(data_loader, "time", SimpleNamespace(time=lambda: agora["t"]))
+    
+    def chamados_da_api():
+        df = data_loader.load_base_cs_dashboard()
+        recentes = df[(df["MES_REF"] >= inicio) & df["CATEGORIA"].eq("CHAMADOS")]
+        return recentes["VALOR"].sum()
+    
+    st.cache_data.clear()
+    payload["tickets"] = 40
+    assert chamados_da_api() == 40
+    
+    payload["tickets"] = 90
+    agora["t"] += data_loader.INTERVALO_TICKETS_API
+    assert chamados_da_api() == 90
@@ -9,18 +9,19 @@ import plotly.graph_objects as go
 import plotly.express as px
 from modules.config import COLORS, ICONS
 from modules.utils import (
-    format_currency, format_number, format_percent, 
+    format_currency, format_number, format_percent, format_flag,
     calcular_health_score, get_health_label, classificar_perfil_incidentes
 )
+from modules.cubo import serie_posicao
 
-def render_cliente_360(df_info, df_chamados):
+def render_cliente_360(dados):
     """
     Renderiza página Cliente 360
     
     Args:
-        df_info: DataFrame de informações gerais
-        df_chamados: DataFrame de chamados consolidado
+        dados: versão atual dos dados (ver app.carregar_dados): usa 'info' e 'cubo'
     """
+    df_info = dados["info"]
     
     # ========== HEADER ==========
     st.markdown(f"""
@@ -57,16 +58,20 @@ def render_cliente_360(df_info, df_chamados):
     with col2:
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("🔄 Atualizar Dados", key="refresh_cliente360", use_container_width=True):
-            st.cache_data.clear()
+            # Caches chaveados pelo hash do Excel: rerun já pega mudanças
             st.rerun()
     
     if not cliente_selecionado:
         st.info("👈 Selecione um cliente para visualizar os detalhes")
         return
     
-    # Dados do cliente
-    cliente_row = df_ativos[df_ativos['CLIENTE'] == cliente_selecionado].iloc[0]
-    df_cliente_chamados = df_chamados[df_chamados['CLIENTE'] == cliente_selecionado].copy()
+    # Dados do cliente (código, cadastro e série saem da mesma versão dos dados)
+    linhas_cliente = df_ativos[df_ativos['CLIENTE'] == cliente_selecionado]
+    if linhas_cliente.empty:
+        st.warning("⚠️ Cliente não encontrado na versão atual dos dados")
+        return
+    cliente_row = linhas_cliente.iloc[0]
+    serie_chamados = serie_posicao(dados["cubo"], cliente_row['COD_CLIENTE'])
     
     st.markdown("---")
     
@@ -87,7 +92,7 @@ def render_cliente_360(df_info, df_chamados):
     
     with col2:
         # Health Score
-        health_result = calcular_health_score(cliente_row, df_cliente_chamados)
+        health_result = calcular_health_score(cliente_row, serie_chamados)
         health_score = health_result['score']
         health_label, health_cor = get_health_label(health_score)
         
@@ -180,24 +185,24 @@ def render_cliente_360(df_info, df_chamados):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        at_risk = cliente_row.get('AT_RISK', 'NÃO')
-        cor = COLORS['danger'] if at_risk == 'SIM' else COLORS['success']
+        at_risk = bool(cliente_row.get('AT_RISK', False))
+        cor = COLORS['danger'] if at_risk else COLORS['success']
         st.markdown(f"""
             <div style='background: {cor}; padding: 1rem; border-radius: 12px; 
                         color: white; text-align: center;'>
                 <div style='font-size: 0.85rem; margin-bottom: 0.5rem;'>AT-RISK</div>
-                <div style='font-size: 1.5rem; font-weight: 700;'>{at_risk}</div>
+                <div style='font-size: 1.5rem; font-weight: 700;'>{format_flag(at_risk)}</div>
             </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        churn_risk = cliente_row.get('CHURN_RISK', 'NÃO')
-        cor = COLORS['danger'] if churn_risk == 'SIM' else COLORS['success']
+        churn_risk = bool(cliente_row.get('CHURN_RISK', False))
+        cor = COLORS['danger'] if churn_risk else COLORS['success']
         st.markdown(f"""
             <div style='background: {cor}; padding: 1rem; border-radius: 12px; 
                         color: white; text-align: center;'>
                 <div style='font-size: 0.85rem; margin-bottom: 0.5rem;'>CHURN RISK</div>
-                <div style='font-size: 1.5rem; font-weight: 700;'>{churn_risk}</div>
+                <div style='font-size: 1.5rem; font-weight: 700;'>{format_flag(churn_risk)}</div>
             </div>
         """, unsafe_allow_html=True)
     
@@ -316,14 +321,10 @@ def render_cliente_360(df_info, df_chamados):
         </div>
     """, unsafe_allow_html=True)
     
-    if not df_cliente_chamados.empty:
-        
-        # Agrupar por mês
-        df_mensal = df_cliente_chamados.groupby(['MES_REF', 'CATEGORIA'])['VALOR'].sum().reset_index()
-        df_mensal = df_mensal.sort_values('MES_REF')
+    if not serie_chamados.empty:
         
-        # Pivot
-        df_pivot = df_mensal.pivot(index='MES_REF', columns='CATEGORIA', values='VALOR').fillna(0)
+        # Série mensal do cliente (fatia do cubo, já em ordem de mês)
+        df_pivot = serie_chamados.copy()
         
         # Tabs
         tab1, tab2, tab3 = st.tabs(["📊 Evolução Temporal", "📈 Métricas Mensais", "📋 Tabela Detalhada"])
@@ -469,7 +470,7 @@ def render_cliente_360(df_info, df_chamados):
             st.metric("Taxa SLA Média", f"{taxa:.1f}%")
         
         # Perfil de incidentes
-        perfil = classificar_perfil_incidentes(df_cliente_chamados)
+        perfil = classificar_perfil_incidentes(serie_chamados)
         
         perfil_map = {
             'SEM_INCIDENTES': ('🟢 Sem Incidentes', COLORS['success']),
@@ -504,14 +505,14 @@ def render_cliente_360(df_info, df_chamados):
     sugestoes = []
     
     # Sugestões baseadas em flags
-    if at_risk == 'SIM':
+    if at_risk:
         sugestoes.append({
             'prioridade': 'ALTA',
             'acao': 'Cliente marcado como AT-RISK',
             'recomendacao': 'Agendar reunião estratégica imediata com stakeholders'
         })
     
-    if churn_risk == 'SIM':
+    if churn_risk:
         sugestoes.append({
             'prioridade': 'CRÍTICA',
             'acao': 'Cliente em risco de cancelamento',
@@ -554,10 +555,10 @@ def render_cliente_360(df_info, df_chamados):
             })
     
     # Sugestões baseadas em SLA
-    if not df_cliente_chamados.empty:
-        df_recente = df_cliente_chamados.nlargest(3, 'MES_REF')
-        dentro_sla = df_recente[df_recente['CATEGORIA'] == 'DENTRO_SLA']['VALOR'].sum()
-        fora_sla = df_recente[df_recente['CATEGORIA'] == 'FORA_SLA']['VALOR'].sum()
+    if not serie_chamados.empty:
+        df_recente = serie_chamados.tail(3)
+        dentro_sla = df_recente['DENTRO_SLA'].sum()
+        fora_sla = df_recente['FORA_SLA'].sum()
         total_sla_calc = dentro_sla + fora_sla
         
         if total_sla_calc > 0:
@@ -577,7 +578,7 @@ def render_cliente_360(df_info, df_chamados):
                 })
     
     # Sugestões baseadas em incidentes
-    perfil = classificar_perfil_incidentes(df_cliente_chamados)
+    perfil = classificar_perfil_incidentes(serie_chamados)
     
     if perfil == 'CRESCENTE':
         sugestoes.append({
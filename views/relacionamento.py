@@ -10,14 +10,14 @@ import plotly.express as px
 from modules.config import COLORS, ICONS
 from modules.utils import format_number, format_percent
 
-def render_relacionamento(df_info, df_chamados):
+def render_relacionamento(dados):
     """
     Renderiza página de Relacionamento & Cadência
     
     Args:
-        df_info: DataFrame de informações gerais
-        df_chamados: DataFrame de chamados consolidado
+        dados: versão atual dos dados (ver app.carregar_dados): usa 'info'
     """
+    df_info = dados["info"]
     
     # ========== HEADER ==========
     st.markdown(f"""
@@ -152,6 +152,65 @@ def render_relacionamento(df_info, df_chamados):
     
     st.markdown("---")
     
+    # ========== CADÊNCIA PELOS EVENTOS DE CONTATO (CS_CONTATOS) ==========
+    if 'CONTATOS_90D' in df_ativos.columns:
+        st.markdown(f"""
+            <div class='section-title'>
+                {ICONS['calendar']} Cadência de Contatos
+            </div>
+        """, unsafe_allow_html=True)
+        
+        contatos_30d = int(df_ativos['CONTATOS_30D'].sum())
+        contatos_90d = int(df_ativos['CONTATOS_90D'].sum())
+        mediana_intervalo = df_ativos['MEDIANA_DIAS_ENTRE_CONTATOS'].median()
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown(f"""
+                <div class='stat-card'>
+                    <div class='stat-card-label'>Contatos (30 dias)</div>
+                    <div class='stat-card-value'>{format_number(contatos_30d)}</div>
+                    <div class='stat-card-footer'>{(df_ativos['CONTATOS_30D'] > 0).sum()} clientes contatados</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+                <div class='stat-card'>
+                    <div class='stat-card-label'>Contatos (90 dias)</div>
+                    <div class='stat-card-value'>{format_number(contatos_90d)}</div>
+                    <div class='stat-card-footer'>{(df_ativos['CONTATOS_90D'] > 0).sum()} clientes contatados</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown(f"""
+                <div class='stat-card'>
+                    <div class='stat-card-label'>Intervalo Mediano</div>
+                    <div class='stat-card-value'>{f"{mediana_intervalo:.0f} dias" if pd.notna(mediana_intervalo) else '-'}</div>
+                    <div class='stat-card-footer'>entre contatos do mesmo cliente</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        if 'Customer Success Manager' in df_ativos.columns:
+            df_cadencia = df_ativos.groupby('Customer Success Manager').agg({
+                'CONTATOS_30D': 'sum',
+                'CONTATOS_90D': 'sum',
+                'MEDIANA_DIAS_ENTRE_CONTATOS': 'median'
+            }).reset_index()
+            
+            df_cadencia.columns = ['CSM', 'Contatos 30d', 'Contatos 90d', 'Intervalo Mediano (dias)']
+            df_cadencia['Intervalo Mediano (dias)'] = df_cadencia['Intervalo Mediano (dias)'].round(1)
+            
+            st.dataframe(
+                df_cadencia.sort_values('Contatos 90d', ascending=False),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        st.markdown("---")
+    
     # ========== ANÁLISE POR UNIDADE ==========
     st.markdown(f"""
         <div class='section-title'>
@@ -221,7 +280,8 @@ def render_relacionamento(df_info, df_chamados):
         
         # Colunas para exibição
         colunas_exibir = ['CLIENTE', 'Customer Success Manager', 'UNIDADE', 
-                          'CONTATO', 'TELEFONE', 'E-MAIL', 'DIAS_SEM_CONTATO', 'OBSERVAÇÃO']
+                          'CONTATO', 'TELEFONE', 'E-MAIL', 'DIAS_SEM_CONTATO', 'CANAL_ULTIMO_CONTATO',
+                          'CONTATOS_90D', 'OBSERVAÇÃO']
         
         colunas_disponiveis = [c for c in colunas_exibir if c in df_criticos.columns]
         
@@ -237,6 +297,8 @@ def render_relacionamento(df_info, df_chamados):
             'TELEFONE': 'Telefone',
             'E-MAIL': 'E-mail',
             'DIAS_SEM_CONTATO': 'Dias',
+            'CANAL_ULTIMO_CONTATO': 'Último Canal',
+            'CONTATOS_90D': 'Contatos 90d',
             'OBSERVAÇÃO': 'Observação'
         }
         
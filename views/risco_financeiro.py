@@ -9,15 +9,16 @@ import plotly.graph_objects as go
 import plotly.express as px
 from modules.config import COLORS, ICONS
 from modules.utils import format_currency, format_number, format_percent, calcular_health_score, get_health_label
+from modules.cubo import serie_posicao
 
-def render_risco_financeiro(df_info, df_chamados):
+def render_risco_financeiro(dados):
     """
     Renderiza página de Risco Financeiro
     
     Args:
-        df_info: DataFrame de informações gerais
-        df_chamados: DataFrame de chamados consolidado
+        dados: versão atual dos dados (ver app.carregar_dados): usa 'info', 'cubo' e 'receita'
     """
+    df_info = dados["info"]
     
     # ========== HEADER ==========
     st.markdown(f"""
@@ -42,10 +43,10 @@ def render_risco_financeiro(df_info, df_chamados):
     
     # ========== KPIs FINANCEIROS ==========
     
-    receita_at_risk = df_ativos[df_ativos['AT_RISK'] == 'SIM']['VALOR_CONTRATO'].sum()
-    receita_churn_risk = df_ativos[df_ativos['CHURN_RISK'] == 'SIM']['VALOR_CONTRATO'].sum()
+    receita_at_risk = df_ativos[df_ativos['AT_RISK']]['VALOR_CONTRATO'].sum()
+    receita_churn_risk = df_ativos[df_ativos['CHURN_RISK']]['VALOR_CONTRATO'].sum()
     receita_total_risco = df_ativos[
-        (df_ativos['AT_RISK'] == 'SIM') | (df_ativos['CHURN_RISK'] == 'SIM')
+        df_ativos['AT_RISK'] | df_ativos['CHURN_RISK']
     ]['VALOR_CONTRATO'].sum()
     
     ticket_medio = df_ativos['VALOR_CONTRATO'].mean()
@@ -92,6 +93,14 @@ def render_risco_financeiro(df_info, df_chamados):
     
     st.markdown("---")
     
+    # ========== EVOLUÇÃO DA RECEITA (HISTÓRICO DE MRR) ==========
+    indicadores = dados["receita"]
+    df_mensal = indicadores['mensal']
+    
+    if not df_mensal.empty:
+        render_evolucao_receita(df_mensal, indicadores['anual'], indicadores['clientes'])
+        st.markdown("---")
+    
     # ========== CONCENTRAÇÃO DE RECEITA ==========
     st.markdown(f"""
         <div class='section-title'>
@@ -195,18 +204,19 @@ def render_risco_financeiro(df_info, df_chamados):
     st.info("💡 **Eixo X**: Impacto (% da receita) | **Eixo Y**: Risco (100 - Health Score)")
     
     # Calcular Health Score para cada cliente ÚNICO
-    df_ativos_unique = df_ativos.drop_duplicates(subset=['CLIENTE'])
+    df_ativos_unique = df_ativos.drop_duplicates(subset=['COD_CLIENTE'])
+    valor_por_codigo = df_ativos.groupby('COD_CLIENTE')['VALOR_CONTRATO'].sum()
     
+    cubo = dados["cubo"]
     health_scores = []
     
     for _, cliente_row in df_ativos_unique.iterrows():
         cliente = cliente_row['CLIENTE']
-        df_cliente_chamados = df_chamados[df_chamados['CLIENTE'] == cliente]
         
         # Pegar valor total do cliente (soma se houver múltiplos contratos)
-        valor_total = df_ativos_grouped[df_ativos_grouped['CLIENTE'] == cliente]['VALOR_CONTRATO'].iloc[0]
+        valor_total = valor_por_codigo[cliente_row['COD_CLIENTE']]
         
-        health_result = calcular_health_score(cliente_row, df_cliente_chamados)
+        health_result = calcular_health_score(cliente_row, serie_posicao(cubo, cliente_row['COD_CLIENTE']))
         
         health_scores.append({
             'CLIENTE': cliente,
@@ -388,3 +398,151 @@ def render_risco_financeiro(df_info, df_chamados):
         )
         
         st.plotly_chart(fig, use_container_width=True)
+
+def render_evolucao_receita(df_mensal, df_anual, df_clientes):
+    """
+    Tendências do histórico de MRR: NRR/GRR e movimentos de receita
+    
+    Args:
+        df_mensal: indicadores mês a mês (modules.receita.indicadores_receita)
+        df_anual: indicadores contra 12 meses antes (pode estar vazio)
+        df_clientes: movimentos por cliente e mês
+    """
+    st.markdown(f"""
+        <div class='section-title'>
+            {ICONS['chart']} Evolução da Receita (MRR)
+        </div>
+    """, unsafe_allow_html=True)
+    
+    ultimo = df_mensal.iloc[-1]
+    ref_anual = df_anual.iloc[-1] if not df_anual.empty else None
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+            <div class='stat-card'>
+                <div class='stat-card-label'>MRR ({ultimo['MES_REF']:%m/%Y})</div>
+                <div class='stat-card-value'>{format_currency(ultimo['MRR'])}</div>
+                <div class='stat-card-footer'>Novo: {format_currency(ultimo['NOVO'])}</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+            <div class='stat-card'>
+                <div class='stat-card-label'>NRR Mensal</div>
+                <div class='stat-card-value'>{format_percent(ultimo['NRR']) if pd.notna(ultimo['NRR']) else '-'}</div>
+                <div class='stat-card-footer'>Expansão: {format_currency(ultimo['EXPANSAO'])}</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+            <div class='stat-card'>
+                <div class='stat-card-label'>GRR Mensal</div>
+                <div class='stat-card-value'>{format_percent(ultimo['GRR']) if pd.notna(ultimo['GRR']) else '-'}</div>
+                <div class='stat-card-footer'>Contração + churn: {format_currency(ultimo['CONTRACAO'] + ultimo['CHURN'])}</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        nrr_anual = ref_anual['NRR'] if ref_anual is not None else None
+        grr_anual = ref_anual['GRR'] if ref_anual is not None else None
+        st.markdown(f"""
+            <div class='stat-card'>
+                <div class='stat-card-label'>NRR 12 Meses</div>
+                <div class='stat-card-value'>{format_percent(nrr_anual) if pd.notna(nrr_anual) else '-'}</div>
+                <div class='stat-card-footer'>GRR 12m: {format_percent(grr_anual) if pd.notna(grr_anual) else '-'}</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = go.Figure()
+        
+        fig.add_trace(go.Scatter(
+            x=df_mensal['MES_REF'],
+            y=df_mensal['NRR'],
+            mode='lines+markers',
+            name='NRR',
+            line=dict(color=COLORS['accent'], width=3)
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=df_mensal['MES_REF'],
+            y=df_mensal['GRR'],
+            mode='lines+markers',
+            name='GRR',
+            line=dict(color=COLORS['warning'], width=3)
+        ))
+        
+        fig.add_hline(y=100, line_dash="dash", line_color=COLORS['secondary'])
+        
+        fig.update_layout(
+            title="NRR e GRR Mensais (%)",
+            xaxis_title="Mês",
+            yaxis_title="%",
+            height=400,
+            paper_bgcolor=COLORS['bg_primary'],
+            plot_bgcolor=COLORS['card_bg'],
+            font=dict(color=COLORS['primary'])
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = go.Figure()
+        
+        movimentos = [
+            ('NOVO', 'Novo', 1, COLORS['success']),
+            ('EXPANSAO', 'Expansão', 1, COLORS['accent']),
+            ('CONTRACAO', 'Contração', -1, COLORS['warning']),
+            ('CHURN', 'Churn', -1, COLORS['danger']),
+        ]
+        for coluna, nome, sinal, cor in movimentos:
+            fig.add_trace(go.Bar(
+                x=df_mensal['MES_REF'],
+                y=df_mensal[coluna] * sinal,
+                name=nome,
+                marker_color=cor
+            ))
+        
+        fig.update_layout(
+            title="Movimentos de MRR por Mês",
+            xaxis_title="Mês",
+            yaxis_title="Valor (R$)",
+            barmode='relative',
+            height=400,
+            paper_bgcolor=COLORS['bg_primary'],
+            plot_bgcolor=COLORS['card_bg'],
+            font=dict(color=COLORS['primary'])
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Quem mais moveu a receita no último mês
+    df_ultimo = df_clientes[
+        (df_clientes['MES_REF'] == ultimo['MES_REF']) & (df_clientes['MOVIMENTO'] != 'ESTAVEL')
+    ]
+    
+    if not df_ultimo.empty:
+        st.markdown(f"#### Movimentos de {ultimo['MES_REF']:%m/%Y}")
+        
+        df_display = df_ultimo.reindex(
+            df_ultimo['VARIACAO'].abs().sort_values(ascending=False).index
+        ).head(15)
+        
+        df_display = df_display[['CLIENTE', 'MOVIMENTO', 'MRR_ANTERIOR', 'MRR', 'VARIACAO']].rename(columns={
+            'CLIENTE': 'Cliente',
+            'MOVIMENTO': 'Movimento',
+            'MRR_ANTERIOR': 'MRR Anterior',
+            'MRR': 'MRR Atual',
+            'VARIACAO': 'Variação'
+        })
+        
+        for col in ['MRR Anterior', 'MRR Atual', 'Variação']:
+            df_display[col] = df_display[col].apply(format_currency)
+        
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
@@ -8,16 +8,17 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from modules.config import COLORS, ICONS
-from modules.utils import format_number, format_percent, format_currency, classificar_perfil_incidentes
+from modules.utils import format_number, format_percent, format_currency, format_flag, classificar_perfil_incidentes
+from modules.cubo import serie_posicao, total_por_categoria
 
-def render_suporte_qualidade(df_info, df_chamados):
+def render_suporte_qualidade(dados):
     """
     Renderiza página de Suporte & Qualidade
     
     Args:
-        df_info: DataFrame de informações gerais
-        df_chamados: DataFrame de chamados consolidado
+        dados: versão atual dos dados (ver app.carregar_dados): usa 'info', 'cubo', 'mensal' e 'por_cliente'
     """
+    df_info = dados["info"]
     
     # ========== HEADER ==========
     st.markdown(f"""
@@ -31,18 +32,20 @@ def render_suporte_qualidade(df_info, df_chamados):
         </div>
     """, unsafe_allow_html=True)
     
-    if df_chamados.empty:
+    cubo = dados["cubo"]
+    if not cubo["presente"].any():
         st.warning("⚠️ Nenhum dado de chamados disponível")
         return
     
     # ========== KPIs GERAIS ==========
     
-    total_chamados = df_chamados[df_chamados['CATEGORIA'] == 'CHAMADOS']['VALOR'].sum()
-    total_incidentes = df_chamados[df_chamados['CATEGORIA'] == 'INCIDENTES']['VALOR'].sum()
-    total_solicitacoes = df_chamados[df_chamados['CATEGORIA'] == 'SOLICITACOES']['VALOR'].sum()
+    totais = total_por_categoria(cubo)
+    total_chamados = totais['CHAMADOS']
+    total_incidentes = totais['INCIDENTES']
+    total_solicitacoes = totais['SOLICITACOES']
     
-    dentro_sla = df_chamados[df_chamados['CATEGORIA'] == 'DENTRO_SLA']['VALOR'].sum()
-    fora_sla = df_chamados[df_chamados['CATEGORIA'] == 'FORA_SLA']['VALOR'].sum()
+    dentro_sla = totais['DENTRO_SLA']
+    fora_sla = totais['FORA_SLA']
     total_sla = dentro_sla + fora_sla
     taxa_sla = (dentro_sla / total_sla * 100) if total_sla > 0 else 0
     
@@ -97,8 +100,7 @@ def render_suporte_qualidade(df_info, df_chamados):
     """, unsafe_allow_html=True)
     
     # Agrupar por mês
-    df_mensal = df_chamados.groupby(['MES_REF', 'CATEGORIA'])['VALOR'].sum().reset_index()
-    df_mensal = df_mensal.sort_values('MES_REF')
+    df_mensal = dados["mensal"]
     
     # Pivot para facilitar visualização
     df_pivot = df_mensal.pivot(index='MES_REF', columns='CATEGORIA', values='VALOR').fillna(0)
@@ -194,7 +196,7 @@ def render_suporte_qualidade(df_info, df_chamados):
     """, unsafe_allow_html=True)
     
     # Agrupar por cliente
-    df_por_cliente = df_chamados.groupby(['CLIENTE', 'CATEGORIA'])['VALOR'].sum().reset_index()
+    df_por_cliente = dados["por_cliente"]
     df_cliente_pivot = df_por_cliente.pivot(index='CLIENTE', columns='CATEGORIA', values='VALOR').fillna(0)
     
     # Calcular métricas
@@ -215,12 +217,11 @@ def render_suporte_qualidade(df_info, df_chamados):
     df_ativos = df_info[~df_info['CANCELADO']]
     
     # Pegar lista única de clientes
-    clientes_unicos = df_ativos['CLIENTE'].drop_duplicates().tolist()
+    clientes_unicos = df_ativos.drop_duplicates('COD_CLIENTE')
     
     perfis = []
-    for cliente in clientes_unicos:
-        df_cliente_chamados = df_chamados[df_chamados['CLIENTE'] == cliente]
-        perfil = classificar_perfil_incidentes(df_cliente_chamados)
+    for cliente, codigo in zip(clientes_unicos['CLIENTE'], clientes_unicos['COD_CLIENTE']):
+        perfil = classificar_perfil_incidentes(serie_posicao(cubo, codigo))
         perfis.append({'CLIENTE': cliente, 'PERFIL_INCIDENTES': perfil})
     
     df_perfis = pd.DataFrame(perfis)
@@ -394,6 +395,8 @@ def render_suporte_qualidade(df_info, df_chamados):
                 on='CLIENTE',
                 how='left'
             )
+            df_display['AT_RISK'] = df_display['AT_RISK'].apply(format_flag)
+            df_display['CHURN_RISK'] = df_display['CHURN_RISK'].apply(format_flag)
             
             st.dataframe(
                 df_display[['CLIENTE', 'Customer Success Manager', 'TAXA_SLA', 
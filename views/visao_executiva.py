@@ -8,16 +8,17 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from modules.config import COLORS, ICONS
-from modules.utils import format_currency, format_number, format_percent, calcular_health_score, get_health_label
+from modules.utils import format_currency, format_number, format_percent, format_flag, calcular_health_score, get_health_label
+from modules.cubo import serie_posicao
 
-def render_visao_executiva(df_info, df_chamados):
+def render_visao_executiva(dados):
     """
     Renderiza Visão Executiva
     
     Args:
-        df_info: DataFrame de informações gerais
-        df_chamados: DataFrame de chamados consolidado
+        dados: versão atual dos dados (ver app.carregar_dados): usa 'info', 'cubo' e 'referencia'
     """
+    df_info = dados["info"]
     
     # ========== HEADER ==========
     st.markdown(f"""
@@ -41,12 +42,12 @@ def render_visao_executiva(df_info, df_chamados):
     df_ativos = df_info[~df_info['CANCELADO']]
     
     total_clientes = len(df_ativos)
-    clientes_at_risk = (df_ativos['AT_RISK'] == 'SIM').sum()
-    clientes_churn_risk = (df_ativos['CHURN_RISK'] == 'SIM').sum()
+    clientes_at_risk = df_ativos['AT_RISK'].sum()
+    clientes_churn_risk = df_ativos['CHURN_RISK'].sum()
     
     receita_total = df_ativos['VALOR_CONTRATO'].sum()
     receita_em_risco = df_ativos[
-        (df_ativos['AT_RISK'] == 'SIM') | (df_ativos['CHURN_RISK'] == 'SIM')
+        df_ativos['AT_RISK'] | df_ativos['CHURN_RISK']
     ]['VALOR_CONTRATO'].sum()
     
     # Cards principais
@@ -192,7 +193,7 @@ def render_visao_executiva(df_info, df_chamados):
         </div>
     """, unsafe_allow_html=True)
     
-    hoje = pd.Timestamp.now()
+    hoje = dados["referencia"]
     df_ativos['DIAS_ATIVACAO'] = (hoje - df_ativos['DATA_ATIVACAO']).dt.days
     
     novos_30 = (df_ativos['DIAS_ATIVACAO'] <= 30).sum()
@@ -291,13 +292,13 @@ def render_visao_executiva(df_info, df_chamados):
     st.info("💡 **Ranking baseado em**: Health Score (saúde) + Impacto Financeiro (% da receita)")
     
     # Calcular Health Score para cada cliente
+    cubo = dados["cubo"]
     health_scores = []
     
     for _, cliente_row in df_ativos.iterrows():
         cliente = cliente_row['CLIENTE']
-        df_cliente_chamados = df_chamados[df_chamados['CLIENTE'] == cliente]
         
-        health_result = calcular_health_score(cliente_row, df_cliente_chamados)
+        health_result = calcular_health_score(cliente_row, serie_posicao(cubo, cliente_row['COD_CLIENTE']))
         health_scores.append({
             'CLIENTE': cliente,
             'HEALTH_SCORE': health_result['score'],
@@ -323,6 +324,8 @@ def render_visao_executiva(df_info, df_chamados):
     df_display['HEALTH_SCORE'] = df_display['HEALTH_SCORE'].apply(lambda x: f"{x:.0f}")
     df_display['IMPACTO_%'] = df_display['IMPACTO_%'].apply(lambda x: f"{x:.1f}%")
     df_display['VALOR_CONTRATO'] = df_display['VALOR_CONTRATO'].apply(format_currency)
+    df_display['AT_RISK'] = df_display['AT_RISK'].apply(format_flag)
+    df_display['CHURN_RISK'] = df_display['CHURN_RISK'].apply(format_flag)
     
     df_display.columns = ['Cliente', 'Health', 'Impacto %', 'MRR', 'At-Risk', 'Churn Risk', 'Último Contato']
     